@@ -0,0 +1,127 @@
+import os
+
+from benchmarks.datasets import col_config, field_rules, generate_rows
+
+# Number of times the parser benchmark parses its configuration per 1000 rows
+PARSES_PER_1000_ROWS = 1
+
+
+def _transformations(width):
+    return [{'target': 'unified', 'source': 'bench', 'rules': field_rules(width)}]
+
+
+def _collector_run(config_text, workdir, name):
+    """
+    Writes a configuration and returns a callable running a Collector on it.
+    """
+    from collector.core.collector import Collector
+
+    config_path = os.path.join(workdir, f"{name}.col")
+    with open(config_path, 'w') as file:
+        file.write(config_text)
+
+    def run():
+        collector = Collector(config_path)
+        collector.run()
+        return collector.metrics.get('write').rows
+
+    return run
+
+
+def parser(rows, width, workdir, env):
+    """Parses a configuration with one FIELD rule per column."""
+    from collector.core.config_parser import CollectorConfigParser
+
+    config_path = os.path.join(workdir, 'parser.col')
+    with open(config_path, 'w') as file:
+        file.write(col_config(['csv', 'FILE_PATH "data.csv"'], width, 'csv', 'out.csv'))
+    with open(config_path) as file:
+        lines = len(file.readlines())
+    repeat = max(1, rows * PARSES_PER_1000_ROWS // 1000)
+
+    def run():
+        for _ in range(repeat):
+            CollectorConfigParser(config_path).parse()
+        return lines * repeat
+
+    return run
+
+
+def transform_row(rows, width, workdir, env):
+    """Transforms rows with the row engine."""
+    from collector.core.transform_plan import TransformPlan
+
+    data = generate_rows(rows, width)
+    plan = TransformPlan(_transformations(width))
+    return lambda: len(plan.transform(data, 'bench'))
+
+
+def transform_columnar(rows, width, workdir, env):
+    """Transforms rows with the columnar engine."""
+    from collector.core.transformer import DataTransformer
+
+    data = generate_rows(rows, width)
+    transformer = DataTransformer(_transformations(width))
+    return lambda: len(transformer.transform(data, 'bench'))
+
+
+def _output(output_type):
+    def case(rows, width, workdir, env):
+        from collector.core.transform_plan import TransformPlan
+        from collector.output.output_handler import OutputHandler
+
+        data = TransformPlan(_transformations(width)).transform(generate_rows(rows, width), 'bench')
+        handler = OutputHandler({'type': output_type, 'details': {'path': os.path.join(workdir, f"out.{output_type}")}})
+
+        def run():
+            handler.write_output(data)
+            return len(data)
+
+        return run
+
+    case.__doc__ = f"Writes transformed rows as {output_type}."
+    return case
+
+
+def _sql_source(env):
+    return ['sql', 'DB_TYPE "sqlite"', 'HOST "localhost"', 'PORT 0', 'USERNAME "bench"', 'PASSWORD "bench"',
+            f'DATABASE "{env["sqlite"]}"', 'QUERY "SELECT * FROM bench"']
+
+
+def collector_sql(rows, width, workdir, env):
+    """Runs the Collector from SQLite to Parquet."""
+    return _collector_run(col_config(_sql_source(env), width, 'parquet', 'out.parquet'), workdir, 'sql')
+
+
+def collector_sql_stream(rows, width, workdir, env):
+    """Runs the Collector from SQLite to Parquet in streaming mode."""
+    config = col_config(_sql_source(env), width, 'parquet', 'out.parquet', settings={'STREAM': 'true'})
+    return _collector_run(config, workdir, 'sql_stream')
+
+
+def collector_api(rows, width, workdir, env):
+    """Runs the Collector from a local JSON API to Parquet."""
+    source = ['api', f'ENDPOINT "{env["api_url"]}/rows"', 'METHOD "GET"']
+    return _collector_run(col_config(source, width, 'parquet', 'out.parquet'), workdir, 'api')
+
+
+def collector_s3(rows, width, workdir, env):
+    """Runs the Collector from a CSV object of a local S3 stub to Parquet."""
+    source = ['s3', 'BUCKET "bench"', 'KEY "data.csv"', 'AWS_ACCESS_KEY "bench"', 'AWS_SECRET_KEY "bench"',
+              f'ENDPOINT_URL "{env["s3_url"]}"']
+    return _collector_run(col_config(source, width, 'parquet', 'out.parquet'), workdir, 's3')
+
+
+CASES = {
+    'parser': parser,
+    'transform_row': transform_row,
+    'transform_columnar': transform_columnar,
+    'output_csv': _output('csv'),
+    'output_json': _output('json'),
+    'output_xml': _output('xml'),
+    'output_parquet': _output('parquet'),
+    'collector_sql': collector_sql,
+    'collector_sql_stream': collector_sql_stream,
+    'collector_api': collector_api,
+    'collector_s3': collector_s3,
+}
@@ -0,0 +1,136 @@
+import csv
+import json
+import random
+import sqlite3
+from datetime import date, timedelta
+
+# Column kinds cycled over the generated columns, with the TRANSFORM rule converting them
+COLUMN_KINDS = ('int', 'float', 'string', 'date')
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def column_names(width):
+    """
+    Returns the names of the generated columns.
+
+    :param width: Number of columns besides 'id'.
+    :type width: int
+    :rtype: list of str
+    """
+    return [f"c{index}" for index in range(width)]
+
+
+def generate_rows(rows, width, seed=0):
+    """
+    Generates a deterministic synthetic dataset. Values are text, as read from CSV
+    files or APIs, so TRANSFORM rules have conversions to do.
+
+    :param rows: Number of rows.
+    :type rows: int
+    :param width: Number of columns besides 'id'.
+    :type width: int
+    :param seed: Seed of the random generator.
+    :type seed: int
+    :return: The generated rows.
+    :rtype: list of dict
+    """
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    names = column_names(width)
+    data = []
+    for row_id in range(rows):
+        row = {'id': row_id}
+        for index, name in enumerate(names):
+            kind = COLUMN_KINDS[index % len(COLUMN_KINDS)]
+            if kind == 'int':
+                row[name] = str(rng.randint(0, 1000000))
+            elif kind == 'float':
+                row[name] = f"{rng.uniform(0, 1000):.2f}"
+            elif kind == 'string':
+                row[name] = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(12))
+            else:
+                row[name] = (start + timedelta(days=rng.randint(0, 1500))).strftime(DATE_FORMAT)
+        data.append(row)
+    return data
+
+
+def field_rules(width):
+    """
+    Returns the TRANSFORM rules converting every generated column to its type.
+
+    :rtype: list of dict
+    """
+    rules = []
+    for index, name in enumerate(column_names(width)):
+        rule = {'field': name, 'type': COLUMN_KINDS[index % len(COLUMN_KINDS)]}
+        if rule['type'] == 'date':
+            rule['format'] = DATE_FORMAT
+        rules.append(rule)
+    return rules
+
+
+def write_sqlite(path, rows, table='bench'):
+    """
+    Writes rows to a SQLite table.
+    """
+    columns = list(rows[0])
+    with sqlite3.connect(path) as connection:
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+        connection.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+        connection.executemany(
+            f"INSERT INTO {table} VALUES ({', '.join('?' for _ in columns)})",
+            [tuple(row.values()) for row in rows]
+        )
+
+
+def write_csv(path, rows):
+    """
+    Writes rows to a CSV file.
+    """
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path, rows):
+    """
+    Writes rows to a JSON file as an array.
+    """
+    with open(path, 'w') as file:
+        json.dump(rows, file)
+
+
+def col_config(source_block, width, output_type, output_path, settings=None):
+    """
+    Builds a .col configuration with one source named 'bench'.
+
+    :param source_block: The lines of the SOURCE block, without braces.
+    :type source_block: list of str
+    :param width: Number of generated columns, each getting a FIELD rule.
+    :type width: int
+    :param output_type: The OUTPUT type.
+    :type output_type: str
+    :param output_path: The OUTPUT path.
+    :type output_path: str
+    :param settings: Top-level settings, e.g. ``{'STREAM': 'true'}``.
+    :type settings: dict
+    :return: The configuration text.
+    :rtype: str
+    """
+    lines = ['VERSION 1.0']
+    lines.extend(f"{key} {value}" for key, value in (settings or {}).items())
+    lines.append('SOURCE bench TYPE ' + source_block[0] + ' {')
+    lines.extend(f"    {line}" for line in source_block[1:])
+    lines.append('}')
+    lines.append('TRANSFORM unified FROM bench {')
+    for rule in field_rules(width):
+        line = f"    FIELD {rule['field']} TYPE {rule['type']}"
+        if 'format' in rule:
+            line += f' FORMAT "{rule["format"]}"'
+        lines.append(line)
+    lines.append('}')
+    lines.append(f'OUTPUT result TYPE {output_type} {{')
+    lines.append(f'    PATH "{output_path}"')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,151 @@
+"""
+Runs the benchmark suite and compares it with stored baselines.
+
+Usage::
+
+    python -m benchmarks.run --rows 100000 --width 12
+    python -m benchmarks.run --case collector_sql --case output_parquet
+    python -m benchmarks.run --save-baseline
+
+Every case runs in a fresh process, so its peak RSS is not inflated by earlier
+cases. Baselines are stored per dataset size in ``benchmarks/baselines.json``;
+they depend on the machine, so save them on the machine running the comparison.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.cases import CASES
+from benchmarks.datasets import generate_rows, write_csv, write_sqlite
+from benchmarks.stubs import api_server, s3_server
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_TOLERANCE = 0.2
+
+
+def _run_case(name, rows, width, workdir, env, results):
+    """
+    Runs one case in a child process and sends back its timing and peak RSS.
+    """
+    from collector.utils.metrics import peak_rss
+
+    os.chdir(workdir)  # The collector logs to collector.log in the working directory
+    logging.disable(logging.INFO)
+    run = CASES[name](rows, width, workdir, env)
+    started = time.perf_counter()
+    items = run()
+    seconds = time.perf_counter() - started
+    results.put({'items': items, 'seconds': seconds, 'peak_rss': peak_rss()})
+
+
+def run_case(name, rows, width, workdir, env, repeat=1):
+    """
+    Runs a case ``repeat`` times, each in a new process, and keeps the fastest run.
+
+    :return: The items processed, seconds, items per second and peak RSS in megabytes.
+    :rtype: dict
+    """
+    context = multiprocessing.get_context('spawn')
+    best = None
+    for _ in range(repeat):
+        results = context.Queue()
+        process = context.Process(target=_run_case, args=(name, rows, width, workdir, env, results))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            raise RuntimeError(f"Benchmark {name} failed with exit code {process.exitcode}")
+        result = results.get()
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return {
+        'items': best['items'],
+        'seconds': round(best['seconds'], 4),
+        'items_per_second': round(best['items'] / best['seconds'], 1) if best['seconds'] else 0.0,
+        'peak_rss_mb': round(best['peak_rss'] / 1024 / 1024, 1) if best['peak_rss'] else None
+    }
+
+
+def compare(result, baseline, tolerance):
+    """
+    Compares a result with its baseline.
+
+    :return: The regressions found, as messages.
+    :rtype: list of str
+    """
+    regressions = []
+    if result['items_per_second'] < baseline['items_per_second'] * (1 - tolerance):
+        regressions.append(
+            f"throughput {result['items_per_second']:.0f}/s < baseline {baseline['items_per_second']:.0f}/s"
+        )
+    if result['peak_rss_mb'] and baseline.get('peak_rss_mb') \
+            and result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"peak RSS {result['peak_rss_mb']} MB > baseline {baseline['peak_rss_mb']} MB")
+    return regressions
+
+
+def load_baselines(path=BASELINES_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the collector benchmark suite")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of rows of the synthetic dataset")
+    parser.add_argument("--width", type=int, default=12, help="Number of columns of the synthetic dataset")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="Case to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is kept")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="Path of the baselines file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown or memory growth before reporting a regression")
+    args = parser.parse_args(argv)
+
+    size_key = f"{args.rows}x{args.width}"
+    baselines = load_baselines(args.baselines)
+    size_baselines = baselines.get(size_key, {})
+    names = args.case or list(CASES)
+
+    with tempfile.TemporaryDirectory(prefix='collector-bench-') as workdir:
+        rows = generate_rows(args.rows, args.width)
+        write_sqlite(os.path.join(workdir, 'bench.db'), rows)
+        write_csv(os.path.join(workdir, 'data.csv'), rows)
+        with api_server(rows) as api, s3_server(workdir) as s3:
+            del rows
+            env = {'sqlite': os.path.join(workdir, 'bench.db'), 'api_url': api.url, 's3_url': s3.url}
+            results = {}
+            regressions = {}
+            print(f"{'case':<22}{'items':>10}{'seconds':>10}{'items/s':>14}{'peak MB':>10}  baseline")
+            for name in names:
+                result = run_case(name, args.rows, args.width, workdir, env, args.repeat)
+                results[name] = result
+                baseline = size_baselines.get(name)
+                status = '-'
+                if baseline:
+                    regressions[name] = compare(result, baseline, args.tolerance)
+                    change = result['items_per_second'] / baseline['items_per_second'] - 1
+                    status = f"{change:+.0%}" + (' REGRESSION' if regressions[name] else '')
+                print(f"{name:<22}{result['items']:>10}{result['seconds']:>10.3f}"
+                      f"{result['items_per_second']:>14.0f}{result['peak_rss_mb'] or 0:>10.1f}  {status}")
+
+    if args.save_baseline:
+        baselines[size_key] = {**size_baselines, **results}
+        with open(args.baselines, 'w') as file:
+            json.dump(baselines, file, indent=4, sort_keys=True)
+            file.write('\n')
+        print(f"Baselines saved to {args.baselines}")
+
+    failed = {name: messages for name, messages in regressions.items() if messages}
+    for name, messages in failed.items():
+        print(f"{name}: {'; '.join(messages)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
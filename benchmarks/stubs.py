@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    """Request handler that does not log every request to stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+class LocalServer:
+    """
+    Runs an HTTP server on a free local port in a background thread.
+
+    :param handler: The request handler class.
+    :type handler: type
+    """
+
+    def __init__(self, handler):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def api_server(rows):
+    """
+    Returns a server answering every GET or POST with the rows as a JSON array,
+    standing in for a REST API.
+
+    :param rows: The rows served.
+    :type rows: list of dict
+    :rtype: LocalServer
+    """
+    body = json.dumps(rows).encode('utf-8')
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            self._send(200, body, {'Content-Type': 'application/json'})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self.do_GET()
+
+    return LocalServer(Handler)
+
+
+def s3_server(directory):
+    """
+    Returns a minimal S3-compatible server serving the files of a directory with
+    path-style addressing: object ``key`` of any bucket is ``directory/key``.
+    Only the GetObject and HeadObject calls used by S3Connector are supported.
+
+    :param directory: The directory holding the objects.
+    :type directory: str
+    :rtype: LocalServer
+    """
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].lstrip('/')
+            _, _, key = path.partition('/')
+            file_path = os.path.join(directory, key)
+            if not key or not os.path.isfile(file_path):
+                body = b'<?xml version="1.0"?><Error><Code>NoSuchKey</Code></Error>'
+                self._send(404, body, {'Content-Type': 'application/xml'})
+                return
+            stat = os.stat(file_path)
+            with open(file_path, 'rb') as file:
+                body = file.read()
+            self._send(200, body, {
+                'ETag': f'"{int(stat.st_mtime_ns)}-{stat.st_size}"',
+                'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+                'Content-Type': 'application/octet-stream'
+            })
+
+        do_HEAD = do_GET
+
+    return LocalServer(Handler)
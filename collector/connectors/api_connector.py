@@ -1,13 +1,93 @@
+import asyncio
+import copy
+import hashlib
+import json
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
 import requests
 
-class APIConnector:
+from collector.connectors.base_connector import DEFAULT_BATCH_SIZE, BaseConnector, iter_batches
+from collector.connectors.http_client import (REQUEST_TIMEOUT, RETRY_STATUSES, RetryPolicy, get_rate_limiter, get_session,
+                                              host_of)
+from collector.utils.json_stream import CHUNK_SIZE, iter_json_records, iter_ndjson, record_keys
+from collector.utils.logger import get_logger
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only needed for COLLECT_MODE async
+    aiohttp = None
+
+# Pages requested at once when the number of pages is known
+DEFAULT_PAGE_CONCURRENCY = 4
+
+# Requests of a FAN_OUT source sent at once
+DEFAULT_FAN_OUT_CONCURRENCY = 8
+
+
+def lookup(data, path):
+    """
+    Follows a dotted path such as ``meta.total`` into a JSON document.
+
+    :param data: The decoded JSON document.
+    :param path: Keys separated by dots, optionally ending with ``[*]`` (see
+        :func:`collector.utils.json_stream.record_keys`).
+    :type path: str
+    :return: The value found, or None if a key is missing.
+    """
+    for key in record_keys(path):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _key_text(value):
+    """
+    Formats a fan-out value for a URL or parameter; whole floats (e.g. ids read from a
+    column with missing values) are written without their decimal part.
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _fill(template, placeholder, value):
+    """
+    Replaces a placeholder in the strings of a parameter or body value, including the
+    strings nested in dictionaries and lists.
+    """
+    if isinstance(template, str):
+        return template.replace(placeholder, value)
+    if isinstance(template, dict):
+        return {key: _fill(item, placeholder, value) for key, item in template.items()}
+    if isinstance(template, list):
+        return [_fill(item, placeholder, value) for item in template]
+    return template
+
+
+class APIConnector(BaseConnector):
     """
     Handles connections to API data sources and fetches data.
+
+    Requests go through a keep-alive session pooled per host, are retried as configured
+    by the RETRY block and throttled to RATE_LIMIT requests per second per host; with
+    ADAPTIVE_CONCURRENCY, the requests in flight to a host are also limited to what it
+    sustains. With STREAM_RESPONSE, or for NDJSON responses, records are parsed as the body arrives.
+    A FAN_OUT block sends one request per value of a key list, e.g. the ids returned by
+    another source.
     
     :param config: Configuration details for connecting to the API.
     :type config: dict
     """
 
+    # Fetch cache keeping responses for conditional requests, set by the Collector for
+    # sources with HTTP_CACHE enabled
+    http_cache = None
+
     def __init__(self, config):
         """
         Initializes the APIConnector with API configuration.
@@ -20,24 +100,557 @@ class APIConnector:
         self.method = config['method']
         self.headers = config.get('headers', {})
         self.query_params = config.get('query_params', {})
+        self.body = config.get('body')
+        self.retry = RetryPolicy(config.get('retry'))
+        self.rate_limit = float(config['rate_limit']) if config.get('rate_limit') else None
+        self.rate_limit_burst = float(config['rate_limit_burst']) if config.get('rate_limit_burst') else None
+        # No single request may outlast the TIMEOUT of the source
+        self.timeout = (REQUEST_TIMEOUT[0], float(config['timeout'])) if config.get('timeout') else REQUEST_TIMEOUT
+        self._sessions = {}
+        self.record_path = config.get('record_path')
+        self.pagination = config.get('pagination')
+        self.response_format = str(config.get('response_format', 'json')).lower()
+        self.streams = self.response_format == 'ndjson' or str(config.get('stream_response', False)).lower() == 'true'
+        self.fan_out = config.get('fan_out')
+        self.fan_out_keys = None  # Values read from the VALUES_SOURCE of FAN_OUT, set by the Collector
+        self.logger = get_logger()
 
     def fetch_data(self):
         """
-        Executes an API request and fetches data.
+        Executes an API request and fetches data. Paginated sources fetch every page
+        and return their records.
 
-        :return: The response data from the API.
-        :rtype: dict
-        :raises requests.exceptions.RequestException: If the API request fails.
+        :return: The records of the response, under RECORD_PATH if set.
+        :rtype: list of dict
+        :raises RuntimeError: If an API request fails.
         """
+        if self.fan_out:
+            return [row for rows in self.fan_out_pages() for row in rows]
+        if self.pagination:
+            return [row for page in self.fetch_pages() for row in page]
+        if self.streams:
+            return list(self.stream_records())
         try:
-            if self.method.upper() == 'GET':
-                response = requests.get(self.endpoint, headers=self.headers, params=self.query_params)
-            elif self.method.upper() == 'POST':
-                response = requests.post(self.endpoint, headers=self.headers, json=self.query_params)
+            rows, _, _ = self._fetch_page(self.endpoint, self.query_params)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"API request failed: {e}")
+        return rows
+
+    def fetch_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yields the records in batches of at most ``batch_size`` rows. Paginated, streamed
+        and fan-out sources yield records as they arrive instead of waiting for the whole
+        response.
+
+        :param batch_size: Maximum number of records per batch.
+        :type batch_size: int
+        :return: An iterator over record batches.
+        :rtype: iterator of list of dict
+        """
+        if self.fan_out:
+            yield from iter_batches((row for rows in self.fan_out_pages() for row in rows), batch_size)
+        elif self.pagination:
+            yield from iter_batches((row for page in self.fetch_pages() for row in page), batch_size)
+        elif self.streams:
+            yield from iter_batches(self.stream_records(), batch_size)
+        else:
+            yield from super().fetch_batches(batch_size)
+
+    def fan_out_values(self):
+        """
+        Returns the values of a FAN_OUT source, without duplicates: the comma-separated
+        VALUES, the lines of VALUES_FILE, or the keys read from VALUES_SOURCE.
+
+        :rtype: list of str
+        """
+        options = self.fan_out
+        if options.get('values') is not None:
+            values = str(options['values']).split(',')
+        elif options.get('values_file'):
+            with open(options['values_file']) as values_file:
+                values = values_file.read().splitlines()
+        else:
+            values = [value for value in self.fan_out_keys or [] if value is not None]
+        return list(dict.fromkeys(text for text in map(_key_text, values) if text))
+
+    def fan_out_requests(self, values):
+        """
+        Yields a connector per request of a FAN_OUT source, requesting one value, or
+        BATCH_SIZE values joined with SEPARATOR. The ``{PARAM}`` placeholder is replaced
+        in ENDPOINT, QUERY_PARAMS and BODY; without a placeholder, the value is sent as
+        the PARAM query parameter.
+
+        The connectors are shallow copies: they share the sessions, rate limiter and
+        concurrency limit of this one on purpose, since all of them are kept per host
+        (see :func:`get_session`) so the requests of a source are pooled and throttled
+        together.
+
+        :param values: The values to request, see :meth:`fan_out_values`.
+        :type values: list of str
+        :return: An iterator over connectors sharing the sessions and options of this one.
+        :rtype: iterator of APIConnector
+        """
+        options = self.fan_out
+        param = options['param']
+        placeholder = '{' + param + '}'
+        size = int(options.get('batch_size', 1))
+        separator = str(options.get('separator', ','))
+        templated = placeholder in self.endpoint or placeholder in json.dumps([self.query_params, self.body], default=str)
+        for start in range(0, len(values), size):
+            value = separator.join(values[start:start + size])
+            request = copy.copy(self)
+            request.fan_out = None
+            if templated:
+                request.endpoint = self.endpoint.replace(placeholder, quote(value, safe=separator))
+                request.query_params = _fill(self.query_params, placeholder, value)
+                request.body = _fill(self.body, placeholder, value)
             else:
-                raise ValueError(f"Unsupported HTTP method: {self.method}")
+                request.query_params = dict(self.query_params, **{param: value})
+            yield request
 
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            return response.json()  # Return the JSON response
+    def fan_out_pages(self):
+        """
+        Yields the records of every request of a FAN_OUT source in the order of the
+        values, with up to CONCURRENCY requests in flight. Each request follows the
+        PAGINATION, streaming and caching options of the source.
+
+        :return: An iterator over the records of each request.
+        :rtype: iterator of list of dict
+        :raises RuntimeError: If a request fails.
+        """
+        values = self.fan_out_values()
+        size = int(self.fan_out.get('batch_size', 1))
+        self.logger.info(f"Fanning out {math.ceil(len(values) / size)} requests over {len(values)} values to "
+                         f"{self.endpoint}")
+        yield from self._fetch_concurrently(lambda request: request.fetch_data(), self.fan_out_requests(values),
+                                            self._workers(self.fan_out, DEFAULT_FAN_OUT_CONCURRENCY))
+
+    def stream_records(self):
+        """
+        Yields the records of the response as its body is downloaded, without holding
+        the body or the whole decoded document in memory: the elements of the array at
+        RECORD_PATH (e.g. ``data.items[*]``), or the records of each NDJSON line.
+
+        :return: An iterator over the records.
+        :rtype: iterator of dict
+        :raises RuntimeError: If the API request fails or the response is not valid JSON.
+        """
+        try:
+            response, key, meta = self._revalidate(self.endpoint, self.query_params, stream=True)
+            if response.status_code == 304:
+                response.close()
+                cached = self.http_cache.iter_batches(key, math.inf, DEFAULT_BATCH_SIZE)
+                if cached is not None:
+                    self.logger.info(f"Response of {self.endpoint} unchanged, reading it from the HTTP cache")
+                    for batch in cached:
+                        yield from batch
+                    return
+                response = self._request(self.endpoint, self.query_params, stream=True)  # Evicted meanwhile
+            meta = self._cache_meta(response) if key is not None else None
+            with response:
+                chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+                if self.response_format == 'ndjson':
+                    records = (record for line in iter_ndjson(chunks) for record in self.records(line))
+                else:
+                    records = iter_json_records(chunks, self.record_path)
+                if meta is None:
+                    yield from records
+                else:
+                    yield from self._write_through(records, self.http_cache.writer(key, meta))
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"API request failed: {e}")
+        except ValueError as e:
+            raise RuntimeError(f"Invalid API response from {self.endpoint}: {e}")
+
+    def _session(self, url):
+        """
+        Returns the pooled session of the host of a URL.
+        """
+        host = host_of(url)
+        session = self._sessions.get(host)
+        if session is None:
+            # The copies of a FAN_OUT source share this dictionary; setdefault keeps it consistent across threads
+            session = self._sessions.setdefault(host, get_session(url))
+        return session
+
+    def _rate_limiter(self, url):
+        """
+        Returns the rate limiter of the host of a URL, or None without RATE_LIMIT.
+        """
+        if self.rate_limit is None:
+            return None
+        return get_rate_limiter(url, self.rate_limit, self.rate_limit_burst)
+
+    def _cache_key(self, url, params):
+        """
+        Returns the HTTP cache key of a request: its method, URL, parameters, body and
+        headers, and how records are read from the response.
+        """
+        identity = {'method': self.method.upper(), 'url': url, 'params': params, 'body': self.body,
+                    'headers': self.headers, 'record_path': self.record_path, 'format': self.response_format}
+        payload = json.dumps(identity, sort_keys=True, default=str)
+        return 'http-' + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _revalidate(self, url, params, stream=False):
+        """
+        Sends a request, made conditional with the ETag and Last-Modified validators of
+        the cached response to the same request, if any.
+
+        :return: The response, the cache key of the request and the metadata of its
+            cached response (None when not cached).
+        :rtype: tuple
+        """
+        if self.http_cache is None:
+            return self._request(url, params, stream), None, None
+        key = self._cache_key(url, params)
+        meta = self.http_cache.get_meta(key)
+        conditions = {}
+        if meta and meta.get('etag'):
+            conditions['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            conditions['If-Modified-Since'] = meta['last_modified']
+        return self._request(url, params, stream, conditions), key, meta
+
+    def _cache_meta(self, response, body=None):
+        """
+        Returns the metadata to cache with a response: its validators, its links and its
+        body without the records. Responses without validators are not cached.
+
+        :rtype: dict
+        """
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+        return {'etag': etag, 'last_modified': last_modified, 'links': response.links, 'body': self._skeleton(body)}
+
+    def _skeleton(self, body):
+        """
+        Returns a copy of a response body without its records, keeping what pagination
+        reads (totals, cursors).
+        """
+        keys = record_keys(self.record_path)
+        if not keys or not isinstance(body, dict):
+            return None
+        skeleton = node = dict(body)
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                return skeleton
+            node[key] = dict(node[key])
+            node = node[key]
+        node.pop(keys[-1], None)
+        return skeleton
+
+    def _write_through(self, records, writer):
+        """
+        Yields records while writing them to a cache entry, published once every record
+        has been read.
+        """
+        pending = []
+        try:
+            for record in records:
+                pending.append(record)
+                if len(pending) >= DEFAULT_BATCH_SIZE:
+                    writer.write(pending)
+                    pending = []
+                yield record
+            writer.write(pending)
+            writer.commit()
+        except BaseException:
+            writer.abort()  # Failed or stopped early: the entry would be incomplete
+            raise
+
+    def _request(self, url, params, stream=False, headers=None):
+        """
+        Sends one request to the API, retrying failed attempts.
+
+        :param url: The URL to request.
+        :type url: str
+        :param params: Query parameters of a GET, or JSON body of a POST without BODY.
+        :type params: dict
+        :param stream: Whether to return before the body is downloaded.
+        :type stream: bool
+        :param headers: Headers sent in addition to the HEADERS of the source.
+        :type headers: dict
+        :return: The successful response.
+        :rtype: requests.Response
+        :raises requests.exceptions.RequestException: If the request still fails after
+            the retries.
+        """
+        method = self.method.upper()
+        if method not in ('GET', 'POST'):
+            raise ValueError(f"Unsupported HTTP method: {self.method}")
+        session = self._session(url)
+        limiter = self._rate_limiter(url)
+        options = {'timeout': self.timeout, 'stream': True} if stream else {'timeout': self.timeout}
+        headers = dict(self.headers, **headers) if headers else self.headers
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                with self.concurrency_slot(host_of(url)) as call:
+                    if method == 'GET':
+                        response = session.get(url, headers=headers, params=params, **options)
+                    else:
+                        response = session.post(url, headers=headers, json=self.body if self.body is not None else params,
+                                                **options)
+                    call['status'] = response.status_code
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retry.max_retries:
+                    response.raise_for_status()  # Raise an exception for HTTP errors
+                    return response
+                reason = f"HTTP {response.status_code}"
+                wait = self.retry.delay(attempt, response.headers.get('Retry-After'))
+                response.close()  # Release the connection of a streamed response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.retry.max_retries:
+                    raise
+                reason = str(e)
+                wait = self.retry.delay(attempt)
+            attempt += 1
+            self.logger.warning(f"API request to {url} failed ({reason}), retry {attempt}/{self.retry.max_retries} "
+                                f"in {wait:.1f}s")
+            time.sleep(wait)
+
+    def records(self, body):
+        """
+        Extracts the records of a response: the value under RECORD_PATH if set, or the
+        whole document.
+
+        :param body: The decoded JSON response.
+        :return: The records of the response.
+        :rtype: list of dict
+        """
+        data = lookup(body, self.record_path) if self.record_path else body
+        if data is None:
+            return []
+        return data if isinstance(data, list) else [data]
+
+    def _fetch_page(self, url, params):
+        """
+        Requests one page, or reads it from the HTTP cache when the server reports it
+        unchanged.
+
+        :return: The records of the page, its decoded body (without the records when
+            read from the cache) and the links of its ``Link`` header.
+        :rtype: tuple
+        """
+        response, key, meta = self._revalidate(url, params)
+        if response.status_code == 304:
+            rows = self.http_cache.get(key, math.inf)
+            if rows is not None:
+                self.logger.debug(f"Response of {url} unchanged, read {len(rows)} records from the HTTP cache")
+                return rows, meta.get('body'), meta.get('links', {})
+            response = self._request(url, params)  # Evicted meanwhile
+        if self.response_format == 'ndjson':
+            # Pages of NDJSON lines have no body to read totals or cursors from
+            lines = iter_ndjson(response.iter_content(chunk_size=CHUNK_SIZE))
+            body = None
+            rows = [record for line in lines for record in self.records(line)]
+        else:
+            body = response.json()
+            rows = self.records(body)
+        if key is not None:
+            cache_meta = self._cache_meta(response, body)
+            if cache_meta is not None:
+                self.http_cache.put(key, rows, cache_meta)
+        return rows, body, response.links
+
+    def fetch_pages(self):
+        """
+        Yields the records of every page, in page order.
+
+        With ``page`` and ``offset`` pagination, the total read from the first page
+        (TOTAL_PATH or TOTAL_PAGES_PATH) lets the other pages be requested concurrently;
+        without it, pages are requested one after the other until a short or empty
+        page. ``cursor`` and ``link`` pagination can only learn the next page from the
+        current one, so the next request is sent as soon as a page arrives, while its
+        records are being processed.
+
+        :return: An iterator over the records of each page.
+        :rtype: iterator of list of dict
+        :raises RuntimeError: If an API request fails.
+        """
+        style = self.pagination.get('type', 'page').lower()
+        try:
+            if style in ('cursor', 'link'):
+                yield from self._follow_pages(style)
+            else:
+                yield from self._numbered_pages(style)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"API request failed: {e}")
+        except ValueError as e:
+            raise RuntimeError(f"Invalid API response from {self.endpoint}: {e}")
+
+    def _page_params(self, style, index, page_size):
+        """
+        Returns the request parameters of the page at a 0-based index.
+        """
+        options = self.pagination
+        params = dict(self.query_params)
+        if style == 'offset':
+            params[options.get('offset_param', 'offset')] = options.get('start', 0) + index * page_size
+            params[options.get('limit_param', 'limit')] = page_size
+        else:
+            params[options.get('page_param', 'page')] = options.get('start', 1) + index
+            if options.get('size_param') and page_size:
+                params[options['size_param']] = page_size
+        return params
+
+    def _numbered_pages(self, style):
+        """
+        Yields the records of ``page`` or ``offset`` pages.
+        """
+        options = self.pagination
+        page_size = options.get('page_size')
+        max_pages = options.get('max_pages')
+
+        rows, body, _ = self._fetch_page(self.endpoint, self._page_params(style, 0, page_size))
+        yield rows
+        page_size = page_size or len(rows)
+
+        pages = None
+        if options.get('total_pages_path'):
+            pages = lookup(body, options['total_pages_path'])
+        elif options.get('total_path') and page_size:
+            total = lookup(body, options['total_path'])
+            if total is not None:
+                if style == 'offset':
+                    total -= options.get('start', 0)
+                pages = math.ceil(int(total) / page_size)
+        if max_pages:
+            pages = min(int(pages), max_pages) if pages is not None else None
+
+        if pages is not None:
+            self.logger.info(f"Fetching {pages} pages of {self.endpoint}")
+            yield from self._fetch_concurrently(
+                lambda index: self._fetch_page(self.endpoint, self._page_params(style, index, page_size))[0],
+                range(1, int(pages)), self._workers(options, DEFAULT_PAGE_CONCURRENCY))
+            return
+
+        index = 1
+        while rows and len(rows) >= page_size and (not max_pages or index < max_pages):
+            rows, _, _ = self._fetch_page(self.endpoint, self._page_params(style, index, page_size))
+            if rows:
+                yield rows
+            index += 1
+
+    def _workers(self, options, default):
+        """
+        Returns the number of requests of a PAGINATION or FAN_OUT block sent at once: its
+        CONCURRENCY if set, else as many as adaptive concurrency may allow per host, which
+        then holds back the requests the host cannot sustain.
+        """
+        if options.get('concurrency'):
+            return options['concurrency']
+        return self.max_host_concurrency if self.limiters is not None else default
+
+    def _fetch_concurrently(self, fetch, items, workers):
+        """
+        Fetches pages (or fan-out requests) on a thread pool and yields them in order,
+        keeping a bounded number in flight.
+
+        :param fetch: Function fetching the records of an item, e.g. a page from its index.
+        :type fetch: callable
+        :param items: The items to fetch.
+        :type items: iterable
+        :param workers: Number of items fetched at once.
+        :type workers: int
+        :return: An iterator over the records of each item.
+        :rtype: iterator of list of dict
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for item in items:
+                    pending.append(executor.submit(fetch, item))
+                    if len(pending) >= 2 * workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Stopped early or failed: drop the items not requested yet
+                for future in pending:
+                    future.cancel()
+
+    def _follow_pages(self, style):
+        """
+        Yields the records of ``cursor`` or ``link`` pages, requesting the next page in
+        the background while the current one is consumed.
+        """
+        options = self.pagination
+        max_pages = options.get('max_pages')
+        cursor = None
+        count = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._fetch_page, self.endpoint, self.query_params)
+            while future is not None:
+                rows, body, links = future.result()
+                count += 1
+                future = None
+                if not max_pages or count < max_pages:
+                    if style == 'link':
+                        # The next URL carries its own query string
+                        url = links.get('next', {}).get('url')
+                        if url:
+                            future = executor.submit(self._fetch_page, url, {})
+                    else:
+                        next_cursor = lookup(body, options.get('cursor_path', 'next_cursor'))
+                        if next_cursor and next_cursor != cursor:
+                            cursor = next_cursor
+                            params = dict(self.query_params, **{options.get('cursor_param', 'cursor'): cursor})
+                            future = executor.submit(self._fetch_page, self.endpoint, params)
+                yield rows
+
+    async def fetch_data_async(self, http_session=None):
+        """
+        Executes the API request on the event loop with aiohttp, falling back to a
+        thread when aiohttp is not installed.
+
+        :param http_session: A shared ``aiohttp.ClientSession``; a temporary one is used if omitted.
+        :type http_session: aiohttp.ClientSession
+        :return: The records of the response, under RECORD_PATH if set, as with :meth:`fetch_data`.
+        :rtype: list of dict
+        :raises RuntimeError: If the API request fails.
+        """
+        if aiohttp is None or self.fan_out or self.pagination or self.streams or self.http_cache is not None \
+                or self.limiters is not None:
+            # Fan-out requests, pages, streamed and cached responses, and requests under
+            # adaptive concurrency are read by fetch_data on a thread
+            return await super().fetch_data_async(http_session)
+        if http_session is None:
+            async with aiohttp.ClientSession() as session:
+                return await self.fetch_data_async(session)
+
+        method = self.method.upper()
+        if method not in ('GET', 'POST'):
+            raise ValueError(f"Unsupported HTTP method: {self.method}")
+        limiter = self._rate_limiter(self.endpoint)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await asyncio.sleep(limiter.reserve())
+            if method == 'GET':
+                request = http_session.get(self.endpoint, headers=self.headers, params=self.query_params)
+            else:
+                request = http_session.post(self.endpoint, headers=self.headers,
+                                            json=self.body if self.body is not None else self.query_params)
+            try:
+                async with request as response:
+                    if response.status not in RETRY_STATUSES or attempt >= self.retry.max_retries:
+                        response.raise_for_status()  # Raise an exception for HTTP errors
+                        body = await response.json(content_type=None)
+                        break
+                    reason = f"HTTP {response.status}"
+                    wait = self.retry.delay(attempt, response.headers.get('Retry-After'))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.retry.max_retries:
+                    raise RuntimeError(f"API request failed: {e}")
+                reason = str(e) or type(e).__name__
+                wait = self.retry.delay(attempt)
+            except aiohttp.ClientError as e:
+                raise RuntimeError(f"API request failed: {e}")
+            attempt += 1
+            self.logger.warning(f"API request to {self.endpoint} failed ({reason}), "
+                                f"retry {attempt}/{self.retry.max_retries} in {wait:.1f}s")
+            await asyncio.sleep(wait)
+        return self.records(body)
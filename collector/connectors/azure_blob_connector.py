@@ -1,7 +1,9 @@
 from azure.storage.blob import BlobServiceClient
+from collector.connectors.base_connector import BaseConnector, is_incremental
+from collector.connectors.client_cache import get_client
 from collector.utils.logger import get_logger
 
-class AzureBlobConnector:
+class AzureBlobConnector(BaseConnector):
     """
     AzureBlobConnector handles fetching files from Azure Blob Storage.
 
@@ -17,9 +19,12 @@ class AzureBlobConnector:
         :type config: dict
         """
         self.config = config
-        self.blob_service_client = BlobServiceClient(
-            account_url=f"https://{config['azure_storage_account']}.blob.core.windows.net",
-            credential=config['azure_storage_key']
+        self.blob_service_client = get_client(
+            ('azure_blob', config['azure_storage_account'], config['azure_storage_key']),
+            lambda: BlobServiceClient(
+                account_url=f"https://{config['azure_storage_account']}.blob.core.windows.net",
+                credential=config['azure_storage_key']
+            )
         )
         self.logger = get_logger("AzureBlobConnector")
 
@@ -33,7 +38,18 @@ class AzureBlobConnector:
         try:
             self.logger.info(f"Fetching data from Azure Blob container: {self.config['container']}, blob: {self.config['blob']}")
             blob_client = self.blob_service_client.get_blob_client(container=self.config['container'], blob=self.config['blob'])
-            blob_data = blob_client.download_blob().readall().decode('utf-8')
+            version = None
+            if is_incremental(self.config):
+                properties = blob_client.get_blob_properties()
+                version = {'etag': properties.etag, 'last_modified': properties.last_modified.isoformat()}
+                if self.is_unchanged(version):
+                    self.logger.info(f"Azure blob {self.config['blob']} is unchanged since the last run")
+                    return []
+            with self.concurrency_slot(f"azure://{self.config['azure_storage_account']}/{self.config['container']}",
+                                       measure_latency=False):
+                blob_data = blob_client.download_blob().readall().decode('utf-8')
+            if version is not None:
+                self.watermark = version
             return blob_data
         except Exception as e:
             self.logger.error(f"Error fetching data from Azure Blob Storage: {e}")
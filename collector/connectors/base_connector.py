@@ -0,0 +1,212 @@
+import asyncio
+import threading
+from contextlib import nullcontext
+from itertools import islice
+
+import pyarrow as pa
+
+from collector.connectors.concurrency import DEFAULT_MAX_HOST_CONCURRENCY, get_limiter
+from collector.utils.records import batch_length, to_arrow, to_records
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def is_incremental(config):
+    """
+    Tells whether a source only reads what changed since the previous run, as set by
+    INCREMENTAL, which the .col file gives as text (e.g. ``'false'``).
+
+    :param config: The details of the SOURCE.
+    :type config: dict
+    :rtype: bool
+    """
+    return str(config.get('incremental', False)).lower() == 'true'
+
+
+def iter_batches(records, batch_size):
+    """
+    Splits an iterable of records into lists of at most ``batch_size`` records.
+
+    :param records: The records to split.
+    :type records: iterable
+    :param batch_size: Maximum number of records per batch.
+    :type batch_size: int
+    :return: An iterator over record batches.
+    :rtype: iterator of list
+    """
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_in_thread(func):
+    """
+    Runs a blocking function in a daemon thread, from an asyncio event loop.
+
+    Unlike the threads of the loop's executor, which ``asyncio.run`` waits for when it
+    returns, the thread is abandoned when its caller gives up on it (e.g. after the
+    TIMEOUT of a source) and left to finish in the background, as with the thread
+    scheduler, so a stuck fetch cannot hold up the end of the run.
+
+    :param func: The function to call, without arguments.
+    :type func: callable
+    :return: A future resolved with the result of the function.
+    :rtype: asyncio.Future
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        if future.done():  # Cancelled by a timeout
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def run():
+        try:
+            result, error = func(), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # The loop is closed: nobody waits for the result anymore
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class BaseConnector:
+    """
+    Base class shared by all data source connectors.
+
+    Subclasses implement :meth:`fetch_data`. Connectors that can read their source
+    incrementally also override :meth:`fetch_batches` so the collector can stream
+    records without holding the full dataset in memory, and connectors reading columnar
+    data override :meth:`fetch_record_batches` to produce Arrow batches directly.
+    """
+
+    # Name of the SOURCE block the connector was created for, set by the Collector
+    source_name = None
+
+    # Columns and filters to push down to the source, set by the Collector when PUSHDOWN is
+    # enabled: {'columns': [...] or None, 'filters': [{'field', 'op', 'value'}, ...]}.
+    # Connectors that cannot use them ignore them; filters are also applied by the transform.
+    pushdown = None
+
+    # High-water mark of an incremental source: set by the Collector from the state of
+    # the previous run, and advanced by the connector as it reads new data
+    watermark = None
+
+    # Adaptive limiters of the hosts requested, by host, and the upper bound of their
+    # limits: set by the Collector when ADAPTIVE_CONCURRENCY is enabled
+    limiters = None
+    max_host_concurrency = DEFAULT_MAX_HOST_CONCURRENCY
+
+    def concurrency_slot(self, host, measure_latency=True):
+        """
+        Holds one of the concurrent requests allowed to a host by adaptive concurrency
+        (see :class:`~collector.connectors.concurrency.AdaptiveLimiter`), for the duration
+        of a ``with`` block. The block reports the HTTP 'status' of the response, or the
+        'outcome' of the request, in the yielded dictionary.
+
+        :param host: The host, e.g. ``https://api.example.com`` or ``s3://bucket``.
+        :type host: str
+        :param measure_latency: Whether the duration of the block reflects the load of the host.
+        :type measure_latency: bool
+        :return: A context manager, doing nothing when adaptive concurrency is off.
+        """
+        if self.limiters is None:
+            return nullcontext({})
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            limiter = self.limiters[host] = get_limiter(host, self.max_host_concurrency)
+        return limiter.slot(measure_latency)
+
+    def advance_watermark(self, rows, column):
+        """
+        Raises the watermark to the highest value of a column among fetched rows.
+
+        :param rows: The rows just fetched.
+        :type rows: list of dict
+        :param column: The watermark column.
+        :type column: str
+        """
+        values = [row[column] for row in rows if row.get(column) is not None]
+        if values:
+            highest = max(values)
+            if self.watermark is None or highest > self.watermark:
+                self.watermark = highest
+
+    def is_unchanged(self, version):
+        """
+        Tells whether a source object is unchanged since the previous run.
+
+        :param version: Metadata identifying the current version of the object
+            (e.g. ETag and last modification time).
+        :type version: dict
+        :return: True if the version matches the stored watermark.
+        :rtype: bool
+        """
+        return self.watermark is not None and self.watermark == version
+
+    def fetch_data(self):
+        """
+        Fetches all data from the source.
+
+        :return: The records read from the source.
+        :rtype: list of dict
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement fetch_data")
+
+    def fetch_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yields the source records in batches of at most ``batch_size`` rows.
+
+        The default implementation fetches the whole result with :meth:`fetch_data`
+        and slices it, so it only bounds memory downstream of the connector.
+
+        :param batch_size: Maximum number of records per batch.
+        :type batch_size: int
+        :return: An iterator over record batches.
+        :rtype: iterator of list of dict
+        """
+        yield from iter_batches(to_records(self.fetch_data()), batch_size)
+
+    def fetch_record_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yields the source records as Arrow batches of at most ``batch_size`` rows.
+
+        The default implementation converts the batches of :meth:`fetch_batches`; a batch
+        whose values cannot be stored in Arrow columns (e.g. a column mixing numbers and
+        text) is yielded as records instead.
+
+        :param batch_size: Maximum number of records per batch.
+        :type batch_size: int
+        :return: An iterator over record batches.
+        :rtype: iterator of pyarrow.Table or list of dict
+        """
+        for batch in self.fetch_batches(batch_size):
+            try:
+                yield to_arrow(batch)
+            except (pa.ArrowException, ValueError, TypeError):
+                yield batch
+
+    async def fetch_data_async(self, http_session=None):
+        """
+        Fetches all data from the source from an asyncio event loop.
+
+        The default implementation offloads the blocking :meth:`fetch_data` to a daemon
+        thread (see :func:`run_in_thread`) so it does not block other sources.
+
+        :param http_session: A shared ``aiohttp.ClientSession`` for connectors speaking HTTP.
+            Ignored by connectors that do not use it.
+        :return: The records read from the source.
+        :rtype: list of dict
+        """
+        return await run_in_thread(self.fetch_data)
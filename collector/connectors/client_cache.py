@@ -0,0 +1,123 @@
+import threading
+from contextlib import contextmanager
+
+from collector.utils.logger import get_logger
+
+
+class ClientCache:
+    """
+    Keeps connector clients (SQLAlchemy engines, Mongo clients, cloud SDK clients) alive
+    between collector runs, keyed by their connection identity, so their connection
+    pools stay warm.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty cache.
+        """
+        self.clients = {}
+        self._lock = threading.Lock()
+        self.logger = get_logger()
+
+    def get(self, key, factory):
+        """
+        Returns the client of a connection identity, creating it on first use.
+
+        :param key: The connection identity, e.g. ``('sql', connection_string)``.
+        :type key: tuple
+        :param factory: Callable creating the client.
+        :type factory: callable
+        :return: The cached client.
+        """
+        with self._lock:
+            client = self.clients.get(key)
+            if client is None:
+                client = self.clients[key] = factory()
+                self.logger.debug(f"Created {key[0]} client")
+            return client
+
+    def close(self):
+        """
+        Closes every cached client, disposing connection pools.
+        """
+        with self._lock:
+            clients = list(self.clients.values())
+            self.clients.clear()
+        for client in clients:
+            close = getattr(client, 'dispose', None) or getattr(client, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    self.logger.warning(f"Failed to close {type(client).__name__}: {e}")
+
+
+# Cache used by connectors: set for the duration of collector runs, and while clients
+# should outlive a run (daemon and batch modes)
+_active_cache = None
+
+# Cache created by run_scope() and the number of runs using it
+_scoped_cache = None
+_scope_users = 0
+_scope_lock = threading.Lock()
+
+
+def activate(cache):
+    """
+    Makes connectors take their clients from a cache until :func:`deactivate` is called.
+
+    :param cache: The cache to use.
+    :type cache: ClientCache
+    """
+    global _active_cache
+    _active_cache = cache
+
+
+def deactivate():
+    """
+    Makes connectors create their own clients again.
+    """
+    global _active_cache
+    _active_cache = None
+
+
+@contextmanager
+def run_scope():
+    """
+    Shares clients between the connectors of collector runs. Unless a cache is already
+    active (daemon and batch modes), a cache is activated for as long as a run is in
+    progress and closed, disposing connection pools, when the last one ends.
+    """
+    global _scoped_cache, _scope_users
+    with _scope_lock:
+        if _active_cache is None:
+            _scoped_cache = ClientCache()
+            activate(_scoped_cache)
+        if _active_cache is _scoped_cache:
+            _scope_users += 1
+    try:
+        yield
+    finally:
+        with _scope_lock:
+            if _scoped_cache is not None and _active_cache is _scoped_cache:
+                _scope_users -= 1
+                if _scope_users == 0:
+                    cache, _scoped_cache = _scoped_cache, None
+                    deactivate()
+                    cache.close()
+
+
+def get_client(key, factory):
+    """
+    Returns a client for a connection identity: the cached one when a cache is
+    active, otherwise a new one.
+
+    :param key: The connection identity. It must include every option that changes the client.
+    :type key: tuple
+    :param factory: Callable creating the client.
+    :type factory: callable
+    :return: The client.
+    """
+    if _active_cache is None:
+        return factory()
+    return _active_cache.get(key, factory)
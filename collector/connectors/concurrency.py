@@ -0,0 +1,200 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from collector.connectors.client_cache import get_client
+from collector.utils.logger import get_logger
+
+# Concurrent requests allowed to a host before anything is known about it
+DEFAULT_INITIAL_LIMIT = 4
+
+# Upper bound of the concurrent requests allowed to a host
+DEFAULT_MAX_HOST_CONCURRENCY = 64
+
+# Smoothed latency, as a multiple of the latency of the unloaded host, above which the
+# host is considered saturated
+LATENCY_TOLERANCE = 2.0
+
+# Factors applied to the limit on overload: halved when the host throttles or fails,
+# lowered gently when it only slows down
+FAILURE_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.9
+
+# Response statuses of a host asking clients to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def outcome_of(status):
+    """
+    Classifies a response status for :meth:`AdaptiveLimiter.release`.
+
+    :param status: The HTTP status code.
+    :type status: int
+    :return: 'throttled', 'error' for other server errors, or 'ok'.
+    :rtype: str
+    """
+    if status in THROTTLE_STATUSES:
+        return 'throttled'
+    return 'error' if status >= 500 else 'ok'
+
+
+def get_limiter(name, max_limit=DEFAULT_MAX_HOST_CONCURRENCY):
+    """
+    Returns the adaptive limiter of a host, shared by every source requesting it during
+    a run (and across runs in daemon and batch modes, so the limit learned is kept).
+
+    :param name: The host, e.g. ``https://api.example.com`` or ``s3://bucket``.
+    :type name: str
+    :param max_limit: Upper bound of the limit.
+    :type max_limit: int
+    :rtype: AdaptiveLimiter
+    """
+    return get_client(('adaptive', name, max_limit), lambda: AdaptiveLimiter(name, max_limit=max_limit))
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on the requests in flight to one host, converging to the concurrency the
+    host sustains.
+
+    The limit doubles every round trip while the host keeps up (slow start), then grows
+    by one request per round trip as long as requests are waiting for it. It is halved
+    when the host throttles (429, 503) or fails, and lowered by 10% when the smoothed
+    latency exceeds twice the latency of the unloaded host, at most once per round trip
+    so a burst of failures only counts once.
+
+    :param name: The host, used in logs and metrics.
+    :type name: str
+    :param initial: The limit before any request completed.
+    :type initial: int
+    :param max_limit: Upper bound of the limit.
+    :type max_limit: int
+    """
+
+    def __init__(self, name, initial=DEFAULT_INITIAL_LIMIT, max_limit=DEFAULT_MAX_HOST_CONCURRENCY):
+        """
+        Initializes the limiter of a host.
+
+        :param name: The host.
+        :type name: str
+        :param initial: The limit before any request completed.
+        :type initial: int
+        :param max_limit: Upper bound of the limit.
+        :type max_limit: int
+        """
+        self.name = name
+        self.max_limit = max_limit
+        self.limit = float(min(initial, max_limit))
+        self.peak = self.limit
+        self.in_flight = 0
+        self.slow_start = True
+        self.baseline = None  # Latency of the unloaded host
+        self.latency = None  # Smoothed latency
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self._condition = threading.Condition()
+        self.logger = get_logger()
+
+    def acquire(self):
+        """
+        Waits until a request can be sent without exceeding the limit.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency=None, outcome='ok'):
+        """
+        Ends a request and adapts the limit to how it went.
+
+        :param latency: Duration of the request in seconds, or None when it says nothing
+            about the load of the host (e.g. downloads of objects of any size).
+        :type latency: float
+        :param outcome: 'ok', 'throttled' or 'error', see :func:`outcome_of`.
+        :type outcome: str
+        """
+        with self._condition:
+            # Only requests sent while the limit was reached tell whether a higher one would help
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            self.requests += 1
+            if outcome != 'ok':
+                if outcome == 'throttled':
+                    self.throttled += 1
+                else:
+                    self.errors += 1
+                self._decrease(FAILURE_BACKOFF, outcome)
+            elif latency is not None and self._slowed_down(latency):
+                self._decrease(LATENCY_BACKOFF, f"latency {self.latency * 1000:.0f}ms")
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + (1 if self.slow_start else 1 / self.limit))
+                self.peak = max(self.peak, self.limit)
+            self._condition.notify_all()
+
+    def _slowed_down(self, latency):
+        """
+        Updates the latency estimates and tells whether the host is slower than unloaded.
+        """
+        if self.latency is None:
+            self.baseline = self.latency = latency
+            return False
+        self.latency = 0.8 * self.latency + 0.2 * latency
+        # The baseline follows the lowest latency, drifting up slowly in case the host got slower for good
+        self.baseline = min(latency, self.baseline + 0.01 * (self.latency - self.baseline))
+        return self.latency > LATENCY_TOLERANCE * self.baseline
+
+    def _decrease(self, factor, reason):
+        """
+        Lowers the limit, once per round trip.
+        """
+        now = time.monotonic()
+        if now - self.last_decrease < (self.latency or 0):
+            return
+        self.last_decrease = now
+        self.slow_start = False
+        limit = max(1.0, self.limit * factor)
+        if int(limit) < int(self.limit):
+            self.logger.debug(f"Lowering the concurrency of {self.name} to {int(limit)} ({reason})")
+        self.limit = limit
+
+    @contextmanager
+    def slot(self, measure_latency=True):
+        """
+        Holds a request slot for the duration of a block. The block reports how the
+        request went by setting the HTTP 'status' of the response, or the 'outcome', in
+        the yielded dictionary; a block raising an exception counts as an error.
+
+        :param measure_latency: Whether the duration of the block reflects the load of the host.
+        :type measure_latency: bool
+        """
+        self.acquire()
+        call = {}
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call.setdefault('outcome', 'error')
+            raise
+        finally:
+            latency = time.perf_counter() - started if measure_latency else None
+            outcome = call.get('outcome') or (outcome_of(call['status']) if 'status' in call else 'ok')
+            self.release(latency, outcome)
+
+    def stats(self):
+        """
+        Returns the limit chosen for the host and what it was based on.
+
+        :rtype: dict
+        """
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'peak': int(self.peak),
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'errors': self.errors,
+                'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None
+            }
@@ -1,6 +1,11 @@
+import os
+
 import pandas as pd
+import pyarrow as pa
+
+from collector.connectors.base_connector import BaseConnector, DEFAULT_BATCH_SIZE, is_incremental
 
-class CSVConnector:
+class CSVConnector(BaseConnector):
     """
     CSVConnector reads data from a CSV file and returns it as a list of dictionaries.
     
@@ -17,7 +22,30 @@ class CSVConnector:
         """
         self.file_path = config['file_path']
         self.delimiter = config.get('delimiter', ',')
+        self.incremental = is_incremental(config)
+
+    def _file_version(self):
+        """
+        Returns the modification time and size of the file, used as watermark by INCREMENTAL sources.
+
+        :return: The version of the file.
+        :rtype: dict
+        """
+        stat = os.stat(self.file_path)
+        return {'mtime': stat.st_mtime, 'size': stat.st_size}
     
+    def _read_options(self):
+        """
+        Returns the options of ``pandas.read_csv``, only parsing the columns pushed down
+        from the TRANSFORM blocks. Filters are applied by the transformation.
+        """
+        options = {'delimiter': self.delimiter}
+        columns = (self.pushdown or {}).get('columns')
+        if columns:
+            wanted = set(columns)
+            options['usecols'] = lambda column: column in wanted
+        return options
+
     def fetch_data(self):
         """
         Reads the CSV file and returns the data as a list of dictionaries.
@@ -26,8 +54,54 @@ class CSVConnector:
         :rtype: list of dict
         """
         try:
-            df = pd.read_csv(self.file_path, delimiter=self.delimiter)
+            version = self._file_version() if self.incremental else None
+            if version is not None and self.is_unchanged(version):
+                return []
+            df = pd.read_csv(self.file_path, **self._read_options())
+            if version is not None:
+                self.watermark = version
             return df.to_dict(orient='records')
         except Exception as e:
             print(f"Error reading CSV file: {e}")
             raise
+
+    def _chunks(self, batch_size):
+        """
+        Reads the CSV file in DataFrame chunks of at most ``batch_size`` rows.
+        """
+        try:
+            version = self._file_version() if self.incremental else None
+            if version is not None and self.is_unchanged(version):
+                return
+            with pd.read_csv(self.file_path, chunksize=batch_size, **self._read_options()) as reader:
+                yield from reader
+            if version is not None:
+                self.watermark = version
+        except Exception as e:
+            print(f"Error reading CSV file: {e}")
+            raise
+
+    def fetch_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Reads the CSV file in chunks and yields each chunk as a list of dictionaries.
+
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :return: An iterator over batches of rows.
+        :rtype: iterator of list of dict
+        """
+        for chunk in self._chunks(batch_size):
+            yield chunk.to_dict(orient='records')
+
+    def fetch_record_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Reads the CSV file in chunks and yields each chunk as an Arrow record batch,
+        converted column by column.
+
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :return: An iterator over record batches.
+        :rtype: iterator of pyarrow.RecordBatch
+        """
+        for chunk in self._chunks(batch_size):
+            yield pa.RecordBatch.from_pandas(chunk, preserve_index=False)
@@ -1,7 +1,9 @@
 from google.cloud import storage
+from collector.connectors.base_connector import BaseConnector, is_incremental
+from collector.connectors.client_cache import get_client
 from collector.utils.logger import get_logger
 
-class GCSConnector:
+class GCSConnector(BaseConnector):
     """
     GCSConnector handles fetching files from Google Cloud Storage.
 
@@ -17,7 +19,10 @@ class GCSConnector:
         :type config: dict
         """
         self.config = config
-        self.client = storage.Client.from_service_account_json(config['google_cloud_key_file'])
+        self.client = get_client(
+            ('gcs', config['google_cloud_key_file']),
+            lambda: storage.Client.from_service_account_json(config['google_cloud_key_file'])
+        )
         self.bucket = self.client.bucket(config['bucket'])
         self.logger = get_logger("GCSConnector")
 
@@ -31,7 +36,20 @@ class GCSConnector:
         try:
             self.logger.info(f"Fetching data from GCS bucket: {self.config['bucket']}, object: {self.config['object']}")
             blob = self.bucket.blob(self.config['object'])
-            data = blob.download_as_text()
+            version = None
+            if is_incremental(self.config):
+                blob.reload()  # Load the object metadata
+                version = {'generation': blob.generation}
+                if self.is_unchanged(version):
+                    self.logger.info(f"GCS object {self.config['object']} is unchanged since the last run")
+                    return []
+                # Download exactly the generation that was checked
+                blob = self.bucket.blob(self.config['object'], generation=blob.generation)
+            # Only failures adapt the limit: the download time depends on the object size
+            with self.concurrency_slot(f"gs://{self.config['bucket']}", measure_latency=False):
+                data = blob.download_as_text()
+            if version is not None:
+                self.watermark = version
             return data
         except Exception as e:
             self.logger.error(f"Error fetching data from GCS: {e}")
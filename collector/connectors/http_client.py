@@ -0,0 +1,187 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from collector.connectors.client_cache import get_client
+
+# Connections kept open per host by a pooled session
+POOL_SIZE = 32
+
+# Seconds to wait for a connection, and for data of a response, before a request
+# times out and is retried
+REQUEST_TIMEOUT = (10, 60)
+
+# Response statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def host_of(url):
+    """
+    Returns the scheme and host of a URL, identifying the connection pool it uses.
+
+    :param url: The URL.
+    :type url: str
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _new_session():
+    """
+    Creates a keep-alive session. Sources of different accounts can share it, so it
+    does not keep cookies between requests.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(url):
+    """
+    Returns the pooled session of the host of a URL, shared by every source requesting
+    that host during a run (and across runs in daemon and batch modes).
+
+    :param url: The URL to request.
+    :type url: str
+    :rtype: requests.Session
+    """
+    return get_client(('http', host_of(url)), _new_session)
+
+
+def get_rate_limiter(url, rate, burst=None):
+    """
+    Returns the token bucket limiting requests to the host of a URL, shared by the
+    sources requesting that host with the same limit.
+
+    :param url: The URL to request.
+    :type url: str
+    :param rate: Requests allowed per second.
+    :type rate: float
+    :param burst: Requests allowed at once after an idle period; defaults to one second of requests.
+    :type burst: float
+    :rtype: TokenBucket
+    """
+    return get_client(('rate_limit', host_of(url), rate, burst), lambda: TokenBucket(rate, burst))
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: tokens accumulate at ``rate`` per second up to ``capacity``,
+    and each request takes one. Requests arriving on an empty bucket wait their turn, so
+    a limited host receives exactly its quota without bursts above it.
+
+    :param rate: Tokens added per second.
+    :type rate: float
+    :param capacity: Maximum number of tokens; defaults to one second of tokens.
+    :type capacity: float
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initializes a full bucket.
+
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param capacity: Maximum number of tokens.
+        :type capacity: float
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token, possibly ahead of time.
+
+        :return: The number of seconds to wait before using the token.
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until it is available.
+        """
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+
+def parse_retry_after(value):
+    """
+    Reads a ``Retry-After`` header, given in seconds or as an HTTP date.
+
+    :param value: The header value.
+    :type value: str
+    :return: The number of seconds to wait, or None if the header is missing or invalid.
+    :rtype: float
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retries of a source, configured by its RETRY block: failed requests are retried up
+    to ``MAX_RETRIES`` times, waiting ``RETRY_DELAY`` seconds doubled at every attempt
+    (at most ``MAX_DELAY``) with random jitter, or as long as the server asks with a
+    ``Retry-After`` header.
+
+    :param options: The parsed RETRY block; no retries when omitted.
+    :type options: dict
+    """
+
+    def __init__(self, options=None):
+        """
+        Reads the retry options.
+
+        :param options: The parsed RETRY block.
+        :type options: dict
+        """
+        options = options or {}
+        self.max_retries = int(options.get('max_retries', 3 if options else 0))
+        self.retry_delay = float(options.get('retry_delay', 1))
+        self.max_delay = float(options.get('max_delay', 60))
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Returns how long to wait before a retry.
+
+        :param attempt: The number of retries already made.
+        :type attempt: int
+        :param retry_after: The ``Retry-After`` header of the failed response, if any.
+        :type retry_after: str
+        :return: The delay in seconds.
+        :rtype: float
+        """
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return requested
+        delay = min(self.max_delay, self.retry_delay * 2 ** attempt)
+        # Half fixed, half random, so sources failing together do not retry together
+        return delay / 2 + random.uniform(0, delay / 2)
@@ -1,7 +1,12 @@
 from pymongo import MongoClient
+from collector.connectors.base_connector import BaseConnector, DEFAULT_BATCH_SIZE, iter_batches
+from collector.connectors.client_cache import get_client
 from collector.utils.logger import get_logger
 
-class MongoDBConnector:
+# MongoDB query operators of pushed down FILTER rules
+MONGO_OPERATORS = {'=': '$eq', '!=': '$ne', '>': '$gt', '>=': '$gte', '<': '$lt', '<=': '$lte'}
+
+class MongoDBConnector(BaseConnector):
     """
     MongoDBConnector handles connections to a MongoDB database and fetches data from collections.
 
@@ -28,7 +33,7 @@ class MongoDBConnector:
         """
         try:
             connection_string = f"mongodb://{self.config['host']}:{self.config['port']}"
-            self.client = MongoClient(connection_string)
+            self.client = get_client(('mongodb', connection_string), lambda: MongoClient(connection_string))
             self.database = self.client[self.config['database']]
             self.collection = self.database[self.config['collection']]
             self.logger.info(f"Connected to MongoDB: {self.config['database']} -> {self.config['collection']}")
@@ -36,6 +41,42 @@ class MongoDBConnector:
             self.logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
+    def _query(self):
+        """
+        Builds the find() filter from QUERY and the filters pushed down from the TRANSFORM
+        blocks, restricted to documents above the watermark when WATERMARK_COLUMN is set.
+
+        :return: The MongoDB filter document.
+        :rtype: dict
+        """
+        query = eval(self.config.get('query', '{}'))  # Ensure query is evaluated as a dictionary
+        conditions = [
+            {rule['field']: {MONGO_OPERATORS[rule['op']]: rule['value']}}
+            for rule in (self.pushdown or {}).get('filters', [])
+        ]
+        column = self.config.get('watermark_column')
+        if column and self.watermark is not None:
+            self.logger.info(f"Fetching documents with {column} > {self.watermark}")
+            conditions.append({column: {'$gt': self.watermark}})
+        if conditions:
+            return {'$and': [query] + conditions}
+        return query
+
+    def _find(self):
+        """
+        Runs find() with the filter of :meth:`_query`, projecting documents on the columns
+        pushed down from the TRANSFORM blocks.
+
+        :return: The cursor over the matching documents.
+        :rtype: pymongo.cursor.Cursor
+        """
+        columns = (self.pushdown or {}).get('columns')
+        if not columns:
+            return self.collection.find(self._query())
+        projection = {column: 1 for column in columns}
+        projection.setdefault('_id', 0)
+        return self.collection.find(self._query(), projection)
+
     def fetch_data(self):
         """
         Fetches data from the MongoDB collection based on the specified query.
@@ -47,10 +88,36 @@ class MongoDBConnector:
         try:
             if not self.client:
                 self.connect()
-            query = eval(self.config.get('query', '{}'))  # Ensure query is evaluated as a dictionary
-            data = list(self.collection.find(query))
+            data = list(self._find())
             self.logger.info(f"Fetched {len(data)} documents from MongoDB collection")
+            if self.config.get('watermark_column'):
+                self.advance_watermark(data, self.config['watermark_column'])
             return data
         except Exception as e:
             self.logger.error(f"Error fetching data from MongoDB: {e}")
             raise
+
+    def fetch_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Iterates the MongoDB cursor and yields documents in batches.
+
+        :param batch_size: Maximum number of documents per batch, also used as the cursor batch size.
+        :type batch_size: int
+        :return: An iterator over batches of documents.
+        :rtype: iterator of list of dict
+        :raises pymongo.errors.PyMongoError: If there is an error executing the query.
+        """
+        try:
+            if not self.client:
+                self.connect()
+            cursor = self._find().batch_size(batch_size)
+            total = 0
+            for batch in iter_batches(cursor, batch_size):
+                total += len(batch)
+                if self.config.get('watermark_column'):
+                    self.advance_watermark(batch, self.config['watermark_column'])
+                yield batch
+            self.logger.info(f"Fetched {total} documents from MongoDB collection")
+        except Exception as e:
+            self.logger.error(f"Error fetching data from MongoDB: {e}")
+            raise
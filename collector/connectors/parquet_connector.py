@@ -0,0 +1,121 @@
+import operator
+import os
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from collector.connectors.base_connector import BaseConnector, DEFAULT_BATCH_SIZE, is_incremental
+from collector.utils.logger import get_logger
+
+# Dataset expression builders of pushed down FILTER rules
+ARROW_OPERATORS = {'=': operator.eq, '!=': operator.ne, '>': operator.gt, '>=': operator.ge,
+                   '<': operator.lt, '<=': operator.le}
+
+class ParquetConnector(BaseConnector):
+    """
+    ParquetConnector reads data from a Parquet file and returns it as a list of dictionaries.
+
+    :param config: Configuration for the Parquet file (file path, columns).
+    :type config: dict
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the ParquetConnector with the specified configuration.
+
+        :param config: A dictionary containing configuration details such as file_path and
+            an optional comma-separated list of columns to read.
+        :type config: dict
+        """
+        self.file_path = config['file_path']
+        columns = config.get('columns')
+        self.columns = [column.strip() for column in columns.split(',')] if columns else None
+        self.incremental = is_incremental(config)
+        self.logger = get_logger()
+
+    def _file_version(self):
+        """
+        Returns the modification time and size of the file, used as watermark by INCREMENTAL sources.
+
+        :return: The version of the file.
+        :rtype: dict
+        """
+        stat = os.stat(self.file_path)
+        return {'mtime': stat.st_mtime, 'size': stat.st_size}
+
+    def _scanner(self, batch_size):
+        """
+        Builds a scanner reading the COLUMNS of the source, or the columns pushed down
+        from the TRANSFORM blocks, and skipping the rows excluded by pushed down filters.
+        Row groups whose statistics exclude every row are not read at all.
+        """
+        dataset = ds.dataset(self.file_path, format='parquet')
+        pushdown = self.pushdown or {}
+        columns = self.columns
+        if columns is None and pushdown.get('columns'):
+            columns = [column for column in pushdown['columns'] if column in dataset.schema.names]
+        expression = None
+        for rule in pushdown.get('filters', []):
+            if rule['field'] not in dataset.schema.names:
+                continue
+            condition = ARROW_OPERATORS[rule['op']](ds.field(rule['field']), rule['value'])
+            expression = condition if expression is None else expression & condition
+        try:
+            return dataset.scanner(columns=columns, filter=expression, batch_size=batch_size)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            # E.g. a text filter value on a timestamp column; the transformation still filters rows
+            self.logger.warning(f"Filters not pushed down to {self.file_path}: {e}")
+            return dataset.scanner(columns=columns, batch_size=batch_size)
+
+    def fetch_data(self):
+        """
+        Reads the Parquet file and returns the data as a list of dictionaries.
+
+        :return: A list of rows from the Parquet file, where each row is a dictionary.
+        :rtype: list of dict
+        """
+        version = self._file_version() if self.incremental else None
+        if version is not None and self.is_unchanged(version):
+            return []
+        if self.pushdown:
+            data = self._scanner(DEFAULT_BATCH_SIZE).to_table().to_pylist()
+        else:
+            data = pq.read_table(self.file_path, columns=self.columns).to_pylist()
+        if version is not None:
+            self.watermark = version
+        return data
+
+    def fetch_record_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Reads the Parquet file batch by batch, as Arrow record batches.
+
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :return: An iterator over record batches.
+        :rtype: iterator of pyarrow.RecordBatch
+        """
+        version = self._file_version() if self.incremental else None
+        if version is not None and self.is_unchanged(version):
+            return
+        if self.pushdown:
+            batches = self._scanner(batch_size).to_batches()
+        else:
+            batches = pq.ParquetFile(self.file_path).iter_batches(batch_size=batch_size, columns=self.columns)
+        for batch in batches:
+            if batch.num_rows:
+                yield batch
+        if version is not None:
+            self.watermark = version
+
+    def fetch_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Reads the Parquet file batch by batch.
+
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :return: An iterator over batches of rows.
+        :rtype: iterator of list of dict
+        """
+        for batch in self.fetch_record_batches(batch_size):
+            yield batch.to_pylist()
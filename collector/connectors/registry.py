@@ -0,0 +1,94 @@
+import importlib
+from importlib import metadata
+
+# Entry point group under which third-party packages register connectors, e.g. in setup.py:
+# entry_points={"collector.connectors": ["kafka = collector_kafka:KafkaConnector"]}
+ENTRY_POINT_GROUP = 'collector.connectors'
+
+# Built-in connectors by SOURCE TYPE, as "module:class" paths imported on first use
+BUILTIN_CONNECTORS = {
+    'sql': 'collector.connectors.sql_connector:SQLConnector',
+    'csv': 'collector.connectors.csv_connector:CSVConnector',
+    'parquet': 'collector.connectors.parquet_connector:ParquetConnector',
+    'api': 'collector.connectors.api_connector:APIConnector',
+    'mongodb': 'collector.connectors.mongodb_connector:MongoDBConnector',
+    's3': 'collector.connectors.s3_connector:S3Connector',
+    'gcs': 'collector.connectors.gcs_connector:GCSConnector',
+    'azure_blob': 'collector.connectors.azure_blob_connector:AzureBlobConnector',
+}
+
+_registry = dict(BUILTIN_CONNECTORS)
+_entry_points = None
+
+
+def _load_entry_points():
+    """
+    Returns the connector entry points of installed packages by SOURCE TYPE,
+    without importing them.
+
+    :rtype: dict
+    """
+    global _entry_points
+    if _entry_points is None:
+        try:
+            found = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:  # Python < 3.10
+            found = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+        _entry_points = {entry_point.name: entry_point for entry_point in found}
+    return _entry_points
+
+
+def register_connector(source_type, connector):
+    """
+    Registers the connector of a SOURCE TYPE, replacing any existing one.
+
+    :param source_type: The SOURCE TYPE, e.g. 'kafka'.
+    :type source_type: str
+    :param connector: The connector class, or its "module:class" path to import it on first use.
+    :type connector: type or str
+    """
+    _registry[source_type] = connector
+
+
+def is_registered(source_type):
+    """
+    Tells whether a connector is available for a SOURCE TYPE, without importing it.
+
+    :param source_type: The SOURCE TYPE.
+    :type source_type: str
+    :rtype: bool
+    """
+    return source_type in _registry or source_type in _load_entry_points()
+
+
+def available_types():
+    """
+    Returns every SOURCE TYPE with a connector.
+
+    :rtype: list of str
+    """
+    return sorted(set(_registry) | set(_load_entry_points()))
+
+
+def get_connector_class(source_type):
+    """
+    Returns the connector class of a SOURCE TYPE, importing its module on first use.
+    Registered connectors take precedence over entry points.
+
+    :param source_type: The SOURCE TYPE.
+    :type source_type: str
+    :return: The connector class.
+    :rtype: type
+    :raises ValueError: If no connector is registered for the type.
+    """
+    connector = _registry.get(source_type)
+    if connector is None:
+        entry_point = _load_entry_points().get(source_type)
+        if entry_point is None:
+            raise ValueError(f"Unsupported source type: {source_type}")
+        connector = entry_point.load()
+    elif isinstance(connector, str):
+        module_name, _, class_name = connector.partition(':')
+        connector = getattr(importlib.import_module(module_name), class_name)
+    _registry[source_type] = connector
+    return connector
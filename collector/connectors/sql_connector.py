@@ -1,8 +1,24 @@
+import concurrent.futures
+import queue
+import threading
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
 from sqlalchemy import create_engine, text
 
+from collector.connectors.base_connector import BaseConnector, DEFAULT_BATCH_SIZE
+from collector.connectors.client_cache import get_client
 from collector.utils.logger import get_logger
+from collector.utils.records import batch_length, is_arrow
+
+# SQL operators of pushed down FILTER rules
+SQL_OPERATORS = {'=': '=', '!=': '<>', '>': '>', '>=': '>=', '<': '<', '<=': '<='}
 
-class SQLConnector:
+# SOURCE options passed to create_engine to configure the connection pool
+POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_pre_ping')
+
+class SQLConnector(BaseConnector):
     """
     SQLConnector handles connections to SQL databases and fetches data.
     
@@ -25,11 +41,21 @@ class SQLConnector:
         """
         Establishes a connection to the SQL database using SQLAlchemy.
 
+        Engines are shared by every source with the same connection string and pool
+        options (POOL_SIZE, MAX_OVERFLOW, POOL_TIMEOUT, POOL_RECYCLE, POOL_PRE_PING), so
+        they reuse the connections of one pool.
+
         :raises sqlalchemy.exc.SQLAlchemyError: If a connection cannot be established.
         """
         db_type = self.config.get('db_type', 'postgresql')  # Default to PostgreSQL if not specified
         connection_string = self._generate_connection_string(db_type)
-        self.engine = create_engine(connection_string)
+        options = {option: self.config[option] for option in POOL_OPTIONS if option in self.config}
+        if isinstance(options.get('pool_pre_ping'), str):
+            options['pool_pre_ping'] = options['pool_pre_ping'].lower() == 'true'
+        self.engine = get_client(
+            ('sql', connection_string, tuple(sorted(options.items()))),
+            lambda: create_engine(connection_string, **options)
+        )
         self.logger.info(f"Connected to SQL database: {self.config.get('database')}")
 
     def _generate_connection_string(self, db_type):
@@ -54,28 +80,275 @@ class SQLConnector:
             database = self.config.get('database')
             return f"{db_type}://{username}:{password}@{host}:{port}/{database}"
 
-    def fetch_data(self, query):
+    def _statement(self, query, partition=None, project=True):
         """
-        Executes a SQL query and fetches data from the database.
+        Wraps a query to select the columns and apply the filters pushed down from the
+        TRANSFORM blocks, restricted to rows above the watermark when WATERMARK_COLUMN
+        is set, and to one partition when a partition predicate is given.
 
-        :param query: SQL query string to execute.
+        :param query: SQL query string.
         :type query: str
-        :return: A list of rows fetched from the database, where each row is a dictionary.
-        :rtype: list of dict
-        :raises sqlalchemy.exc.SQLAlchemyError: If the query fails to execute.
+        :param partition: A predicate and its bound parameters, from :meth:`_partitions`.
+        :type partition: tuple
+        :param project: Select only the pushed down columns.
+        :type project: bool
+        :return: The executable statement and its bound parameters.
+        :rtype: tuple
+        """
+        conditions = []
+        params = {}
+        pushdown = self.pushdown or {}
+        for index, rule in enumerate(pushdown.get('filters', [])):
+            conditions.append(f"{rule['field']} {SQL_OPERATORS[rule['op']]} :_filter_{index}")
+            params[f'_filter_{index}'] = rule['value']
+        column = self.config.get('watermark_column')
+        if column and self.watermark is not None:
+            conditions.append(f"{column} > :watermark")
+            params['watermark'] = self.watermark
+        if partition is not None:
+            conditions.append(partition[0])
+            params.update(partition[1])
+        columns = pushdown.get('columns') if project else None
+        if not conditions and not columns:
+            return text(query), params
+        statement = f"SELECT {', '.join(columns) if columns else '*'} FROM ({query}) AS _subquery"
+        if conditions:
+            statement += f" WHERE {' AND '.join(conditions)}"
+        return text(statement), params
+
+    @staticmethod
+    def _parse_bound(value):
+        """
+        Converts a LOWER_BOUND or UPPER_BOUND option to a number, date or datetime.
+        """
+        if not isinstance(value, str):
+            return value
+        for convert in (int, float, date.fromisoformat, datetime.fromisoformat):
+            try:
+                return convert(value)
+            except ValueError:
+                continue
+        raise ValueError(f"Invalid partition bound: {value}")
+
+    def _partition_bounds(self, connection, query):
+        """
+        Returns the LOWER_BOUND and UPPER_BOUND of the partition column, querying the
+        minimum and maximum of the column for the bounds not given.
+        """
+        lower = self.config.get('lower_bound')
+        upper = self.config.get('upper_bound')
+        if lower is None or upper is None:
+            column = self.config['partition_column']
+            statement, params = self._statement(query, project=False)
+            bounds = connection.execute(
+                text(f"SELECT MIN({column}), MAX({column}) FROM ({statement.text}) AS _bounds"), params
+            ).one()
+            lower = bounds[0] if lower is None else lower
+            upper = bounds[1] if upper is None else upper
+        return self._parse_bound(lower), self._parse_bound(upper)
+
+    def _resolve_projection(self, query):
+        """
+        Restricts the pushed down columns to those the query returns: FIELD rules can
+        name columns that do not exist, such as fields only given a DEFAULT, and
+        selecting them would fail the whole query.
+
+        :param query: SQL query string.
+        :type query: str
+        """
+        columns = (self.pushdown or {}).get('columns')
+        if not columns:
+            return
+        with self.engine.connect() as connection:
+            result = connection.execute(text(f"SELECT * FROM ({query}) AS _subquery WHERE 1 = 0"))
+            available = set(result.keys())
+        missing = [column for column in columns if column not in available]
+        if missing:
+            self.logger.info(f"Not selecting fields missing from the query: {', '.join(missing)}")
+            # Without any known column, select them all rather than none
+            self.pushdown = dict(self.pushdown, columns=[column for column in columns if column in available] or None)
+
+    def _partitions(self, query):
+        """
+        Splits the query into NUM_PARTITIONS range predicates on PARTITION_COLUMN.
+
+        As with Spark's JDBC reader, the bounds only set the stride of the partitions: the
+        first partition also holds the rows below LOWER_BOUND (and NULLs) and the last one
+        the rows above UPPER_BOUND, so no row is left out.
+
+        :param query: SQL query string.
+        :type query: str
+        :return: ``(predicate, params)`` pairs, or an empty list if the query is not partitioned.
+        :rtype: list of tuple
+        """
+        column = self.config.get('partition_column')
+        count = self.config.get('num_partitions', 1)
+        if not column or count <= 1:
+            return []
+        with self.engine.connect() as connection:
+            lower, upper = self._partition_bounds(connection, query)
+        if lower is None or upper is None:
+            return []  # No rows
+        span = upper - lower
+        if isinstance(lower, int) and isinstance(upper, int):
+            cuts = [lower + span * index // count for index in range(1, count)]
+        else:
+            cuts = [lower + span * index / count for index in range(1, count)]
+        cuts = sorted(set(cuts))
+
+        partitions = [(f"({column} < :_upper_0 OR {column} IS NULL)", {'_upper_0': cuts[0]})]
+        for index, (low, high) in enumerate(zip(cuts, cuts[1:]), start=1):
+            partitions.append((f"{column} >= :_lower_{index} AND {column} < :_upper_{index}",
+                               {f'_lower_{index}': low, f'_upper_{index}': high}))
+        partitions.append((f"{column} >= :_lower_last", {'_lower_last': cuts[-1]}))
+        return partitions
+
+    def _read_batches(self, statement, params, batch_size, arrow=False):
+        """
+        Executes a statement on its own pooled connection and yields the rows in batches.
+
+        The statement runs on a server-side cursor (``yield_per``) where the driver
+        supports one, so only FETCH_SIZE rows (BATCH_SIZE by default) are held by the
+        driver at a time instead of the whole result set.
+
+        :param arrow: Yield Arrow record batches, built column by column without a
+            dictionary per row. Batches whose columns mix incompatible types are yielded
+            as rows.
+        :type arrow: bool
+        :return: An iterator over batches of rows.
+        :rtype: iterator of list of dict or pyarrow.RecordBatch
+        """
+        fetch_size = self.config.get('fetch_size', batch_size)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=fetch_size).execute(statement, params)
+            columns = list(result.keys())
+            for rows in result.partitions(batch_size):
+                if arrow:
+                    try:
+                        yield pa.RecordBatch.from_pydict(dict(zip(columns, map(list, zip(*rows)))))
+                        continue
+                    except (pa.ArrowException, ValueError, TypeError):
+                        pass
+                yield [dict(zip(columns, row)) for row in rows]
+
+    def _fetch_partitions(self, query, partitions, batch_size, arrow=False):
+        """
+        Reads partitions concurrently, each on its own connection, and yields their batches
+        as they arrive. At most two batches per partition wait to be consumed.
+
+        :return: An iterator over batches of rows.
+        :rtype: iterator of list of dict
+        """
+        # Bind every statement now: the watermark advances while batches are consumed
+        statements = [self._statement(query, partition) for partition in partitions]
+        batches = queue.Queue(maxsize=2 * len(partitions))
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            # Gives up once the consumer is gone, so no reader blocks on a full queue
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read(statement, params):
+            try:
+                for batch in self._read_batches(statement, params, batch_size, arrow):
+                    if not put(batch):
+                        return
+            finally:
+                put(done)
+
+        self.logger.info(f"Reading {len(partitions)} partitions on {self.config['partition_column']}")
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(partitions))
+        futures = [executor.submit(read, statement, params) for statement, params in statements]
+        try:
+            finished = 0
+            while finished < len(partitions):
+                batch = batches.get()
+                if batch is done:
+                    finished += 1
+                else:
+                    yield batch
+            for future in futures:
+                future.result()  # Raise the error of a failed partition
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _batches(self, query, batch_size, arrow=False):
+        """
+        Streams the query, or its partitions, in batches and advances the watermark as
+        batches are consumed.
         """
         if not self.engine:
             self.connect()
 
+        query = query or self.config['query']
+        column = self.config.get('watermark_column')
+        total = 0
         try:
-            # Wrap the query in `text()` to ensure it's treated as an SQLAlchemy-compatible object
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query))
-
-                # Use the `mappings()` method to convert rows to dictionaries
-                data = [dict(row) for row in result.mappings()]
-                self.logger.info(f"Fetched {len(data)} rows")
-            return data
+            self._resolve_projection(query)
+            partitions = self._partitions(query)
+            if partitions:
+                batches = self._fetch_partitions(query, partitions, batch_size, arrow)
+            else:
+                # Wrap the query in `text()` to ensure it's treated as an SQLAlchemy-compatible object
+                batches = self._read_batches(*self._statement(query), batch_size, arrow)
+            for batch in batches:
+                total += batch_length(batch)
+                if column and is_arrow(batch):
+                    if column in batch.schema.names:
+                        self.advance_watermark([{column: pc.max(batch.column(column)).as_py()}], column)
+                elif column:
+                    self.advance_watermark(batch, column)
+                yield batch
+            self.logger.info(f"Fetched {total} rows")
         except Exception as e:
             self.logger.error(f"Query failed: {e}")
             raise
+
+    def fetch_data(self, query=None):
+        """
+        Executes a SQL query and fetches data from the database.
+
+        :param query: SQL query string to execute. Defaults to the QUERY of the source.
+        :type query: str
+        :return: A list of rows fetched from the database, where each row is a dictionary.
+        :rtype: list of dict
+        :raises sqlalchemy.exc.SQLAlchemyError: If the query fails to execute.
+        """
+        return [row for batch in self._batches(query, DEFAULT_BATCH_SIZE) for row in batch]
+
+    def fetch_batches(self, batch_size=DEFAULT_BATCH_SIZE, query=None):
+        """
+        Executes a SQL query and yields the rows in batches instead of one list.
+
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :param query: SQL query string to execute. Defaults to the QUERY of the source.
+        :type query: str
+        :return: An iterator over batches of rows, where each row is a dictionary.
+        :rtype: iterator of list of dict
+        :raises sqlalchemy.exc.SQLAlchemyError: If the query fails to execute.
+        """
+        return self._batches(query, batch_size)
+
+    def fetch_record_batches(self, batch_size=DEFAULT_BATCH_SIZE, query=None):
+        """
+        Executes a SQL query and yields the rows as Arrow record batches, without
+        building a dictionary per row.
+
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :param query: SQL query string to execute. Defaults to the QUERY of the source.
+        :type query: str
+        :return: An iterator over record batches.
+        :rtype: iterator of pyarrow.RecordBatch
+        :raises sqlalchemy.exc.SQLAlchemyError: If the query fails to execute.
+        """
+        return self._batches(query, batch_size, arrow=True)
@@ -0,0 +1,205 @@
+import concurrent.futures
+import glob
+import os
+import threading
+from collections import Counter
+
+from collector.connectors import client_cache
+from collector.connectors.base_connector import to_records
+from collector.connectors.client_cache import ClientCache
+from collector.core.cache import source_fingerprint
+from collector.core.collector import Collector
+from collector.utils.logger import get_logger
+
+DEFAULT_BATCH_WORKERS = 4
+
+
+def expand_config_paths(patterns):
+    """
+    Expands .col file paths, directories (every .col file they contain) and glob patterns.
+
+    :param patterns: Paths, directories or glob patterns.
+    :type patterns: list of str
+    :return: The .col files, without duplicates, in the given order.
+    :rtype: list of str
+    :raises FileNotFoundError: If a pattern matches nothing.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, '*.col')))
+        elif os.path.exists(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"No configuration file matches {pattern}")
+        paths.extend(os.path.abspath(path) for path in matches)
+    return list(dict.fromkeys(paths))
+
+
+class SharedFetches:
+    """
+    Fetches each shared source once for every configuration using it. The first
+    configuration asking for a source fetches it; the others wait for the result and
+    get their own copy of the rows. Rows are released once every consumer has them.
+
+    :param consumers: Number of configurations using each shared source, by fingerprint.
+    :type consumers: dict
+    """
+
+    def __init__(self, consumers):
+        """
+        Initializes the shared fetches.
+        """
+        self.consumers = dict(consumers)
+        self.futures = {}
+        self.fetch_count = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, key, fetch):
+        """
+        Returns the rows of a shared source, fetching them if no other configuration did.
+
+        :param key: The fingerprint of the source.
+        :type key: str
+        :param fetch: Callable fetching the data of the source.
+        :type fetch: callable
+        :return: A copy of the rows of the source.
+        :rtype: list of dict
+        :raises Exception: The error of the fetch, for every consumer.
+        """
+        with self._lock:
+            future = self.futures.get(key)
+            owner = future is None
+            if owner:
+                future = self.futures[key] = concurrent.futures.Future()
+                self.fetch_count += 1
+        if owner:
+            try:
+                future.set_result(to_records(fetch()))
+            except Exception as e:
+                future.set_exception(e)
+        try:
+            # Rows are tagged with their source name by each consumer, so each gets its own dicts
+            return [dict(row) for row in future.result()]
+        finally:
+            with self._lock:
+                self.consumers[key] -= 1
+                if self.consumers[key] <= 0:
+                    self.futures.pop(key, None)
+
+
+class BatchRunner:
+    """
+    Runs many .col configurations on a shared worker pool, fetching the SOURCE
+    definitions they have in common (same type and details) only once.
+
+    Connector clients are shared too, through a :class:`ClientCache` active during the
+    batch. Sources are shared between configurations collected as a whole (COLLECT_MODE
+    parallel or sequence, without STREAM or PIPELINE); incremental sources are never
+    shared since each configuration keeps its own watermark.
+
+    :param config_paths: The .col files to run.
+    :type config_paths: list of str
+    :param settings: Settings overriding the top-level settings of every .col file.
+    :type settings: dict
+    :param max_workers: Maximum number of configurations running at once.
+    :type max_workers: int
+    """
+
+    def __init__(self, config_paths, settings=None, max_workers=DEFAULT_BATCH_WORKERS):
+        """
+        Initializes the batch runner.
+        """
+        self.config_paths = config_paths
+        self.settings = settings
+        self.max_workers = max_workers
+        self.shared_fetches = None
+        self.logger = get_logger()
+
+    @staticmethod
+    def _shares_sources(collector):
+        """
+        Tells whether a collector fetches its sources as a whole, so they can be shared.
+        """
+        return not collector.get_setting('stream', False) and not collector.get_setting('pipeline', False) \
+            and collector.get_setting('collect_mode', 'parallel') in ('parallel', 'sequence')
+
+    def plan(self, collectors):
+        """
+        Finds the sources used by several configurations and attaches a
+        :class:`SharedFetches` to their collectors.
+
+        :param collectors: Collectors with their configuration loaded.
+        :type collectors: list of Collector
+        :return: The shared fetches.
+        :rtype: SharedFetches
+        """
+        keys = {}
+        consumers = Counter()
+        for collector in collectors:
+            if not self._shares_sources(collector):
+                continue
+            incremental = collector._incremental_sources()
+            keys[collector] = {
+                source['name']: source_fingerprint(source)
+                for source in collector.config['sources'] if source['name'] not in incremental
+            }
+            consumers.update(keys[collector].values())
+
+        shared = {key: count for key, count in consumers.items() if count > 1}
+        self.shared_fetches = SharedFetches(shared)
+        for collector, source_keys in keys.items():
+            collector.shared_fetches = self.shared_fetches
+            collector.shared_keys = {name: key for name, key in source_keys.items() if key in shared}
+        total = sum(len(collector.config['sources']) for collector in collectors)
+        self.logger.info(
+            f"Batch of {len(collectors)} configurations with {total} sources; "
+            f"{sum(shared.values())} of them are {len(shared)} shared sources fetched once"
+        )
+        return self.shared_fetches
+
+    def run(self):
+        """
+        Runs every configuration.
+
+        :return: The error of each configuration, None for successful runs, by path.
+        :rtype: dict
+        """
+        results = {}
+        collectors = []
+        for path in self.config_paths:
+            collector = Collector(path, settings=self.settings)
+            try:
+                collector.load_config()
+                collector.plan_pushdown()  # Sources only match when they push down the same columns
+                collectors.append(collector)
+            except Exception as e:
+                results[path] = e
+        self.plan(collectors)
+
+        def run_collector(collector):
+            try:
+                collector.run()
+                return None
+            except Exception as e:
+                self.logger.error(f"Run of {collector.config_path} failed: {e}")
+                return e
+
+        clients = ClientCache()
+        client_cache.activate(clients)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for collector, error in zip(collectors, executor.map(run_collector, collectors)):
+                    results[collector.config_path] = error
+        finally:
+            client_cache.deactivate()
+            clients.close()
+
+        failed = [path for path, error in results.items() if error is not None]
+        self.logger.info(
+            f"Batch complete: {len(results) - len(failed)} of {len(results)} configurations succeeded, "
+            f"{self.shared_fetches.fetch_count} shared source fetches"
+        )
+        return results
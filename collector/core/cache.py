@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from collector.utils.logger import get_logger
+from collector.utils.parquet import ParquetBatchWriter
+from collector.utils.records import to_arrow
+
+DEFAULT_CACHE_MAX_SIZE = 1024  # In megabytes
+
+# SOURCE options that change how a source is scheduled or cached, but not its data
+NON_DATA_OPTIONS = ('adaptive_concurrency', 'cache_ttl', 'http_cache', 'priority', 'timeout')
+
+
+def source_fingerprint(source):
+    """
+    Hashes the type and details of a SOURCE block, and the columns and filters pushed
+    down to it, so identical sources get the same key.
+
+    :param source: A parsed SOURCE block with 'type', 'details' and optionally 'pushdown'.
+    :type source: dict
+    :return: A hex digest identifying the data of the source.
+    :rtype: str
+    """
+    details = {key: value for key, value in source['details'].items() if key not in NON_DATA_OPTIONS}
+    identity = {'type': source['type'], 'details': details}
+    if source.get('pushdown'):
+        identity['pushdown'] = source['pushdown']
+    payload = json.dumps(identity, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class FetchCache:
+    """
+    Caches fetched source data on disk as Parquet files, with a TTL per entry and a
+    total size cap enforced by evicting the least recently used entries. Entries can
+    carry metadata, such as the HTTP validators of a cached API response.
+
+    :param directory: Directory holding the cache files and their index.
+    :type directory: str
+    :param max_size: Maximum total size of the cached files, in megabytes.
+    :type max_size: int
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_MAX_SIZE):
+        """
+        Opens the cache directory, creating it if needed.
+        """
+        self.directory = directory
+        self.max_bytes = max_size * 1024 * 1024
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.index = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self.index.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL, meta TEXT)"
+        )
+        try:
+            self.index.execute("ALTER TABLE entries ADD COLUMN meta TEXT")  # Indexes created before entry metadata
+        except sqlite3.OperationalError:
+            pass
+        self.index.commit()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def _lookup(self, key, ttl):
+        """
+        Returns the path of a fresh entry and marks it as used, dropping it if expired.
+
+        :return: The path of the cached file, or None.
+        :rtype: str
+        """
+        now = time.time()
+        with self._lock, self.index:
+            row = self.index.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > ttl or not os.path.exists(self._path(key)):
+                self._delete(key)
+                return None
+            self.index.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return self._path(key)
+
+    def get_meta(self, key):
+        """
+        Returns the metadata stored with an entry, whatever its age.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The metadata, or None if the entry is missing or has none.
+        :rtype: dict
+        """
+        with self._lock:
+            row = self.index.execute("SELECT meta FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] is None or not os.path.exists(self._path(key)):
+            return None
+        return json.loads(row[0])
+
+    def get(self, key, ttl):
+        """
+        Returns the cached records of a key if they are younger than ``ttl`` seconds.
+
+        :param key: The cache key.
+        :type key: str
+        :param ttl: Maximum age of the entry in seconds.
+        :type ttl: int
+        :return: The cached records, or None on a miss.
+        :rtype: list of dict
+        """
+        path = self._lookup(key, ttl)
+        if path is None:
+            return None
+        return pq.read_table(path).to_pylist()
+
+    def iter_batches(self, key, ttl, batch_size):
+        """
+        Returns an iterator over the cached records of a key, in batches.
+
+        :param key: The cache key.
+        :type key: str
+        :param ttl: Maximum age of the entry in seconds.
+        :type ttl: int
+        :param batch_size: Maximum number of records per batch.
+        :type batch_size: int
+        :return: An iterator over batches of records, or None on a miss.
+        :rtype: iterator of list of dict
+        """
+        path = self._lookup(key, ttl)
+        if path is None:
+            return None
+        return (batch.to_pylist() for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size))
+
+    def put(self, key, records, meta=None):
+        """
+        Stores records under a key. Records that cannot be stored as Parquet are not cached.
+
+        :param key: The cache key.
+        :type key: str
+        :param records: The records to cache.
+        :type records: list of dict
+        :param meta: JSON-serializable metadata stored with the entry.
+        :type meta: dict
+        """
+        writer = self.writer(key, meta)
+        writer.write(records)
+        writer.commit()
+
+    def writer(self, key, meta=None):
+        """
+        Returns a :class:`CacheWriter` storing records under a key batch by batch.
+
+        :param key: The cache key.
+        :type key: str
+        :param meta: JSON-serializable metadata stored with the entry.
+        :type meta: dict
+        :rtype: CacheWriter
+        """
+        return CacheWriter(self, key, meta)
+
+    def _commit(self, key, temp_path, meta=None):
+        """
+        Publishes a fully written cache file and evicts entries over the size cap.
+        """
+        path = self._path(key)
+        os.replace(temp_path, path)
+        now = time.time()
+        with self._lock, self.index:
+            self.index.execute(
+                "INSERT OR REPLACE INTO entries (key, created, accessed, size, meta) VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, os.path.getsize(path), json.dumps(meta, default=str) if meta is not None else None)
+            )
+            self._evict()
+
+    def _delete(self, key):
+        """
+        Removes an entry and its file. Must be called with the lock held, in a transaction.
+        """
+        self.index.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """
+        Evicts least recently used entries until the cache fits its size cap.
+        Must be called with the lock held, in a transaction.
+        """
+        total = self.index.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.index.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            self._delete(key)
+            self.logger.debug(f"Evicted cache entry {key}")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        """
+        Closes the cache index.
+        """
+        self.index.close()
+
+
+class CacheWriter:
+    """
+    Writes the records of one cache entry batch by batch. The entry only becomes
+    visible once :meth:`commit` is called.
+
+    :param cache: The cache the entry belongs to.
+    :type cache: FetchCache
+    :param key: The cache key.
+    :type key: str
+    :param meta: JSON-serializable metadata stored with the entry.
+    :type meta: dict
+    """
+
+    def __init__(self, cache, key, meta=None):
+        """
+        Initializes the writer; the temporary file is created with the first batch.
+        """
+        self.cache = cache
+        self.key = key
+        self.meta = meta
+        self.temp_path = f"{cache._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._writer = ParquetBatchWriter(self.temp_path)
+        self.failed = False
+
+    def write(self, records):
+        """
+        Appends records to the entry. After a failure, further records are ignored.
+
+        :param records: The records to append, or an Arrow record batch or table.
+        :type records: list of dict or pyarrow.RecordBatch or pyarrow.Table
+        """
+        if self.failed or not records:
+            return
+        try:
+            self._writer.write(to_arrow(records))
+        except (pa.ArrowException, ValueError, TypeError) as e:
+            self.cache.logger.warning(f"Data of cache entry {self.key} cannot be cached: {e}")
+            self.abort()
+            self.failed = True
+
+    def commit(self):
+        """
+        Publishes the entry.
+        """
+        if self.failed:
+            return
+        if not self._writer.close():
+            pq.write_table(pa.table({}), self.temp_path)  # No records: cache an empty table
+        self.cache._commit(self.key, self.temp_path, self.meta)
+
+    def abort(self):
+        """
+        Discards the entry.
+        """
+        self._writer.abort()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
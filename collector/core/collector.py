@@ -1,15 +1,27 @@
-import concurrent.futures
-import datetime
-from collector.connectors.api_connector import APIConnector
-from collector.connectors.azure_blob_connector import AzureBlobConnector
-from collector.connectors.gcs_connector import GCSConnector
-from collector.connectors.mongodb_connector import MongoDBConnector
-from collector.connectors.s3_connector import S3Connector
+import asyncio
+import os
+import time
+from itertools import groupby
+from collector.connectors import client_cache
+from collector.connectors.base_connector import DEFAULT_BATCH_SIZE, is_incremental, iter_batches
+from collector.connectors.concurrency import DEFAULT_MAX_HOST_CONCURRENCY
+from collector.connectors.registry import get_connector_class
 from collector.core.config_parser import CollectorConfigParser
+from collector.core.pipeline import DEFAULT_QUEUE_SIZE, Pipeline
+from collector.core.pushdown import plan_pushdown
+from collector.core.scheduler import SourceScheduler
+from collector.core.state import DEFAULT_STATE_PATH, StateStore
+from collector.core.transform_plan import SOURCE_KEY, TransformPlan
+from collector.core.transformer import DataTransformer
+from collector.core.transform_pool import DEFAULT_CHUNK_SIZE, TransformPool
 from collector.core.validator import ColValidator
-from collector.connectors.sql_connector import SQLConnector
+from collector.errors.exceptions import SourceTimeoutError
 from collector.output.output_handler import OutputHandler
 from collector.utils.logger import get_logger
+from collector.utils.metrics import RunMetrics, estimate_bytes
+from collector.utils.records import batch_length, is_arrow, to_records
+
+DEFAULT_MAX_CONCURRENCY = 64
 
 class Collector:
     """
@@ -17,17 +29,33 @@ class Collector:
     collecting data, transforming data, and handling output.
     """
 
-    def __init__(self, config_path):
+    def __init__(self, config_path, settings=None):
         """
         Initializes the Collector with the specified configuration path.
 
         :param config_path: The path to the .col configuration file.
         :type config_path: str
+        :param settings: Optional settings overriding the top-level settings of the .col file
+            (e.g. ``{'stream': True, 'batch_size': 50000}``).
+        :type settings: dict
         """
         self.config_path = config_path
+        self.overrides = settings or {}
         self.config = None
         self.sources = []
         self.transformer = None
+        self.plan = None
+        self.transform_pool = None
+        self.source_durations = {}  # Fetch duration of each source in seconds, used to schedule the longest first
+        self.state_store = None
+        self.failed_sources = set()
+        self.pending_watermarks = {}
+        self.fetch_cache = None
+        self.cache_keys = {}  # Cache key of each source caching its data
+        self.metrics = RunMetrics()
+        self.shared_fetches = None  # Sources fetched once for several configurations, see BatchRunner
+        self.shared_keys = {}  # Fingerprint of each shared source by name
+        self.key_source_rows = {}  # Rows of the sources read for FAN_OUT keys, until they are collected
         self.output = None
         self.logger = get_logger()  # Initialize logger
 
@@ -47,6 +75,20 @@ class Collector:
             self.logger.error(f"Error loading configuration: {e}")
             raise
 
+    def get_setting(self, name, default=None):
+        """
+        Returns a collector setting, preferring overrides over the .col file.
+
+        :param name: The lower-cased setting name (e.g. 'batch_size').
+        :type name: str
+        :param default: The value returned when the setting is not defined.
+        :return: The setting value.
+        """
+        if self.overrides.get(name) is not None:
+            return self.overrides[name]
+        settings = (self.config or {}).get('settings', {})
+        return settings.get(name, default)
+
     def validate_config(self):
         """
         Validates the configuration file using ColValidator.
@@ -57,6 +99,22 @@ class Collector:
             raise ValueError("Invalid .col configuration file.")
         self.logger.info("Configuration validated successfully.")
 
+    def plan_pushdown(self):
+        """
+        Stores in each SOURCE block with pushdown enabled the columns and filters its
+        connector should push down to the source, derived from the TRANSFORM blocks.
+        """
+        plans = plan_pushdown(self.config)
+        for source in self.config['sources']:
+            source.pop('pushdown', None)
+            if source['name'] in plans:
+                source['pushdown'] = plans[source['name']]
+                columns = plans[source['name']]['columns']
+                self.logger.info(
+                    f"Pushing down {len(columns) if columns is not None else 'all'} columns and "
+                    f"{len(plans[source['name']]['filters'])} filters to source {source['name']}"
+                )
+
     def initialize_connectors(self):
         """
         Initializes data source connectors based on the configuration.
@@ -64,62 +122,373 @@ class Collector:
         self.logger.info("Initializing connectors")
 
         for source in self.config['sources']:
-            if source['type'] == 'sql':
-                # Initialize the SQLConnector with source details
-                connector = SQLConnector(source['details'])
-                self.sources.append(connector)
-                self.logger.info(f"Initialized SQL connector for database: {source['details'].get('database')}")
-            elif source['type'] == 'api':
-                # Initialize the APIConnector with source details
-                connector = APIConnector(source['details'])
-                self.sources.append(connector)
-                self.logger.info(f"Initialized API connector for endpoint: {source['details'].get('endpoint')}")
-            elif source['type'] == 'mongodb':
-                # MongoDBConnector initialization
-                connector = MongoDBConnector(source['details'])
-                self.sources.append(connector)
-                self.logger.info(f"Initialized MongoDB connector for collection: {source['details'].get('collection')}")
-            elif source['type'] == 's3':
-                # S3Connector initialization
-                connector = S3Connector(source['details'])
-                self.sources.append(connector)
-                self.logger.info(f"Initialized S3 connector for bucket: {source['details'].get('bucket')}")
-            elif source['type'] == 'gcs':
-                # GCSConnector initialization
-                connector = GCSConnector(source['details'])
-                self.sources.append(connector)
-                self.logger.info(f"Initialized GCS connector for bucket: {source['details'].get('bucket')}")
-            elif source['type'] == 'azure_blob':
-                # AzureBlobConnector initialization
-                connector = AzureBlobConnector(source['details'])
-                self.sources.append(connector)
-                self.logger.info(f"Initialized Azure Blob connector for container: {source['details'].get('container')}")
-
-            else:
-                self.logger.error(f"Unsupported source type: {source['type']}")
-                raise ValueError(f"Unsupported source type: {source['type']}")
+            with self.metrics.measure('setup', source['name']):
+                # Connector modules are imported on first use, so unused SDKs are never loaded
+                connector_class = get_connector_class(source['type'])
+                connector = connector_class(source['details'])
+            connector.source_name = source['name']
+            connector.pushdown = source.get('pushdown')
+            self.sources.append(connector)
+            self.logger.info(f"Initialized {connector_class.__name__} for source {source['name']}")
 
         if not self.sources:
             self.logger.error("No valid data sources found.")
             raise ValueError("No valid data sources found.")
 
+    def configure_concurrency(self):
+        """
+        Enables adaptive concurrency on the sources under ADAPTIVE_CONCURRENCY (a top-level
+        setting, or an option of the SOURCE block): their requests to each host are limited
+        to the concurrency it sustains, up to MAX_HOST_CONCURRENCY.
+        """
+        default = self.get_setting('adaptive_concurrency', False)
+        max_limit = self.get_setting('max_host_concurrency', DEFAULT_MAX_HOST_CONCURRENCY)
+        definitions = {source['name']: source['details'] for source in self.config['sources']}
+        for connector in self.sources:
+            if str(definitions[connector.source_name].get('adaptive_concurrency', default)).lower() == 'true':
+                connector.limiters = {}
+                connector.max_host_concurrency = max_limit
+
+    def report_concurrency(self):
+        """
+        Logs the concurrency chosen for each host by adaptive concurrency, and adds it to
+        the run metrics.
+        """
+        limiters = {}
+        for connector in self.sources:
+            limiters.update(getattr(connector, 'limiters', None) or {})
+        for host, limiter in sorted(limiters.items()):
+            stats = limiter.stats()
+            self.metrics.record_concurrency(host, stats)
+            latency = f", latency {stats['latency_ms']}ms" if stats['latency_ms'] is not None else ''
+            self.logger.info(f"Adaptive concurrency of {host}: {stats['limit']} requests (peak {stats['peak']}) "
+                             f"after {stats['requests']} requests, {stats['throttled']} throttled, "
+                             f"{stats['errors']} failed{latency}")
+
+    def _incremental_sources(self):
+        """
+        Returns the names of the sources declaring INCREMENTAL or WATERMARK_COLUMN.
+
+        :rtype: set
+        """
+        return {
+            source['name'] for source in self.config['sources']
+            if is_incremental(source['details']) or source['details'].get('watermark_column')
+        }
+
+    def _state_key(self, source_name):
+        """
+        Returns the key under which the watermark of a source is stored.
+        """
+        return f"{os.path.abspath(self.config_path)}::{source_name}"
+
+    def load_watermarks(self):
+        """
+        Loads the watermarks of incremental sources from the state store, so their
+        connectors only fetch data that is new or changed since the last successful run.
+        """
+        incremental = self._incremental_sources()
+        if not incremental:
+            return
+        state_path = self.get_setting('state_path', DEFAULT_STATE_PATH)
+        self.state_store = StateStore(state_path)
+        for connector in self.sources:
+            if connector.source_name in incremental:
+                connector.watermark = self.state_store.get(self._state_key(connector.source_name))
+                self.logger.info(f"Loaded watermark of {connector.source_name}: {connector.watermark}")
+
+    def record_watermark(self, connector):
+        """
+        Records the watermark reached by a connector that completed its fetch.
+        Recorded watermarks are only persisted by :meth:`save_watermarks`.
+        """
+        if self.state_store is not None and connector.source_name not in self.failed_sources \
+                and connector.source_name in self._incremental_sources():
+            self.pending_watermarks[connector.source_name] = connector.watermark
+
+    def save_watermarks(self):
+        """
+        Persists the recorded watermarks once the output has been written successfully.
+        """
+        if self.state_store is None:
+            return
+        watermarks = {
+            self._state_key(name): watermark
+            for name, watermark in self.pending_watermarks.items()
+            if watermark is not None
+        }
+        if watermarks:
+            self.state_store.set_many(watermarks)
+            self.logger.info(f"Saved watermarks of {len(watermarks)} incremental sources")
+        self.pending_watermarks.clear()
+
+    def ensure_collected(self, rows):
+        """
+        Fails the run when no data was collected, unless incremental sources simply
+        had nothing new since their last run.
+
+        :param rows: The number of rows collected.
+        :type rows: int
+        :raises ValueError: If no data was collected from any source.
+        """
+        if rows:
+            return
+        if self.pending_watermarks:
+            self.logger.info("No new data in incremental sources since the last run")
+            return
+        self.logger.error("No data collected from any source.")
+        raise ValueError("No data collected from any source.")
+
+    def open_cache(self):
+        """
+        Opens the fetch cache when CACHE_DIR is set. Sources are cached when they declare a
+        CACHE_TTL, or when a top-level CACHE_TTL applies to them; incremental sources are
+        never cached since each run only fetches what changed since the previous one.
+
+        API sources with HTTP_CACHE enabled (or under a top-level HTTP_CACHE) keep their
+        responses in the same cache, and revalidate them with conditional requests.
+        """
+        http_cached = [connector for connector in self.sources if self._http_cached(connector)]
+        cache_dir = self.get_setting('cache_dir')
+        if not cache_dir:
+            if http_cached:
+                self.logger.warning("HTTP_CACHE is ignored without a CACHE_DIR to keep responses in")
+            return
+        from collector.core.cache import DEFAULT_CACHE_MAX_SIZE, FetchCache, source_fingerprint
+
+        incremental = self._incremental_sources()
+        default_ttl = self.get_setting('cache_ttl')
+        for source in self.config['sources']:
+            if source['details'].get('cache_ttl', default_ttl) and source['name'] not in incremental:
+                self.cache_keys[source['name']] = source_fingerprint(source)
+        if self.cache_keys or http_cached:
+            self.fetch_cache = FetchCache(cache_dir, self.get_setting('cache_max_size', DEFAULT_CACHE_MAX_SIZE))
+        if self.cache_keys:
+            self.logger.info(f"Caching the data of {len(self.cache_keys)} sources in {cache_dir}")
+        for connector in http_cached:
+            connector.http_cache = self.fetch_cache
+        if http_cached:
+            self.logger.info(f"Caching the HTTP responses of {len(http_cached)} sources in {cache_dir}")
+
+    def resolve_fan_out(self):
+        """
+        Passes their keys to the API sources fanning out over the column of another
+        source (FAN_OUT with VALUES_SOURCE). The key sources are fetched first, and their
+        rows kept until they are collected, so they are fetched only once.
+
+        :raises ValueError: If FAN_OUT sources depend on each other in a cycle.
+        """
+        connectors = {connector.source_name: connector for connector in self.sources}
+        for connector in self.sources:
+            self._resolve_keys(connector, connectors, ())
+
+    def _resolve_keys(self, connector, connectors, chain):
+        """
+        Reads the keys of a FAN_OUT source, after those of its key source if it fans out too.
+        """
+        options = getattr(connector, 'fan_out', None)
+        if not options or not options.get('values_source') or connector.fan_out_keys is not None:
+            return
+        chain += (connector.source_name,)
+        name = options['values_source']
+        if name in chain:
+            raise ValueError(f"FAN_OUT sources depend on each other: {' -> '.join(chain + (name,))}")
+        self._resolve_keys(connectors[name], connectors, chain)
+        if name not in self.key_source_rows:
+            self.key_source_rows[name] = to_records(self.fetch_data_from_source(connectors[name]))
+        column = options.get('values_column', options['param'])
+        connector.fan_out_keys = [row.get(column) for row in self.key_source_rows[name]]
+        self.logger.info(f"Read {len(connector.fan_out_keys)} keys of source {connector.source_name} "
+                         f"from column {column} of source {name}")
+
+    def _http_cached(self, connector):
+        """
+        Tells whether the responses of a connector's source are cached for conditional requests.
+        """
+        if not hasattr(connector, 'http_cache'):
+            return False
+        details = next(source['details'] for source in self.config['sources'] if source['name'] == connector.source_name)
+        return str(details.get('http_cache', self.get_setting('http_cache', False))).lower() == 'true'
+
+    def _cache_ttl(self, connector):
+        """
+        Returns the CACHE_TTL of a connector's source, or None if its data is not cached.
+        """
+        if self.fetch_cache is None or connector.source_name not in self.cache_keys:
+            return None
+        details = next(source['details'] for source in self.config['sources'] if source['name'] == connector.source_name)
+        return details.get('cache_ttl', self.get_setting('cache_ttl'))
+
+    def _cached_data(self, connector):
+        """
+        Returns the cached data of a connector, or None on a cache miss.
+        """
+        ttl = self._cache_ttl(connector)
+        if ttl is None:
+            return None
+        data = self.fetch_cache.get(self.cache_keys[connector.source_name], ttl)
+        if data is not None:
+            self.logger.info(f"Loaded {len(data)} cached rows of {connector.source_name}")
+        return data
+
+    def _cache_data(self, connector, data):
+        """
+        Stores the data fetched from a connector in the cache if its source is cached.
+
+        :return: The data as a list of records.
+        :rtype: list of dict
+        """
+        if self._cache_ttl(connector) is None:
+            return data
+        data = to_records(data)
+        self.fetch_cache.put(self.cache_keys[connector.source_name], data)
+        return data
+
     def fetch_data_from_source(self, connector):
         """
-        Fetch data from a single connector.
+        Fetch data from a single connector, or from the fetch cache when it holds
+        fresh data of the source.
+        """
+        if connector.source_name in self.key_source_rows:
+            return self.key_source_rows.pop(connector.source_name)  # Already fetched for FAN_OUT keys
+        with self.metrics.measure('fetch', connector.source_name) as counts:
+            data = self._cached_data(connector)
+            if data is None:
+                try:
+                    self.logger.info(f"Fetching data from {type(connector).__name__}")
+                    if connector.source_name in self.shared_keys:
+                        data = self.shared_fetches.fetch(self.shared_keys[connector.source_name], connector.fetch_data)
+                    else:
+                        data = connector.fetch_data()
+                    self.logger.info(f"Collected data from {type(connector).__name__}")
+                except Exception as e:
+                    self.logger.error(f"Error fetching data from {type(connector).__name__}: {e}")
+                    self.failed_sources.add(connector.source_name)
+                    return []
+                data = self._cache_data(connector, to_records(data))
+            counts['rows'] = len(data)
+            counts['bytes'] = estimate_bytes(data)
+        return data
+
+    def fetch_batches_from_source(self, connector, batch_size):
+        """
+        Streams data from a single connector in batches.
+
+        Errors are logged and end the stream of that connector, mirroring
+        :meth:`fetch_data_from_source`. With the columnar transform engine, batches are
+        read as Arrow record batches (see :meth:`_reads_arrow`).
+
+        :param connector: The connector to read from.
+        :param batch_size: Maximum number of rows per batch.
+        :type batch_size: int
+        :return: An iterator over batches of rows.
+        :rtype: iterator of list of dict or pyarrow.RecordBatch
         """
+        if connector.source_name in self.key_source_rows:
+            # Already fetched for FAN_OUT keys
+            yield from iter_batches(self.key_source_rows.pop(connector.source_name), batch_size)
+            self.record_watermark(connector)
+            return
+        ttl = self._cache_ttl(connector)
+        cache_writer = None
+        if ttl is not None:
+            key = self.cache_keys[connector.source_name]
+            cached = self.fetch_cache.iter_batches(key, ttl, batch_size)
+            if cached is not None:
+                self.logger.info(f"Streaming cached data of {connector.source_name}")
+                yield from self._measure_batches(connector, cached)
+                return
+            cache_writer = self.fetch_cache.writer(key)
+
+        if self._reads_arrow(connector):
+            batches = connector.fetch_record_batches(batch_size)
+        else:
+            batches = connector.fetch_batches(batch_size)
+        rows = 0
         try:
-            self.logger.info(f"Fetching data from {type(connector).__name__}")
-            if isinstance(connector, SQLConnector):
-                data = connector.fetch_data(connector.config['query'])
-            elif isinstance(connector, APIConnector):
-                data = connector.fetch_data()  # No query needed for API
-            else:
-                data = connector.fetch_data()
-            self.logger.info(f"Collected data from {type(connector).__name__}")
-            return data
+            self.logger.info(f"Streaming data from {type(connector).__name__}")
+            for batch in self._measure_batches(connector, batches):
+                rows += batch_length(batch)
+                if cache_writer is not None:
+                    cache_writer.write(batch)
+                yield batch
+            self.logger.info(f"Collected {rows} rows from {type(connector).__name__}")
+            self.record_watermark(connector)
+            if cache_writer is not None:
+                cache_writer.commit()
         except Exception as e:
-            self.logger.error(f"Error fetching data from {type(connector).__name__}: {e}")
-            return []
+            self.logger.error(f"Error fetching data from {type(connector).__name__} after {rows} rows: {e}")
+            self.failed_sources.add(connector.source_name)
+        finally:
+            if cache_writer is not None:
+                cache_writer.abort()
+
+    def _reads_arrow(self, connector):
+        """
+        Tells whether batches of a connector are streamed as Arrow record batches: the
+        columnar transform engine consumes them in-process and writers take its Arrow
+        output, so no dictionary is built per row.
+        """
+        return hasattr(connector, 'fetch_record_batches') and self.get_setting('transform_engine', 'row') == 'columnar' \
+            and self.get_setting('transform_workers', 1) <= 1
+
+    def _measure_batches(self, connector, batches):
+        """
+        Records the fetch time of every batch, leaving out the time the consumer
+        of the batches spends between them.
+        """
+        started = time.perf_counter()
+        for batch in batches:
+            self.metrics.record('fetch', connector.source_name, time.perf_counter() - started,
+                                batch_length(batch), estimate_bytes(batch))
+            yield batch
+            started = time.perf_counter()
+
+    def _scheduled_sources(self):
+        """
+        Pairs each connector with the PRIORITY and TIMEOUT of its SOURCE block.
+
+        :return: ``(connector, priority, timeout)`` tuples in declaration order.
+        :rtype: list of tuple
+        """
+        definitions = {source['name']: source['details'] for source in self.config['sources']}
+        return [
+            (connector, definitions[connector.source_name].get('priority'), definitions[connector.source_name].get('timeout'))
+            for connector in self.sources
+        ]
+
+    def collect_data_scheduled(self, mode):
+        """
+        Collects data from all initialized connectors with a :class:`SourceScheduler`.
+
+        :param mode: 'parallel' to fetch up to MAX_WORKERS sources at once, or 'sequence'
+            to fetch them one at a time.
+        :type mode: str
+        :return: A list containing the data collected from each source.
+        :rtype: list
+        :raises SourceTimeoutError: If a source times out and FAIL_FAST is enabled.
+        """
+        self.logger.info(f"Collecting data from sources in {mode}")
+        scheduler = SourceScheduler(
+            self.fetch_data_from_source,
+            mode=mode,
+            max_workers=self.get_setting('max_workers'),
+            fail_fast=self.get_setting('fail_fast', False)
+        )
+
+        all_data = []
+        for connector, data in scheduler.run(self._scheduled_sources(), self.source_durations):
+            data = to_records(data)
+            for row in data:
+                row[SOURCE_KEY] = connector.source_name
+            all_data.extend(data)
+            self.logger.info(f"Collected {len(data)} rows from {type(connector).__name__}")
+            self.record_watermark(connector)
+        self.source_durations.update(scheduler.durations)
+
+        self.ensure_collected(len(all_data))
+
+        return all_data
 
     def collect_data_parallel(self):
         """
@@ -127,73 +496,191 @@ class Collector:
         :return: A list containing the data collected from each source.
         :rtype: list
         """
-        self.logger.info("Collecting data from sources in parallel")
+        return self.collect_data_scheduled('parallel')
 
-        all_data = []
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_to_connector = {executor.submit(self.fetch_data_from_source, connector): connector for connector in self.sources}
+    def collect_data(self):
+        """
+        Collects data from all initialized connectors according to COLLECT_MODE
+        ('parallel' by default, 'sequence' or 'async').
 
-            for future in concurrent.futures.as_completed(future_to_connector):
-                connector = future_to_connector[future]
-                try:
-                    data = future.result()
-                    all_data.extend(data)
-                    self.logger.info(f"Collected {len(data)} rows from {type(connector).__name__}")
-                except Exception as exc:
-                    self.logger.error(f"Error collecting data from {type(connector).__name__}: {exc}")
+        :return: A list containing the data collected from each source.
+        :rtype: list
+        """
+        mode = self.get_setting('collect_mode', 'parallel')
+        if mode == 'async':
+            return self.collect_data_async()
+        return self.collect_data_scheduled(mode)
+
+    def collect_data_async(self):
+        """
+        Collects data from all initialized connectors on an asyncio event loop.
 
-        if not all_data:
-            self.logger.error("No data collected from any source.")
-            raise ValueError("No data collected from any source.")
+        At most MAX_CONCURRENCY sources are fetched at once overall, and at most the
+        limit given in SOURCE_CONCURRENCY for their source type. API sources share one
+        aiohttp session; blocking connectors run in daemon threads, abandoned when they
+        time out.
 
+        :return: A list containing the data collected from each source.
+        :rtype: list
+        """
+        self.logger.info("Collecting data from sources asynchronously")
+        all_data = asyncio.run(self._collect_async())
+
+        self.ensure_collected(len(all_data))
+
+        return all_data
+
+    async def _collect_async(self):
+        """
+        Fetches every connector concurrently within the configured limits.
+
+        :return: The rows collected from every source, tagged with their source name.
+        :rtype: list of dict
+        """
+        max_concurrency = self.get_setting('max_concurrency', DEFAULT_MAX_CONCURRENCY)
+        type_limits = self.get_setting('source_concurrency', {})
+        global_limit = asyncio.Semaphore(max_concurrency)
+        type_semaphores = {source_type: asyncio.Semaphore(limit) for source_type, limit in type_limits.items()}
+        source_types = {source['name']: source['type'] for source in self.config['sources']}
+
+        async def fetch(connector, timeout, http_session):
+            type_limit = type_semaphores.get(source_types.get(connector.source_name))
+            async with global_limit:
+                if type_limit is None:
+                    return await self._fetch_async(connector, timeout, http_session)
+                async with type_limit:
+                    return await self._fetch_async(connector, timeout, http_session)
+
+        http_session = None
+        if 'api' in source_types.values():
+            from collector.connectors.api_connector import aiohttp
+            if aiohttp is not None:
+                http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=max_concurrency))
+        all_data = []
+        try:
+            # Tasks acquire the semaphores in creation order, so create them by priority
+            ordered = SourceScheduler(self.fetch_data_from_source).order(self._scheduled_sources(), self.source_durations)
+            tasks = [asyncio.ensure_future(fetch(connector, timeout, http_session)) for connector, _, timeout in ordered]
+            for task in asyncio.as_completed(tasks):
+                connector, data = await task
+                for row in data:
+                    row[SOURCE_KEY] = connector.source_name
+                all_data.extend(data)
+                self.logger.info(f"Collected {len(data)} rows from {type(connector).__name__}")
+                self.record_watermark(connector)
+        finally:
+            if http_session is not None:
+                await http_session.close()
         return all_data
 
-    def _apply_date_format(self, date_str, date_format):
+    async def _fetch_async(self, connector, timeout, http_session):
         """
-        Converts a date string to the specified format.
+        Fetch data from a single connector on the event loop.
+
+        :return: The connector and the rows it returned, or no rows on error.
+        :rtype: tuple
+        :raises SourceTimeoutError: If the source times out and FAIL_FAST is enabled.
         """
+        if connector.source_name in self.key_source_rows:
+            return connector, self.key_source_rows.pop(connector.source_name)  # Already fetched for FAN_OUT keys
+        started = time.perf_counter()
+        data = self._cached_data(connector)
+        if data is not None:
+            self.metrics.record('fetch', connector.source_name, time.perf_counter() - started,
+                                len(data), estimate_bytes(data))
+            return connector, data
         try:
-            formatted_date = datetime.strptime(date_str, date_format).strftime(date_format)
-            return formatted_date
-        except ValueError as e:
-            self.logger.error(f"Date format error: {e}")
-            return date_str
+            self.logger.info(f"Fetching data from {type(connector).__name__}")
+            data = to_records(await asyncio.wait_for(connector.fetch_data_async(http_session), timeout))
+            data = self._cache_data(connector, data)
+            self.metrics.record('fetch', connector.source_name, time.perf_counter() - started,
+                                len(data), estimate_bytes(data))
+            return connector, data
+        except asyncio.TimeoutError:
+            message = f"Source {connector.source_name} timed out after {timeout} seconds"
+            if self.get_setting('fail_fast', False):
+                self.logger.error(f"{message}; aborting collection")
+                raise SourceTimeoutError(message)
+            self.logger.error(f"{message}; skipping it")
+            self.failed_sources.add(connector.source_name)
+            return connector, []
+        except Exception as e:
+            self.logger.error(f"Error fetching data from {type(connector).__name__}: {e}")
+            self.failed_sources.add(connector.source_name)
+            return connector, []
 
-    def transform_data(self, raw_data):
+    def compile_transformations(self):
+        """
+        Compiles the TRANSFORM blocks of the configuration into a :class:`TransformPlan`.
+        The plan is built once per run and reused for every row.
+        """
+        engine = self.get_setting('transform_engine', 'row')
+        self.plan = TransformPlan(self.config['transformations'])
+        if engine == 'columnar':
+            self.transformer = DataTransformer(self.config['transformations'])
+        self.logger.info(f"Compiled transformations for {len(self.plan.steps)} sources")
+
+        workers = self.get_setting('transform_workers', 1)
+        if workers > 1:
+            self.transform_pool = TransformPool(
+                self.config['transformations'],
+                workers,
+                engine=engine,
+                chunk_size=self.get_setting('transform_chunk_size', DEFAULT_CHUNK_SIZE),
+                preserve_order=self.get_setting('preserve_order', True)
+            )
+            self.logger.info(f"Transforming data across {workers} worker processes")
+
+    def transform_data(self, raw_data, source=None):
         """
         Transforms the raw data based on the transformation rules specified in the configuration.
+        Each row only goes through the TRANSFORM declared FROM the source it was collected from.
         
-        :param raw_data: The raw data collected from the sources.
-        :type raw_data: list of dict
-        :return: Transformed data.
-        :rtype: list of dict
+        :param raw_data: The raw data collected from the sources, or an Arrow record batch
+            of a single source.
+        :type raw_data: list of dict or pyarrow.RecordBatch
+        :param source: The SOURCE name all rows come from; when omitted, rows are
+            dispatched by their source tag.
+        :type source: str
+        :return: Transformed data, as an Arrow table for Arrow input.
+        :rtype: list of dict or pyarrow.Table
         """
-        self.logger.info("Transforming data")
-        
-        transformed_data = []
-        
-        for row in raw_data:
-            transformed_row = row.copy()
-            
-            for transform in self.config['transformations']:
-                source_field = transform['source']
-                target_field = transform['target']
-                rules = transform['rules']
-                
-                if source_field in transformed_row:
-                    for rule in rules:
-                        if rule['type'] == 'date':
-                            transformed_row[target_field] = self._apply_date_format(transformed_row[source_field], rule['format'])
-                        elif rule['type'] == 'float':
-                            transformed_row[target_field] = float(transformed_row[source_field])
-                        elif 'default' in rule:
-                            transformed_row[target_field] = transformed_row.get(source_field, rule['default'])
-            
-            transformed_data.append(transformed_row)
-        
-        self.logger.info(f"Transformed {len(transformed_data)} rows")
+        if self.plan is None:
+            self.compile_transformations()
+
+        self.logger.debug("Transforming data")
+        started = time.perf_counter()
+        if is_arrow(raw_data):
+            transformed_data = self.transformer.transform_batch(raw_data, source)
+        elif self.transform_pool is not None:
+            transformed_data = self.transform_pool.transform(raw_data, source)
+        elif self.transformer is None:
+            transformed_data = self.plan.transform(raw_data, source)
+        elif source is not None:
+            transformed_data = self.transformer.transform(raw_data, source)
+        else:
+            # Rows of a source are contiguous, so transform each run of rows as one frame
+            transformed_data = []
+            for tag, rows in groupby(raw_data, key=lambda row: row.get(SOURCE_KEY)):
+                rows = [{key: value for key, value in row.items() if key != SOURCE_KEY} for row in rows]
+                transformed_data.extend(self.transformer.transform(rows, tag))
+        self.metrics.record('transform', source, time.perf_counter() - started,
+                            batch_length(transformed_data), estimate_bytes(transformed_data))
+        self.logger.debug(f"Transformed {batch_length(transformed_data)} rows")
         return transformed_data
 
+    def report_transform_failures(self):
+        """
+        Logs the conversion failures of the run, aggregated per source and field.
+        """
+        if self.transform_pool is not None:
+            self.plan.failures.update(self.transform_pool.failures)
+            self.transform_pool.failures.clear()
+        if self.transformer is not None:
+            self.plan.failures.update(self.transformer.failures)
+            self.transformer.failures.clear()
+        self.plan.report_failures()
+
     def output_data(self, transformed_data):
         """
         Outputs the transformed data using the OutputHandler based on the configuration.
@@ -205,24 +692,158 @@ class Collector:
         output_handler = OutputHandler(output_config)
         try:
             self.logger.info(f"Outputting data using OutputHandler as {output_config['type']}")
-            output_handler.write_output(transformed_data)
+            with self.metrics.measure('write') as counts:
+                output_handler.write_output(transformed_data)
+                counts['rows'] = len(transformed_data)
+                counts['bytes'] = self._output_size()
             self.logger.info(f"Data successfully written to {output_config['details']['path']}")
         except Exception as e:
             self.logger.error(f"Failed to output data: {e}")
             raise
 
+    def write_batch(self, output_handler, batch):
+        """
+        Appends a batch of transformed rows to an opened output.
+
+        :param output_handler: An output handler opened with ``open()``.
+        :type output_handler: collector.output.output_handler.OutputHandler
+        :param batch: The transformed rows.
+        :type batch: list of dict or pyarrow.Table
+        """
+        with self.metrics.measure('write') as counts:
+            output_handler.write_batch(batch)
+            counts['rows'] = batch_length(batch)
+
+    def _output_size(self):
+        """
+        Returns the size in bytes of the output file, or 0 if it cannot be determined.
+        """
+        path = self.config['output']['details'].get('path')
+        return os.path.getsize(path) if path and os.path.isfile(path) else 0
+
+    def run_streaming(self):
+        """
+        Streams every source batch by batch through transformation into the output,
+        so peak memory is bounded by the batch size instead of the dataset size.
+
+        :return: The number of rows written.
+        :rtype: int
+        """
+        batch_size = self.get_setting('batch_size', DEFAULT_BATCH_SIZE)
+        output_config = self.config['output']
+        output_handler = OutputHandler(output_config)
+        self.logger.info(f"Streaming data in batches of {batch_size} rows as {output_config['type']}")
+
+        output_handler.open()
+        try:
+            for connector in self.sources:
+                for batch in self.fetch_batches_from_source(connector, batch_size):
+                    self.write_batch(output_handler, self.transform_data(batch, connector.source_name))
+        finally:
+            rows = output_handler.close()
+            self.metrics.record('write', size=self._output_size())
+
+        self.ensure_collected(rows)
+        self.logger.info(f"Streamed {rows} rows to {output_config['details']['path']}")
+        return rows
+
+    def run_pipelined(self):
+        """
+        Streams batches through fetching, transformation and output concurrently.
+
+        Sources are fetched in parallel while earlier batches are transformed and written;
+        bounded queues between the stages apply backpressure to fast sources.
+
+        :return: The number of rows written.
+        :rtype: int
+        """
+        batch_size = self.get_setting('batch_size', DEFAULT_BATCH_SIZE)
+        queue_size = self.get_setting('queue_size', DEFAULT_QUEUE_SIZE)
+        output_config = self.config['output']
+        output_handler = OutputHandler(output_config)
+        pipeline = Pipeline(
+            self,
+            batch_size,
+            queue_size=queue_size,
+            transform_threads=max(1, self.get_setting('transform_workers', 1)),
+            fetch_threads=self.get_setting('max_concurrency', DEFAULT_MAX_CONCURRENCY)
+        )
+        self.logger.info(f"Pipelining data in batches of {batch_size} rows with queues of {queue_size} batches")
+
+        output_handler.open()
+        try:
+            pipeline.run(output_handler)
+        finally:
+            rows = output_handler.close()
+            self.metrics.record('write', size=self._output_size())
+
+        self.ensure_collected(rows)
+        self.logger.info(f"Pipelined {rows} rows to {output_config['details']['path']}")
+        return rows
+
+    def write_metrics(self):
+        """
+        Logs the run metrics per source and stage, and writes them to the JSON report
+        (METRICS_REPORT) and Prometheus textfile (METRICS_TEXTFILE) when configured.
+        """
+        report = self.metrics.report()
+        for stage in report['stages']:
+            self.logger.info(
+                f"{stage['stage'].capitalize()} {stage['source'] or 'all sources'}: {stage['rows']} rows "
+                f"in {stage['seconds']:.3f}s ({stage['rows_per_second']:.0f} rows/s, {stage['bytes']} bytes)"
+            )
+        report_path = self.get_setting('metrics_report')
+        if report_path:
+            self.metrics.write_json(report_path)
+            self.logger.info(f"Run report written to {report_path}")
+        textfile_path = self.get_setting('metrics_textfile')
+        if textfile_path:
+            self.metrics.write_prometheus(textfile_path)
+            self.logger.info(f"Prometheus metrics written to {textfile_path}")
+
     def run(self):
         """
         Executes the full data collection, transformation, and output process.
         """
         self.logger.info("Starting collector")
-        self.load_config()
+        self.metrics = RunMetrics()
+        # SQL engines and other clients are shared by the sources of the run, and disposed at its end
+        with client_cache.run_scope():
+            status = 'failed'
+            try:
+                if self.config is None:  # Configurations can be preloaded, e.g. by the daemon
+                    self.load_config()
 
-        # Validate the configuration before proceeding
-        self.validate_config()
+                # Validate the configuration before proceeding
+                self.validate_config()
+                self.plan_pushdown()
 
-        self.initialize_connectors()
-        raw_data = self.collect_data_parallel()
-        transformed_data = self.transform_data(raw_data)
-        self.output_data(transformed_data)
+                self.initialize_connectors()
+                self.configure_concurrency()
+                self.load_watermarks()
+                self.open_cache()
+                self.resolve_fan_out()
+                self.compile_transformations()
+                if self.get_setting('pipeline', False):
+                    self.run_pipelined()
+                elif self.get_setting('stream', False):
+                    self.run_streaming()
+                else:
+                    raw_data = self.collect_data()
+                    transformed_data = self.transform_data(raw_data)
+                    self.logger.info(f"Transformed {len(transformed_data)} rows")
+                    self.output_data(transformed_data)
+                self.save_watermarks()
+                status = 'success'
+            finally:
+                if self.transform_pool is not None:
+                    self.transform_pool.shutdown()
+                if self.state_store is not None:
+                    self.state_store.close()
+                if self.fetch_cache is not None:
+                    self.fetch_cache.close()
+                self.report_concurrency()
+                self.metrics.finish(status)
+                self.write_metrics()
+        self.report_transform_failures()
         self.logger.info("Collector run complete")
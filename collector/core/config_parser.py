@@ -1,4 +1,5 @@
 import re
+import shlex
 
 class CollectorConfigParser:
     """
@@ -8,6 +9,13 @@ class CollectorConfigParser:
     :type file_path: str
     """
 
+    # Top-level directives stored under config['settings'] with a lower-cased key
+    SETTINGS = ('STREAM', 'BATCH_SIZE', 'TRANSFORM_ENGINE', 'TRANSFORM_WORKERS', 'TRANSFORM_CHUNK_SIZE',
+                'PRESERVE_ORDER', 'COLLECT_MODE', 'MAX_CONCURRENCY', 'SOURCE_CONCURRENCY', 'PIPELINE', 'QUEUE_SIZE',
+                'MAX_WORKERS', 'FAIL_FAST', 'STATE_PATH', 'CACHE_DIR', 'CACHE_MAX_SIZE', 'CACHE_TTL',
+                'METRICS_REPORT', 'METRICS_TEXTFILE', 'SCHEDULE', 'PUSHDOWN', 'HTTP_CACHE', 'ADAPTIVE_CONCURRENCY',
+                'MAX_HOST_CONCURRENCY')
+
     def __init__(self, file_path):
         """
         Initializes the CollectorConfigParser with the path to the .col file.
@@ -20,7 +28,8 @@ class CollectorConfigParser:
             'version': None,
             'sources': [],
             'transformations': [],
-            'output': None
+            'output': None,
+            'settings': {}
         }
 
     def parse(self):
@@ -47,15 +56,20 @@ class CollectorConfigParser:
         current_section = None
         current_data = None
         current_line_idx = 0
+        depth = 0  # Number of { ... } blocks open, not counting those consumed by a nested parser
         
         while current_line_idx < len(lines):
             line = lines[current_line_idx].strip()
             if not line or line.startswith('#'):
                 current_line_idx += 1
                 continue  # Skip empty lines and comments
+            start_idx = current_line_idx
 
             if line.startswith('VERSION'):
                 self.config['version'] = line.split()[1]
+            elif depth == 0 and line.split()[0] in self.SETTINGS:
+                # Only outside blocks: SOURCE options such as CACHE_TTL share their name with settings
+                current_line_idx = self._parse_setting(line, lines, current_line_idx)
             elif line.startswith('SOURCE'):
                 current_section = 'source'
                 current_data = self._parse_source(line)
@@ -72,7 +86,60 @@ class CollectorConfigParser:
             elif current_section and current_data:
                 current_line_idx = self._parse_nested(line, current_data, lines, current_line_idx)
 
+            code = line.split('#', 1)[0].strip()
+            if code.startswith('}'):
+                depth = max(0, depth - 1)
+            elif code.endswith('{') and current_line_idx == start_idx:
+                depth += 1
+            current_line_idx += 1
+
+    def _parse_setting(self, line, lines, current_line_idx):
+        """
+        Parses a top-level setting such as ``BATCH_SIZE 50000``. A setting whose value is a
+        ``{ ... }`` block of key/value lines is stored as a dictionary.
+
+        :param line: A line specifying a collector setting.
+        :type line: str
+        :param lines: All lines of the configuration file.
+        :type lines: list of str
+        :param current_line_idx: Current index in the lines.
+        :type current_line_idx: int
+        :return: Updated line index after processing.
+        :rtype: int
+        """
+        line = line.split('#', 1)[0].strip()  # Allow trailing comments
+        key, value = re.split(r'\s+', line, maxsplit=1)
+        if value != '{':
+            self.config['settings'][key.lower()] = self._parse_value(value)
+            return current_line_idx
+
+        block = {}
+        current_line_idx += 1
+        while not lines[current_line_idx].strip().startswith('}'):
+            block_line = lines[current_line_idx].split('#', 1)[0].strip()
+            if block_line:
+                block_key, block_value = re.split(r'\s+', block_line, maxsplit=1)
+                block[block_key.strip('"')] = self._parse_value(block_value)
             current_line_idx += 1
+        self.config['settings'][key.lower()] = block
+        return current_line_idx
+
+    @staticmethod
+    def _parse_value(value):
+        """
+        Converts a raw setting value to int, bool or str.
+
+        :param value: The raw value from the configuration file.
+        :type value: str
+        :return: The converted value.
+        :rtype: int or bool or str
+        """
+        value = value.strip().strip('"')
+        if value.isdigit():
+            return int(value)
+        if value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        return value
 
     def _parse_source(self, line):
         """
@@ -180,10 +247,10 @@ class CollectorConfigParser:
                     'query_params': {}
                 }
             }
-        elif source_type == 'sql':
+        else:
             return {
                 'name': parts[1],
-                'type': 'sql',
+                'type': source_type,
                 'details': {}
             }
 
@@ -218,6 +285,75 @@ class CollectorConfigParser:
 
         return api_details
 
+    def _parse_field_rule(self, line):
+        """
+        Parses a FIELD line of a TRANSFORM block, e.g.
+        ``FIELD sale_date TYPE date FORMAT "%Y-%m-%d" DEFAULT "2000-01-01" RENAME date``.
+
+        :param line: A line specifying a field rule.
+        :type line: str
+        :return: A rule dictionary with 'field' and any of 'type', 'format', 'default', 'rename', 'extract'.
+        :rtype: dict
+        """
+        tokens = shlex.split(line.rstrip('{'), comments=True)
+        rule = {'field': tokens[1]}
+        options = tokens[2:]
+        for idx in range(0, len(options) - 1, 2):
+            key = options[idx].lower()
+            value = options[idx + 1]
+            rule[key] = self._parse_value(value) if key == 'default' else value
+        return rule
+
+    def _parse_filter_rule(self, line):
+        """
+        Parses a FILTER line of a TRANSFORM block, e.g. ``FILTER amount >= 100`` or
+        ``FILTER region = "EMEA"``. Unquoted numbers are compared as numbers, quoted
+        values as text.
+
+        :param line: A line specifying a filter.
+        :type line: str
+        :return: A filter dictionary with 'field', 'op' and 'value'.
+        :rtype: dict
+        :raises ValueError: If the filter is not formatted correctly.
+        """
+        match = re.match(r'FILTER\s+(\S+?)\s*(!=|<>|>=|<=|=|>|<)\s*("[^"]*"|\S+)\s*(#.*)?$', line)
+        if not match:
+            raise ValueError(f"Invalid FILTER: {line}. Expected 'FILTER <field> <operator> <value>'.")
+        field, op, value = match.group(1), match.group(2), match.group(3)
+        if value.startswith('"'):
+            value = value[1:-1]
+        else:
+            for convert in (int, float):
+                try:
+                    value = convert(value)
+                    break
+                except ValueError:
+                    continue
+        return {'field': field, 'op': '!=' if op == '<>' else op, 'value': value}
+
+    def _parse_block(self, lines, current_line_idx):
+        """
+        Parses the ``KEY value`` lines of a nested SOURCE block up to its closing brace.
+        Keys are lower-cased, and values converted as the other SOURCE options.
+
+        :param lines: All lines of the configuration file.
+        :type lines: list of str
+        :param current_line_idx: Index of the first line inside the block.
+        :type current_line_idx: int
+        :return: The options of the block, and the index of its closing line.
+        :rtype: tuple
+        """
+        block = {}
+        while not lines[current_line_idx].strip().startswith('}'):
+            block_line = lines[current_line_idx].split('#', 1)[0].strip()
+            match = re.match(r'(\w+)\s+("[^"]*"|\S+)', block_line)
+            if match:
+                key, value = match.groups()
+                value = value.strip('"')
+                block[key.lower()] = int(value) if value.isdigit() else value
+            current_line_idx += 1
+        return block, current_line_idx
+
     def _parse_nested(self, line, current_data, lines, current_line_idx):
         """
         Parses nested configuration details within a section.
@@ -237,9 +373,20 @@ class CollectorConfigParser:
             # Delegate to the output-specific handler
             return self._parse_output_details(current_data, line, lines, current_line_idx)
 
-        # Handle HEADERS or QUERY_PARAMS as dictionaries
-        elif line.startswith('HEADERS') or line.startswith('QUERY_PARAMS'):
-            key = line.split()[0].lower()  # Either 'headers' or 'query_params'
+        elif 'rules' in current_data and line.startswith('FIELD'):
+            # FIELD rules of a TRANSFORM block
+            current_data['rules'].append(self._parse_field_rule(line))
+            if line.endswith('{'):
+                # Nested rule blocks (e.g. CONDITIONAL) are not supported yet; skip them
+                while not lines[current_line_idx].strip().startswith('}'):
+                    current_line_idx += 1
+
+        elif 'rules' in current_data and line.startswith('FILTER'):
+            current_data.setdefault('filters', []).append(self._parse_filter_rule(line))
+
+        # Handle HEADERS, QUERY_PARAMS or BODY as dictionaries, keeping the case of their keys
+        elif line.startswith(('HEADERS', 'QUERY_PARAMS', 'BODY')):
+            key = line.split()[0].lower()  # 'headers', 'query_params' or 'body'
             current_data['details'][key] = {}  # Initialize the dictionary
 
             current_line_idx += 1  # Move to the next line
@@ -253,6 +400,11 @@ class CollectorConfigParser:
                     current_data['details'][key][nested_key] = nested_value
                 current_line_idx += 1
 
+        elif 'details' in current_data and line.split('#', 1)[0].strip().endswith('{'):
+            # Any other block of a SOURCE (e.g. PAGINATION) becomes a dictionary of options
+            key = line.split()[0].lower()
+            current_data['details'][key], current_line_idx = self._parse_block(lines, current_line_idx + 1)
+
         else:
             # General handling for nested lines in other sections
             match = re.match(r'(\w+)\s+("[^"]+"|\S+)', line)
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+# Shortcuts accepted in place of the five cron fields
+ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+
+# (name, minimum, maximum) of each field; weekday 7 is Sunday, like 0
+FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+
+def _parse_field(text, name, low, high):
+    """
+    Parses one cron field (``*``, ``*/15``, ``1-5``, ``0,30``, ``8-18/2``) into the set of
+    values it matches.
+
+    :raises ValueError: If the field is invalid.
+    """
+    values = set()
+    for part in text.split(','):
+        expression, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if expression == '*':
+            start, end = low, high
+        elif '-' in expression:
+            start, end = (int(value) for value in expression.split('-', 1))
+        else:
+            start = end = int(expression)
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron {name} field: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    A cron schedule with the five standard fields (minute, hour, day of month, month,
+    day of week, Sunday being 0 or 7) or one of the ``@hourly``-style aliases.
+
+    :param expression: The cron expression, e.g. ``*/5 * * * *``.
+    :type expression: str
+    :raises ValueError: If the expression is invalid.
+    """
+
+    def __init__(self, expression):
+        """
+        Parses the cron expression.
+        """
+        self.expression = expression
+        fields = ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression: {expression}. Expected 5 fields.")
+        try:
+            self.minutes, self.hours, self.days, self.months, self.weekdays = (
+                _parse_field(text, name, low, high) for text, (name, low, high) in zip(fields, FIELDS)
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression: {expression}. {e}") from None
+        self.weekdays = {weekday % 7 for weekday in self.weekdays}
+        # As in cron, when both day fields are restricted a day matching either one matches
+        self.any_day = fields[2] == '*' or fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        return day and weekday if self.any_day else day or weekday
+
+    def next_after(self, moment):
+        """
+        Returns the first time matching the schedule strictly after ``moment``.
+
+        :param moment: The reference time.
+        :type moment: datetime.datetime
+        :return: The next matching time, at the start of a minute.
+        :rtype: datetime.datetime
+        :raises ValueError: If no time matches within five years (e.g. February 30th).
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=5 * 366)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                # Jump to the first day of the next month
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression {self.expression} never matches")
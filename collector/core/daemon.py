@@ -0,0 +1,175 @@
+import concurrent.futures
+import copy
+import glob
+import os
+import threading
+from datetime import datetime
+
+from collector.connectors import client_cache
+from collector.connectors.client_cache import ClientCache
+from collector.core.collector import Collector
+from collector.core.config_parser import CollectorConfigParser
+from collector.core.cron import CronSchedule
+from collector.core.validator import ColValidator
+from collector.utils.logger import get_logger
+
+DEFAULT_POLL_INTERVAL = 5  # In seconds
+DEFAULT_DAEMON_WORKERS = 4
+
+
+class ScheduledConfig:
+    """
+    A .col file loaded by the daemon, with its parsed configuration and schedule.
+    Files that could not be loaded have no configuration and are never run.
+    """
+
+    def __init__(self, path, mtime, config=None, schedule=None):
+        self.path = path
+        self.mtime = mtime
+        self.config = config
+        self.schedule = schedule
+        self.next_run = schedule.next_after(datetime.now()) if schedule else None
+        self.source_durations = {}  # Kept across runs to schedule the longest sources first
+
+
+class CollectorDaemon:
+    """
+    Runs every .col file of a directory on the cron schedule given by its SCHEDULE
+    setting, in a long-running process.
+
+    Connector clients (SQLAlchemy engines, Mongo clients, cloud SDK clients) are kept
+    in a :class:`ClientCache` shared by every run, so connection pools stay warm.
+    Configurations are parsed once and only reloaded when their file changes.
+
+    :param config_dir: Directory of the .col files.
+    :type config_dir: str
+    :param settings: Settings overriding the top-level settings of every .col file.
+    :type settings: dict
+    :param poll_interval: Seconds between two scans of the directory.
+    :type poll_interval: int
+    :param max_workers: Maximum number of configurations running at once.
+    :type max_workers: int
+    """
+
+    def __init__(self, config_dir, settings=None, poll_interval=DEFAULT_POLL_INTERVAL, max_workers=DEFAULT_DAEMON_WORKERS):
+        """
+        Initializes the daemon.
+        """
+        self.config_dir = config_dir
+        self.settings = settings
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.configs = {}
+        self.running = set()  # Paths of the configurations being run
+        self.clients = ClientCache()
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.logger = get_logger()
+
+    def reload(self):
+        """
+        Loads new and changed .col files of the directory and forgets deleted ones.
+        Files that fail to parse or validate are logged and skipped until they change.
+        """
+        paths = set(glob.glob(os.path.join(self.config_dir, '*.col')))
+        for path in set(self.configs) - paths:
+            self.logger.info(f"Configuration {path} was removed")
+            del self.configs[path]
+
+        for path in sorted(paths):
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue  # Deleted while scanning
+            loaded = self.configs.get(path)
+            if loaded is not None and loaded.mtime == mtime:
+                continue
+            try:
+                config = CollectorConfigParser(path).parse()
+                if not ColValidator(config).validate():
+                    raise ValueError("Invalid .col configuration file.")
+                expression = config['settings'].get('schedule')
+                if not expression:
+                    raise ValueError("No SCHEDULE setting")
+                schedule = CronSchedule(expression)
+            except Exception as e:
+                self.logger.error(f"Skipping configuration {path}: {e}")
+                # Remember the mtime so the file is not parsed again until it changes
+                self.configs[path] = ScheduledConfig(path, mtime)
+                continue
+            scheduled = ScheduledConfig(path, mtime, config, schedule)
+            if loaded is not None:
+                scheduled.source_durations = loaded.source_durations
+            self.configs[path] = scheduled
+            self.logger.info(f"Loaded configuration {path}, next run at {scheduled.next_run}")
+
+    def run_config(self, scheduled):
+        """
+        Runs one configuration with the shared clients.
+
+        :param scheduled: The configuration to run.
+        :type scheduled: ScheduledConfig
+        """
+        try:
+            collector = Collector(scheduled.path, settings=self.settings)
+            collector.config = copy.deepcopy(scheduled.config)
+            collector.source_durations = scheduled.source_durations
+            collector.run()
+        except Exception as e:
+            self.logger.error(f"Run of {scheduled.path} failed: {e}")
+        finally:
+            with self._lock:
+                self.running.discard(scheduled.path)
+
+    def due_configs(self, now):
+        """
+        Returns the configurations due at ``now`` and schedules their next run.
+        A configuration still running when it is due again skips that run.
+
+        :param now: The current time.
+        :type now: datetime.datetime
+        :rtype: list of ScheduledConfig
+        """
+        due = []
+        with self._lock:
+            for scheduled in self.configs.values():
+                if scheduled.config is None or scheduled.next_run > now:
+                    continue
+                if scheduled.path in self.running:
+                    self.logger.warning(f"Skipping run of {scheduled.path}: previous run still in progress")
+                else:
+                    self.running.add(scheduled.path)
+                    due.append(scheduled)
+                scheduled.next_run = scheduled.schedule.next_after(now)
+        return due
+
+    def run(self):
+        """
+        Runs the daemon until :meth:`stop` is called.
+        """
+        self.logger.info(f"Starting collector daemon on {self.config_dir}")
+        client_cache.activate(self.clients)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while not self.stop_event.is_set():
+                self.reload()
+                now = datetime.now()
+                for scheduled in self.due_configs(now):
+                    self.logger.info(f"Running {scheduled.path}")
+                    executor.submit(self.run_config, scheduled)
+                next_runs = [scheduled.next_run for scheduled in self.configs.values() if scheduled.config is not None]
+                wait = self.poll_interval
+                if next_runs:
+                    wait = min(wait, max(0.0, (min(next_runs) - datetime.now()).total_seconds()))
+                self.stop_event.wait(wait)
+        finally:
+            self.logger.info("Stopping collector daemon; waiting for running collections")
+            executor.shutdown(wait=True)
+            client_cache.deactivate()
+            self.clients.close()
+
+    def stop(self):
+        """
+        Asks the daemon to stop after the runs in progress.
+        """
+        self.stop_event.set()
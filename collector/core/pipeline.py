@@ -0,0 +1,162 @@
+import queue
+import threading
+
+from collector.errors.exceptions import PipelineError
+from collector.utils.logger import get_logger
+
+DEFAULT_QUEUE_SIZE = 4
+
+# Marks the end of a stage's output in a queue
+_DONE = object()
+
+
+class Pipeline:
+    """
+    Runs fetching, transformation and output concurrently, connected by bounded queues.
+
+    Producer threads push the batches of each source into the fetch queue, transformer
+    threads move them to the write queue, and the calling thread writes them. When a
+    queue is full the stage feeding it blocks, so fast sources cannot run ahead of the
+    writer by more than ``queue_size`` batches per queue.
+
+    :param collector: The collector whose connectors, transformation and output are used.
+    :type collector: collector.core.collector.Collector
+    :param batch_size: Maximum number of rows per batch.
+    :type batch_size: int
+    :param queue_size: Maximum number of batches waiting in each queue.
+    :type queue_size: int
+    :param transform_threads: Number of threads running the transform stage.
+    :type transform_threads: int
+    :param fetch_threads: Maximum number of sources fetched at once.
+    :type fetch_threads: int
+    """
+
+    def __init__(self, collector, batch_size, queue_size=DEFAULT_QUEUE_SIZE, transform_threads=1, fetch_threads=8):
+        """
+        Initializes the pipeline stages.
+        """
+        self.collector = collector
+        self.batch_size = batch_size
+        self.fetch_threads = fetch_threads
+        self.transform_threads = transform_threads
+        self.fetch_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.stop = threading.Event()
+        self.errors = []
+        self.logger = get_logger()
+
+    def _put(self, target, item):
+        """
+        Puts an item in a queue, giving up when the pipeline is stopping.
+
+        :return: False if the pipeline stopped before the item could be queued.
+        :rtype: bool
+        """
+        while not self.stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source):
+        """
+        Gets an item from a queue, returning :data:`_DONE` when the pipeline is stopping.
+        """
+        while not self.stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, stage, error):
+        """
+        Records the failure of a stage and stops every other stage.
+        """
+        self.logger.error(f"Pipeline {stage} stage failed: {error}")
+        self.errors.append(error)
+        self.stop.set()
+
+    def _produce(self, connectors):
+        """
+        Fetch stage: streams the batches of connectors taken from a shared queue
+        into the fetch queue.
+        """
+        try:
+            while not self.stop.is_set():
+                try:
+                    connector = connectors.get_nowait()
+                except queue.Empty:
+                    return
+                for batch in self.collector.fetch_batches_from_source(connector, self.batch_size):
+                    if not self._put(self.fetch_queue, (connector.source_name, batch)):
+                        return
+        except Exception as e:
+            self._fail('fetch', e)
+
+    def _transform(self):
+        """
+        Transform stage: transforms batches from the fetch queue into the write queue.
+        """
+        try:
+            while True:
+                item = self._get(self.fetch_queue)
+                if item is _DONE:
+                    break
+                source, batch = item
+                if not self._put(self.write_queue, self.collector.transform_data(batch, source)):
+                    return
+        except Exception as e:
+            self._fail('transform', e)
+        finally:
+            self._put(self.write_queue, _DONE)
+
+    def run(self, output_handler):
+        """
+        Runs every stage until all sources are exhausted.
+
+        :param output_handler: An output handler already opened with ``open()``.
+        :type output_handler: collector.output.output_handler.OutputHandler
+        :raises PipelineError: If a stage failed.
+        """
+        connectors = queue.Queue()
+        for connector in self.collector.sources:
+            connectors.put(connector)
+        producers = [
+            threading.Thread(target=self._produce, args=(connectors,), daemon=True)
+            for _ in range(min(self.fetch_threads, len(self.collector.sources)))
+        ]
+        transformers = [threading.Thread(target=self._transform, daemon=True) for _ in range(self.transform_threads)]
+        for thread in producers + transformers:
+            thread.start()
+
+        def close_fetch_queue():
+            for thread in producers:
+                thread.join()
+            for _ in transformers:
+                self._put(self.fetch_queue, _DONE)
+
+        closer = threading.Thread(target=close_fetch_queue, daemon=True)
+        closer.start()
+
+        # Write stage, on the calling thread
+        finished = 0
+        try:
+            while finished < len(transformers):
+                batch = self._get(self.write_queue)
+                if batch is _DONE:
+                    finished += 1
+                    continue
+                self.collector.write_batch(output_handler, batch)
+        except Exception as e:
+            self._fail('write', e)
+        finally:
+            self.stop.set()
+            closer.join()
+            for thread in transformers:
+                thread.join()
+
+        if self.errors:
+            raise PipelineError(f"Pipeline failed: {self.errors[0]}") from self.errors[0]
@@ -0,0 +1,78 @@
+def _enabled(value):
+    """Reads a PUSHDOWN option given as a boolean or as text."""
+    if isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+
+def required_columns(transforms, details):
+    """
+    Returns the columns a source must provide to the TRANSFORM blocks reading it: the
+    fields of their FIELD rules (the top-level field of EXTRACT paths) and FILTER rules,
+    and the WATERMARK_COLUMN of incremental sources.
+
+    :param transforms: The parsed TRANSFORM blocks declared FROM the source.
+    :type transforms: list of dict
+    :param details: The details of the SOURCE block.
+    :type details: dict
+    :return: The column names, without duplicates, in declaration order.
+    :rtype: list of str
+    """
+    columns = []
+    for transform in transforms:
+        for rule in transform.get('rules', []):
+            columns.append(rule['extract'].split('.')[0] if rule.get('extract') else rule['field'])
+        columns.extend(rule['field'] for rule in transform.get('filters', []))
+    if details.get('watermark_column'):
+        columns.append(details['watermark_column'])
+    return list(dict.fromkeys(columns))
+
+
+def fan_out_columns(config, name):
+    """
+    Returns the columns of a source that FAN_OUT sources read their keys from.
+
+    :param config: The parsed configuration.
+    :type config: dict
+    :param name: The name of the source.
+    :type name: str
+    :rtype: list of str
+    """
+    columns = []
+    for source in config['sources']:
+        fan_out = source['details'].get('fan_out')
+        if isinstance(fan_out, dict) and fan_out.get('values_source') == name:
+            columns.append(fan_out.get('values_column', fan_out.get('param')))
+    return columns
+
+
+def plan_pushdown(config):
+    """
+    Derives what each source has to fetch from the TRANSFORM blocks reading it.
+
+    Pushdown is enabled by the top-level PUSHDOWN setting, or per source with a PUSHDOWN
+    option. A source read by no TRANSFORM, or by one without FIELD rules, keeps all its
+    columns. Filters are always applied by the transformation as well, so connectors
+    that cannot push a filter down still produce the same rows.
+
+    :param config: The parsed configuration.
+    :type config: dict
+    :return: ``{'columns': [...] or None, 'filters': [...]}`` by name of the sources
+        with pushdown enabled.
+    :rtype: dict
+    """
+    default = config.get('settings', {}).get('pushdown', False)
+    plans = {}
+    for source in config['sources']:
+        if not _enabled(source['details'].get('pushdown', default)):
+            continue
+        transforms = [transform for transform in config['transformations'] if transform['source'] == source['name']]
+        if not transforms:
+            continue
+        columns = None
+        if all(transform.get('rules') for transform in transforms):
+            columns = required_columns(transforms, source['details'])
+            columns.extend(column for column in fan_out_columns(config, source['name']) if column not in columns)
+        filters = [rule for transform in transforms for rule in transform.get('filters', [])]
+        plans[source['name']] = {'columns': columns, 'filters': filters}
+    return plans
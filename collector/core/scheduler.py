@@ -0,0 +1,128 @@
+import concurrent.futures
+import threading
+import time
+
+from collector.errors.exceptions import SourceTimeoutError
+from collector.utils.logger import get_logger
+
+
+class SourceScheduler:
+    """
+    Schedules the fetching of sources according to COLLECT_MODE, PRIORITY and TIMEOUT.
+
+    Sources are started by descending PRIORITY, then by descending expected duration
+    (when known from earlier runs), then in declaration order. A source running longer
+    than its TIMEOUT is abandoned; with ``fail_fast`` the whole collection is aborted.
+
+    :param fetch: Callable fetching the data of one connector.
+    :type fetch: callable
+    :param mode: 'parallel' or 'sequence'.
+    :type mode: str
+    :param max_workers: Maximum number of sources fetched at once in parallel mode.
+    :type max_workers: int
+    :param fail_fast: Whether a source timeout aborts the collection.
+    :type fail_fast: bool
+    """
+
+    def __init__(self, fetch, mode='parallel', max_workers=None, fail_fast=False):
+        """
+        Initializes the scheduler.
+        """
+        if mode not in ('parallel', 'sequence'):
+            raise ValueError(f"Unsupported collect mode: {mode}")
+        self.fetch = fetch
+        self.mode = mode
+        self.max_workers = max_workers
+        self.fail_fast = fail_fast
+        self.durations = {}
+        self.logger = get_logger()
+
+    def order(self, sources, expected_durations=None):
+        """
+        Sorts sources in the order they should be started.
+
+        :param sources: ``(connector, priority, timeout)`` tuples in declaration order.
+        :type sources: list of tuple
+        :param expected_durations: Expected fetch duration in seconds per source name.
+        :type expected_durations: dict
+        :return: The sources in start order.
+        :rtype: list of tuple
+        """
+        expected_durations = expected_durations or {}
+
+        def key(item):
+            index, (connector, priority, _) = item
+            return -(priority or 0), -expected_durations.get(connector.source_name, 0), index
+
+        return [source for _, source in sorted(enumerate(sources), key=key)]
+
+    def _timed_fetch(self, connector, timeout):
+        """
+        Fetches a connector, giving up after ``timeout`` seconds.
+
+        Threads cannot be interrupted, so a fetch with a timeout runs in a daemon
+        thread that is abandoned, and left to finish in the background, when it
+        exceeds its timeout.
+
+        :return: The fetched data.
+        :raises SourceTimeoutError: If the fetch exceeded its timeout.
+        """
+        started = time.monotonic()
+        if not timeout:
+            data = self.fetch(connector)
+        else:
+            result = {}
+            thread = threading.Thread(target=lambda: result.update(data=self.fetch(connector)), daemon=True)
+            thread.start()
+            thread.join(timeout)
+            if thread.is_alive():
+                raise SourceTimeoutError(f"Source {connector.source_name} timed out after {timeout} seconds")
+            data = result.get('data', [])
+        self.durations[connector.source_name] = time.monotonic() - started
+        return data
+
+    def _timed_out(self, error):
+        """
+        Handles a source that exceeded its timeout.
+
+        :raises SourceTimeoutError: If fail_fast is enabled.
+        """
+        if self.fail_fast:
+            self.logger.error(f"{error}; aborting collection")
+            raise error
+        self.logger.error(f"{error}; skipping it")
+
+    def run(self, sources, expected_durations=None):
+        """
+        Fetches every source and yields its data as soon as it is available.
+
+        :param sources: ``(connector, priority, timeout)`` tuples in declaration order.
+        :type sources: list of tuple
+        :param expected_durations: Expected fetch duration in seconds per source name.
+        :type expected_durations: dict
+        :return: An iterator over ``(connector, data)`` pairs; timed out sources are left out.
+        :rtype: iterator of tuple
+        :raises SourceTimeoutError: If a source times out and fail_fast is enabled.
+        """
+        ordered = self.order(sources, expected_durations)
+        if self.mode == 'sequence':
+            for connector, _, timeout in ordered:
+                try:
+                    yield connector, self._timed_fetch(connector, timeout)
+                except SourceTimeoutError as e:
+                    self._timed_out(e)
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {
+            executor.submit(self._timed_fetch, connector, timeout): connector
+            for connector, _, timeout in ordered
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except SourceTimeoutError as e:
+                    self._timed_out(e)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
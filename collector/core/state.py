@@ -0,0 +1,91 @@
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+DEFAULT_STATE_PATH = '.collector_state.db'
+
+
+def _encode(value):
+    """Encodes a watermark value as JSON, keeping the type of dates and decimals."""
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {'__type__': 'datetime', 'value': obj.isoformat()}
+        if isinstance(obj, date):
+            return {'__type__': 'date', 'value': obj.isoformat()}
+        if isinstance(obj, Decimal):
+            return {'__type__': 'decimal', 'value': str(obj)}
+        raise TypeError(f"Object of type {obj.__class__.__name__} cannot be stored as a watermark")
+    return json.dumps(value, default=default)
+
+
+def _decode(text):
+    """Decodes a watermark value encoded with :func:`_encode`."""
+    def object_hook(obj):
+        kind = obj.get('__type__')
+        if kind == 'datetime':
+            return datetime.fromisoformat(obj['value'])
+        if kind == 'date':
+            return date.fromisoformat(obj['value'])
+        if kind == 'decimal':
+            return Decimal(obj['value'])
+        return obj
+    return json.loads(text, object_hook=object_hook)
+
+
+class StateStore:
+    """
+    Persists the high-water marks of incremental sources between runs in a SQLite file.
+
+    :param path: Path to the SQLite state file.
+    :type path: str
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        """
+        Opens the state file, creating it if needed.
+
+        :param path: Path to the SQLite state file.
+        :type path: str
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get(self, key):
+        """
+        Returns the watermark stored for a key.
+
+        :param key: The state key of the source.
+        :type key: str
+        :return: The stored watermark, or None if the source was never collected.
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM watermarks WHERE key = ?", (key,)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def set_many(self, watermarks):
+        """
+        Stores several watermarks in one transaction.
+
+        :param watermarks: Watermarks keyed by state key.
+        :type watermarks: dict
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO watermarks (key, value, updated_at) VALUES (?, ?, ?)",
+                [(key, _encode(value), now) for key, value in watermarks.items()]
+            )
+
+    def close(self):
+        """
+        Closes the state file.
+        """
+        self.connection.close()
@@ -0,0 +1,303 @@
+import operator
+from collections import Counter
+from datetime import date, datetime
+
+from collector.utils.logger import get_logger
+
+# Key under which collected rows carry the name of the SOURCE they came from
+SOURCE_KEY = '_source'
+
+
+def _to_int(value):
+    """Converts a value to int, accepting integral float strings such as '3.0'."""
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+
+def _to_date(date_format):
+    """Builds a converter parsing values to :class:`datetime.date`."""
+    def convert(value):
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if date_format:
+            return datetime.strptime(value, date_format).date()
+        return date.fromisoformat(value)
+    return convert
+
+
+def _to_datetime(date_format):
+    """Builds a converter parsing values to :class:`datetime.datetime`."""
+    def convert(value):
+        if isinstance(value, datetime):
+            return value
+        if date_format:
+            return datetime.strptime(value, date_format)
+        return datetime.fromisoformat(value)
+    return convert
+
+
+CONVERTERS = {
+    'int': lambda date_format: _to_int,
+    'float': lambda date_format: float,
+    'string': lambda date_format: str,
+    'date': _to_date,
+    'datetime': _to_datetime,
+}
+
+
+def report_conversion_failures(failures, logger):
+    """
+    Logs conversion failures aggregated per source and field, then resets them. Shared
+    by the row and columnar engines so they report failures alike.
+
+    :param failures: Failure counts by ``(source, field, type)``.
+    :type failures: collections.Counter
+    :param logger: The logger to warn with.
+    :type logger: logging.Logger
+    """
+    for (source, field, target_type), count in sorted(failures.items(), key=str):
+        origin = f" from {source}" if source else ""
+        logger.warning(f"Failed to convert {count} values of field '{field}'{origin} to {target_type}")
+    failures.clear()
+
+
+class FieldStep:
+    """
+    A single compiled FIELD rule.
+
+    :param rule: The parsed rule (field, type, format, default, rename, extract).
+    :type rule: dict
+    """
+
+    __slots__ = ('field', 'target', 'path', 'type', 'format', 'convert', 'default', 'has_default')
+
+    def __init__(self, rule):
+        """
+        Resolves the converter and default value of the rule once.
+
+        :param rule: The parsed rule.
+        :type rule: dict
+        :raises ValueError: If the rule type is unknown or its default cannot be converted.
+        """
+        self.field = rule['field']
+        self.target = rule.get('rename', self.field)
+        self.path = rule['extract'].split('.') if rule.get('extract') else None
+        self.type = rule.get('type')
+        self.format = rule.get('format')
+        if self.type is None:
+            self.convert = None
+        elif self.type in CONVERTERS:
+            self.convert = CONVERTERS[self.type](self.format)
+        else:
+            raise ValueError(f"Unsupported field type '{self.type}' for field '{self.field}'")
+        self.has_default = 'default' in rule
+        self.default = rule.get('default')
+        if self.has_default and self.default is not None and self.convert:
+            self.default = self.convert(self.default)
+
+    def read(self, row):
+        """Reads the raw value of the field, following the EXTRACT path if any."""
+        if self.path is None:
+            return row.get(self.field)
+        value = row
+        for key in self.path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+
+# Comparison operators of FILTER rules
+OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+
+class FilterStep:
+    """
+    A single compiled FILTER rule, keeping the rows whose raw field value satisfies
+    the comparison. Missing values never match, as NULLs in SQL.
+
+    :param rule: The parsed rule (field, op, value).
+    :type rule: dict
+    """
+
+    __slots__ = ('field', 'op', 'value', 'compare')
+
+    def __init__(self, rule):
+        """
+        Resolves the comparison of the rule once.
+
+        :param rule: The parsed rule.
+        :type rule: dict
+        :raises ValueError: If the operator is unknown.
+        """
+        self.field = rule['field']
+        self.op = rule['op']
+        self.value = rule['value']
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{self.op}' for field '{self.field}'")
+        self.compare = OPERATORS[self.op]
+
+    def matches_value(self, value):
+        """
+        Compares a raw value with the filter value, converting one to the type of the
+        other: text read from files compares with numbers, dates with ISO strings.
+        """
+        if value is None or value != value:  # None or NaN
+            return False
+        literal = self.value
+        try:
+            if isinstance(literal, (int, float)) and not isinstance(value, (int, float)):
+                value = float(value)
+            elif isinstance(literal, str) and not isinstance(value, str):
+                if isinstance(value, datetime):
+                    literal = datetime.fromisoformat(literal)
+                elif isinstance(value, date):
+                    literal = date.fromisoformat(literal)
+                elif isinstance(value, (int, float)):
+                    literal = float(literal)
+            return self.compare(value, literal)
+        except (ValueError, TypeError):
+            return False
+
+    def matches(self, row):
+        """Tells whether a row satisfies the filter."""
+        return self.matches_value(row.get(self.field))
+
+
+class TransformPlan:
+    """
+    TRANSFORM blocks compiled once into per-source lists of field steps and filters.
+
+    Rows tagged with :data:`SOURCE_KEY` only go through the TRANSFORM declared
+    FROM their source; untagged rows go through every TRANSFORM.
+
+    :param transformations: The parsed TRANSFORM blocks of the configuration.
+    :type transformations: list of dict
+    """
+
+    def __init__(self, transformations):
+        """
+        Compiles the transformation rules.
+
+        :param transformations: The parsed TRANSFORM blocks.
+        :type transformations: list of dict
+        """
+        self.steps = {}
+        self.filters = {}
+        for transform in transformations:
+            steps = [FieldStep(rule) for rule in transform.get('rules', [])]
+            self.steps.setdefault(transform['source'], []).extend(steps)
+            filters = [FilterStep(rule) for rule in transform.get('filters', [])]
+            self.filters.setdefault(transform['source'], []).extend(filters)
+        self.all_steps = [step for steps in self.steps.values() for step in steps]
+        self.all_filters = [step for steps in self.filters.values() for step in steps]
+        self.failures = Counter()
+        self.logger = get_logger()
+
+    def steps_for(self, source):
+        """
+        Returns the compiled steps applying to rows of a source.
+
+        :param source: The SOURCE name, or None for untagged rows.
+        :type source: str
+        :return: The field steps to apply.
+        :rtype: list of FieldStep
+        """
+        if source is None:
+            return self.all_steps
+        return self.steps.get(source, [])
+
+    def filters_for(self, source):
+        """
+        Returns the compiled filters applying to rows of a source.
+
+        :param source: The SOURCE name, or None for untagged rows.
+        :type source: str
+        :return: The filters rows must satisfy.
+        :rtype: list of FilterStep
+        """
+        if source is None:
+            return self.all_filters
+        return self.filters.get(source, [])
+
+    def transform(self, rows, source=None):
+        """
+        Transforms rows, resolving the steps per source tag when no source is given.
+        Rows not satisfying the FILTER rules of their source are dropped.
+
+        :param rows: The rows to transform.
+        :type rows: list of dict
+        :param source: The SOURCE every row comes from, if known.
+        :type source: str
+        :return: Transformed rows, without the source tag.
+        :rtype: list of dict
+        """
+        if source is not None:
+            steps = self.steps_for(source)
+            filters = self.filters_for(source)
+            if filters:
+                rows = [row for row in rows if all(step.matches(row) for step in filters)]
+            return [self.apply(row.copy(), steps, source) for row in rows]
+
+        transformed = []
+        for row in rows:
+            tag = row.get(SOURCE_KEY)
+            if not all(step.matches(row) for step in self.filters_for(tag)):
+                continue
+            row = row.copy()
+            row.pop(SOURCE_KEY, None)
+            transformed.append(self.apply(row, self.steps_for(tag), tag))
+        return transformed
+
+    def apply(self, row, steps, source=None):
+        """
+        Applies compiled steps to a single row in place.
+
+        :param row: The row to transform.
+        :type row: dict
+        :param steps: The steps to apply.
+        :type steps: list of FieldStep
+        :param source: The SOURCE of the row, used to attribute conversion failures.
+        :type source: str
+        :return: The transformed row.
+        :rtype: dict
+        """
+        for step in steps:
+            value = step.read(row)
+            if value is None or value != value:  # None or NaN, e.g. an empty cell read by pandas
+                if step.has_default:
+                    value = step.default
+                elif value is None and (step.target == step.field or step.field not in row):
+                    continue  # Nothing to convert or rename
+                else:
+                    value = None
+            elif step.convert is not None:
+                try:
+                    value = step.convert(value)
+                except (ValueError, TypeError):
+                    self.failures[(source, step.field, step.type)] += 1
+            if step.target != step.field:
+                row.pop(step.field, None)
+            row[step.target] = value
+        return row
+
+    def report_failures(self):
+        """
+        Logs the conversion failures aggregated per source and field, then resets them.
+        Values that failed to convert are kept unchanged.
+        """
+        report_conversion_failures(self.failures, self.logger)
@@ -0,0 +1,156 @@
+import concurrent.futures
+from collections import Counter
+from itertools import groupby
+
+from collector.core.transform_plan import SOURCE_KEY, TransformPlan
+from collector.core.transformer import DataTransformer
+
+DEFAULT_CHUNK_SIZE = 20000
+
+# Transformer of the current worker process, built once by _init_worker
+_worker_transformer = None
+
+
+def encode_rows(rows):
+    """
+    Encodes rows for transfer between processes.
+
+    Rows sharing the same keys are sent as one column list plus a tuple of values per
+    row, so keys are pickled once per chunk instead of once per row. Rows with
+    differing keys are sent unchanged.
+
+    :param rows: The rows to encode.
+    :type rows: list of dict
+    :return: A ``(columns, values)`` tuple, where ``columns`` is None for unchanged rows.
+    :rtype: tuple
+    """
+    if not rows:
+        return None, []
+    columns = tuple(rows[0])
+    if all(tuple(row) == columns for row in rows):
+        return columns, [tuple(row.values()) for row in rows]
+    return None, rows
+
+
+def decode_rows(encoded):
+    """
+    Decodes rows encoded with :func:`encode_rows`.
+
+    :param encoded: The ``(columns, values)`` tuple.
+    :type encoded: tuple
+    :return: The rows.
+    :rtype: list of dict
+    """
+    columns, values = encoded
+    if columns is None:
+        return values
+    return [dict(zip(columns, row)) for row in values]
+
+
+def _init_worker(transformations, engine):
+    """Compiles the transformations once per worker process."""
+    global _worker_transformer
+    if engine == 'columnar':
+        _worker_transformer = DataTransformer(transformations)
+    else:
+        _worker_transformer = TransformPlan(transformations)
+
+
+def _transform_chunk(parts):
+    """
+    Transforms a chunk in a worker process.
+
+    :param parts: ``(source, encoded rows)`` pairs making up the chunk.
+    :type parts: list of tuple
+    :return: The encoded transformed rows and the conversion failures of the chunk.
+    :rtype: tuple
+    """
+    rows = []
+    for source, encoded in parts:
+        rows.extend(_worker_transformer.transform(decode_rows(encoded), source))
+    failures = Counter(_worker_transformer.failures)
+    _worker_transformer.failures.clear()
+    return encode_rows(rows), failures
+
+
+class TransformPool:
+    """
+    Transforms row chunks across a pool of worker processes.
+
+    :param transformations: The parsed TRANSFORM blocks of the configuration.
+    :type transformations: list of dict
+    :param workers: The number of worker processes.
+    :type workers: int
+    :param engine: The transform engine used by the workers ('row' or 'columnar').
+    :type engine: str
+    :param chunk_size: Maximum number of rows sent to a worker at once.
+    :type chunk_size: int
+    :param preserve_order: Whether transformed rows keep the order of the input.
+    :type preserve_order: bool
+    """
+
+    def __init__(self, transformations, workers, engine='row', chunk_size=DEFAULT_CHUNK_SIZE, preserve_order=True):
+        """
+        Starts the worker processes.
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.preserve_order = preserve_order
+        self.failures = Counter()
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(transformations, engine)
+        )
+
+    def _chunks(self, rows, source):
+        """
+        Splits rows into chunks of ``(source, encoded rows)`` pairs.
+
+        :param rows: The rows to split.
+        :type rows: list of dict
+        :param source: The SOURCE of every row, or None to use the row tags.
+        :type source: str
+        :return: An iterator over chunks.
+        :rtype: iterator of list of tuple
+        """
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            if source is not None:
+                yield [(source, encode_rows(chunk))]
+                continue
+            parts = []
+            for tag, tagged_rows in groupby(chunk, key=lambda row: row.get(SOURCE_KEY)):
+                tagged_rows = [{key: value for key, value in row.items() if key != SOURCE_KEY} for row in tagged_rows]
+                parts.append((tag, encode_rows(tagged_rows)))
+            yield parts
+
+    def transform(self, rows, source=None):
+        """
+        Transforms rows across the worker processes.
+
+        :param rows: The rows to transform.
+        :type rows: list of dict
+        :param source: The SOURCE every row comes from; when omitted, rows are
+            dispatched by their source tag.
+        :type source: str
+        :return: Transformed rows.
+        :rtype: list of dict
+        """
+        if self.preserve_order:
+            results = self.executor.map(_transform_chunk, self._chunks(rows, source))
+        else:
+            futures = [self.executor.submit(_transform_chunk, chunk) for chunk in self._chunks(rows, source)]
+            results = (future.result() for future in concurrent.futures.as_completed(futures))
+
+        transformed = []
+        for encoded, failures in results:
+            transformed.extend(decode_rows(encoded))
+            self.failures.update(failures)
+        return transformed
+
+    def shutdown(self):
+        """
+        Stops the worker processes.
+        """
+        self.executor.shutdown()
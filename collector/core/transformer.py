@@ -1,7 +1,21 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from collector.core.transform_plan import TransformPlan, report_conversion_failures
+from collector.utils.logger import get_logger
+from collector.utils.records import is_arrow
+
+
 class DataTransformer:
     """
     DataTransformer applies transformations to collected data according to rules defined in the configuration.
 
+    Rules are applied column by column on a pandas DataFrame, so type conversions of a
+    field are a single vectorized operation instead of one Python call per value.
+
     :param transformations: A list of transformation rules from the configuration.
     :type transformations: list
     """
@@ -14,64 +28,153 @@ class DataTransformer:
         :type transformations: list
         """
         self.transformations = transformations
+        self.plan = TransformPlan(transformations)
+        self.failures = Counter()
+        self.logger = get_logger()
 
-    def transform(self, data):
+    def transform(self, data, source=None):
         """
         Applies transformation rules to the collected data.
 
         :param data: The raw data collected from sources.
         :type data: list of dict
+        :param source: The SOURCE the data comes from; when omitted every rule is applied.
+        :type source: str
         :return: Transformed data.
         :rtype: list of dict
         """
-        transformed_data = []
-        for item in data:
-            transformed_item = self._apply_transformations(item)
-            transformed_data.append(transformed_item)
-        return transformed_data
+        if not data:
+            return []
+        df = self.transform_frame(pd.DataFrame(data), source)
+        return df.astype(object).where(df.notna(), None).to_dict(orient='records')
 
-    def _apply_transformations(self, item):
+    def transform_batch(self, batch, source=None):
         """
-        Applies transformation rules to a single data item.
+        Applies transformation rules to an Arrow record batch and returns an Arrow table,
+        so batches go from connectors to writers without a dictionary per row.
+
+        Columns left with values of incompatible types (e.g. text that failed to convert
+        next to converted numbers) cannot be stored in Arrow; such batches are returned as
+        records instead.
 
-        :param item: A dictionary representing a single data row.
-        :type item: dict
-        :return: Transformed data row.
-        :rtype: dict
+        :param batch: The raw data, as an Arrow record batch or table, or as records.
+        :type batch: pyarrow.RecordBatch or pyarrow.Table or list of dict
+        :param source: The SOURCE the data comes from; when omitted every rule is applied.
+        :type source: str
+        :return: Transformed data.
+        :rtype: pyarrow.Table or list of dict
         """
-        for transform in self.transformations:
-            # Apply transformation rules based on the configuration
-            # Example: type conversion, field renaming, default values
-            # Placeholder logic:
-            for rule in transform['rules']:
-                field = rule.get('field')
-                if field in item:
-                    item[field] = self._convert_type(item[field], rule.get('type'))
-                if 'rename' in rule:
-                    item[rule['rename']] = item.pop(field)
-                if 'default' in rule and item.get(field) is None:
-                    item[field] = rule['default']
-        return item
-
-    def _convert_type(self, value, target_type):
+        df = batch.to_pandas() if is_arrow(batch) else pd.DataFrame(batch)
+        df = self.transform_frame(df, source)
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, ValueError, TypeError):
+            return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+    def transform_frame(self, df, source=None):
+        """
+        Applies transformation rules to whole columns of a DataFrame.
+
+        Values that cannot be converted keep their original value and are counted in
+        :attr:`failures`; see :meth:`report_failures`.
+
+        :param df: The raw data as a DataFrame.
+        :type df: pandas.DataFrame
+        :param source: The SOURCE the data comes from; when omitted every rule is applied.
+        :type source: str
+        :return: The transformed DataFrame.
+        :rtype: pandas.DataFrame
         """
-        Converts the value to the specified target type.
+        filters = self.plan.filters_for(source)
+        if filters:
+            keep = np.ones(len(df), dtype=bool)
+            for step in filters:
+                if step.field not in df.columns:
+                    keep[:] = False
+                    break
+                keep &= df[step.field].map(step.matches_value).to_numpy(dtype=bool)
+            df = df[keep].reset_index(drop=True)
+
+        for step in self.plan.steps_for(source):
+            column = self._read_column(df, step)
+            if column is None:
+                if step.has_default:
+                    df[step.target] = step.default
+                continue
 
-        :param value: The value to convert.
-        :type value: Any
-        :param target_type: The target type (e.g., 'string', 'int', 'float', 'date').
+            missing = column.isna()
+            if step.type is not None:
+                converted = self._convert_type(column, step.type, step.format)
+                failed = converted.isna() & ~missing
+                count = int(failed.sum())
+                if count:
+                    self.failures[(source, step.field, step.type)] += count
+                    converted = converted.astype(object).where(~failed, column)
+                column = converted
+            if step.has_default and missing.any():
+                column = column.astype(object).where(~missing, step.default)
+
+            if step.target != step.field and step.field in df.columns:
+                df = df.drop(columns=step.field)
+            df[step.target] = column
+        return df
+
+    @staticmethod
+    def _read_column(df, step):
+        """
+        Returns the column a rule reads from, following its EXTRACT path if any.
+
+        :param df: The data being transformed.
+        :type df: pandas.DataFrame
+        :param step: The compiled rule.
+        :type step: collector.core.transform_plan.FieldStep
+        :return: The column, or None if the field does not exist.
+        :rtype: pandas.Series
+        """
+        if step.path is None:
+            return df[step.field] if step.field in df.columns else None
+        if step.path[0] not in df.columns:
+            return None
+        return df[step.path[0]].map(lambda value: step.read({step.path[0]: value}))
+
+    def _convert_type(self, column, target_type, date_format=None):
+        """
+        Converts a whole column to the specified target type.
+
+        :param column: The column to convert.
+        :type column: pandas.Series
+        :param target_type: The target type ('string', 'int', 'float', 'date' or 'datetime').
         :type target_type: str
-        :return: The converted value.
-        :rtype: Any
+        :param date_format: strptime format of date and datetime values.
+        :type date_format: str
+        :return: The converted column, with NA where conversion failed.
+        :rtype: pandas.Series
         """
-        try:
-            if target_type == 'int':
-                return int(value)
-            elif target_type == 'float':
-                return float(value)
-            elif target_type == 'string':
-                return str(value)
-            # Add more conversions as needed (e.g., date formatting)
-        except (ValueError, TypeError):
-            print(f"Warning: Failed to convert value {value} to {target_type}. Returning original value.")
-        return value
+        if target_type in ('int', 'float'):
+            # Fast path: a plain cast succeeds when every value is valid for the target type
+            try:
+                return column.astype('Int64' if target_type == 'int' else 'float64')
+            except (ValueError, TypeError, OverflowError):
+                numbers = pd.to_numeric(column, errors='coerce')
+            if target_type == 'float':
+                return numbers.astype('float64')
+            # Non-integral numbers cannot be converted to int
+            numbers = numbers.where(np.isclose(numbers, np.round(numbers)) | numbers.isna())
+            return numbers.round().astype('Int64')
+        elif target_type == 'string':
+            if column.dtype.kind == 'f' and column.hasnans:
+                # Integers with missing values were upcast to float by pandas: write 1, not 1.0
+                values = column.dropna()
+                if np.array_equal(values, np.round(values)):
+                    return column.map(lambda value: str(int(value)), na_action='ignore')
+            return column.map(str, na_action='ignore')
+        elif target_type in ('date', 'datetime'):
+            values = pd.to_datetime(column, format=date_format, errors='coerce')
+            return values.dt.date.where(values.notna()) if target_type == 'date' else values
+        return column
+
+    def report_failures(self):
+        """
+        Logs the conversion failures aggregated per source and field, then resets them.
+        """
+        report_conversion_failures(self.failures, self.logger)
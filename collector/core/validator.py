@@ -1,10 +1,17 @@
 import re
 
+from collector.connectors.registry import is_registered
+from collector.core.cron import CronSchedule
+from collector.utils.json_stream import record_keys
+
 class ColValidator:
     """
     Validator class for validating .col configuration files.
     """
 
+    SOURCE_TYPES = ['sql', 'csv', 'api', 'parquet', 'mongodb', 's3', 'gcs', 'azure_blob']
+    PAGINATION_TYPES = ['page', 'offset', 'cursor', 'link']
+
     def __init__(self, config):
         """
         Initializes the validator with the parsed configuration.
@@ -23,6 +30,7 @@ class ColValidator:
         :rtype: bool
         """
         self.validate_version()
+        self.validate_settings()
         self.validate_sources()
         self.validate_transformations()
         self.validate_output()
@@ -33,6 +41,35 @@ class ColValidator:
             return False
         return True
 
+    def validate_settings(self):
+        """
+        Validates the top-level settings of the configuration.
+        """
+        settings = self.config.get('settings', {})
+        mode = settings.get('collect_mode', 'parallel')
+        if mode not in ('parallel', 'sequence', 'async'):
+            self.errors.append(f"Invalid COLLECT_MODE: {mode}. Must be one of ['parallel', 'sequence', 'async'].")
+        max_workers = settings.get('max_workers')
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers <= 0):
+            self.errors.append("MAX_WORKERS must be a positive integer.")
+        schedule = settings.get('schedule')
+        if schedule is not None:
+            try:
+                CronSchedule(str(schedule))
+            except ValueError as e:
+                self.errors.append(f"Invalid SCHEDULE: {e}")
+        for name in ('cache_max_size', 'cache_ttl'):
+            value = settings.get(name)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                self.errors.append(f"{name.upper()} must be a positive integer.")
+        for name in ('http_cache', 'adaptive_concurrency'):
+            value = settings.get(name)
+            if value is not None and str(value).lower() not in ('true', 'false'):
+                self.errors.append(f"{name.upper()} must be true or false.")
+        max_host_concurrency = settings.get('max_host_concurrency')
+        if max_host_concurrency is not None and (not isinstance(max_host_concurrency, int) or max_host_concurrency <= 0):
+            self.errors.append("MAX_HOST_CONCURRENCY must be a positive integer.")
+
     def validate_version(self):
         """
         Validates the version section of the configuration.
@@ -52,11 +89,34 @@ class ColValidator:
             for source in self.config['sources']:
                 if 'type' not in source:
                     self.errors.append("Each SOURCE must have a 'type' field.")
-                elif source['type'] not in ['sql', 'csv', 'api', 'parquet']:
-                    self.errors.append(f"Invalid source type: {source['type']}. Must be one of ['sql', 'csv', 'api', 'parquet'].")
+                elif source['type'] not in self.SOURCE_TYPES and not is_registered(source['type']):
+                    self.errors.append(f"Invalid source type: {source['type']}. Must be one of {self.SOURCE_TYPES} "
+                                       f"or a type registered by a connector plugin.")
                 
                 if source['type'] == 'sql':
                     self.validate_sql_source(source)
+                elif source['type'] == 'api':
+                    self.validate_api_source(source)
+                self.validate_scheduling(source)
+                incremental = source.get('details', {}).get('incremental')
+                if incremental is not None and str(incremental).lower() not in ('true', 'false'):
+                    self.errors.append(f"INCREMENTAL of source {source.get('name')} must be true or false.")
+
+    def validate_scheduling(self, source):
+        """
+        Validates the TIMEOUT, CACHE_TTL, PRIORITY and ADAPTIVE_CONCURRENCY options of a source.
+        """
+        details = source.get('details', {})
+        for option in ('timeout', 'cache_ttl'):
+            value = details.get(option)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                self.errors.append(f"{option.upper()} of source {source.get('name')} must be a positive number of seconds.")
+        priority = details.get('priority')
+        if priority is not None and not isinstance(priority, int):
+            self.errors.append(f"PRIORITY of source {source.get('name')} must be an integer.")
+        adaptive = details.get('adaptive_concurrency')
+        if adaptive is not None and str(adaptive).lower() not in ('true', 'false'):
+            self.errors.append(f"ADAPTIVE_CONCURRENCY of source {source.get('name')} must be true or false.")
 
     def validate_sql_source(self, source):
         """
@@ -66,6 +126,116 @@ class ColValidator:
         for field in required_fields:
             if field not in source['details']:
                 self.errors.append(f"SQL source missing required field: {field}.")
+        fetch_size = source['details'].get('fetch_size')
+        if fetch_size is not None and (not isinstance(fetch_size, int) or fetch_size <= 0):
+            self.errors.append(f"FETCH_SIZE of source {source.get('name')} must be a positive integer.")
+        for option in ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle'):
+            value = source['details'].get(option)
+            if value is not None and not isinstance(value, int):
+                self.errors.append(f"{option.upper()} of source {source.get('name')} must be an integer.")
+        pre_ping = source['details'].get('pool_pre_ping')
+        if pre_ping is not None and str(pre_ping).lower() not in ('true', 'false'):
+            self.errors.append(f"POOL_PRE_PING of source {source.get('name')} must be true or false.")
+        num_partitions = source['details'].get('num_partitions')
+        if num_partitions is not None:
+            if not isinstance(num_partitions, int) or num_partitions <= 0:
+                self.errors.append(f"NUM_PARTITIONS of source {source.get('name')} must be a positive integer.")
+            elif 'partition_column' not in source['details']:
+                self.errors.append(f"NUM_PARTITIONS of source {source.get('name')} requires a PARTITION_COLUMN.")
+
+    def validate_api_source(self, source):
+        """
+        Validates the PAGINATION and RETRY blocks, the RATE_LIMIT and the response
+        options of an API source.
+        """
+        details = source['details']
+        try:
+            record_keys(details.get('record_path'))
+        except ValueError as e:
+            self.errors.append(f"{e} (source {source.get('name')})")
+        response_format = str(details.get('response_format', 'json')).lower()
+        if response_format not in ('json', 'ndjson'):
+            self.errors.append(f"Invalid RESPONSE_FORMAT of source {source.get('name')}: {response_format}. "
+                               f"Must be one of ['json', 'ndjson'].")
+        for option in ('stream_response', 'http_cache'):
+            value = details.get(option)
+            if value is not None and str(value).lower() not in ('true', 'false'):
+                self.errors.append(f"{option.upper()} of source {source.get('name')} must be true or false.")
+        retry = details.get('retry')
+        if retry is not None:
+            if not isinstance(retry, dict):
+                self.errors.append(f"RETRY of source {source.get('name')} must be a block.")
+            else:
+                for option in ('max_retries', 'retry_delay', 'max_delay'):
+                    value = retry.get(option)
+                    if value is not None and not isinstance(value, int):
+                        self.errors.append(f"RETRY {option.upper()} of source {source.get('name')} must be an integer.")
+        for option in ('rate_limit', 'rate_limit_burst'):
+            value = details.get(option)
+            if value is not None:
+                try:
+                    valid = float(value) > 0
+                except ValueError:
+                    valid = False
+                if not valid:
+                    self.errors.append(f"{option.upper()} of source {source.get('name')} must be a positive number.")
+        if details.get('fan_out') is not None:
+            self.validate_fan_out(source)
+
+        pagination = details.get('pagination')
+        if pagination is None:
+            return
+        if not isinstance(pagination, dict):
+            self.errors.append(f"PAGINATION of source {source.get('name')} must be a block.")
+            return
+        style = str(pagination.get('type', 'page')).lower()
+        if style not in self.PAGINATION_TYPES:
+            self.errors.append(f"Invalid PAGINATION TYPE of source {source.get('name')}: {style}. "
+                               f"Must be one of {self.PAGINATION_TYPES}.")
+        for option in ('page_size', 'max_pages', 'concurrency'):
+            value = pagination.get(option)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                self.errors.append(f"PAGINATION {option.upper()} of source {source.get('name')} must be a positive integer.")
+        if style == 'offset' and 'page_size' not in pagination:
+            self.errors.append(f"Offset PAGINATION of source {source.get('name')} requires a PAGE_SIZE.")
+
+    def validate_fan_out(self, source):
+        """
+        Validates the FAN_OUT block of an API source: its PARAM, a single origin of the
+        values, and that VALUES_SOURCE names another source without a cycle.
+        """
+        name = source.get('name')
+        fan_out = source['details']['fan_out']
+        if not isinstance(fan_out, dict):
+            self.errors.append(f"FAN_OUT of source {name} must be a block.")
+            return
+        if not fan_out.get('param'):
+            self.errors.append(f"FAN_OUT of source {name} requires a PARAM.")
+        origins = [option for option in ('values', 'values_file', 'values_source') if option in fan_out]
+        if len(origins) != 1:
+            self.errors.append(f"FAN_OUT of source {name} requires exactly one of VALUES, VALUES_FILE or VALUES_SOURCE.")
+        for option in ('batch_size', 'concurrency'):
+            value = fan_out.get(option)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                self.errors.append(f"FAN_OUT {option.upper()} of source {name} must be a positive integer.")
+        if 'values_source' not in fan_out:
+            return
+        sources = {other.get('name'): other for other in self.config['sources']}
+        chain = [name]
+        while True:
+            key_source = sources.get(chain[-1], {}).get('details', {}).get('fan_out')
+            if not isinstance(key_source, dict) or 'values_source' not in key_source:
+                break
+            if key_source['values_source'] not in sources:
+                if len(chain) == 1:
+                    self.errors.append(f"FAN_OUT VALUES_SOURCE of source {name} is not a declared source: "
+                                       f"{key_source['values_source']}.")
+                break
+            if key_source['values_source'] in chain:
+                if key_source['values_source'] == name:  # Cycles are reported by the sources they go through
+                    self.errors.append(f"FAN_OUT sources depend on each other: {' -> '.join(chain + [name])}.")
+                break
+            chain.append(key_source['values_source'])
 
     def validate_transformations(self):
         """
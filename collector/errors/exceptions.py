@@ -0,0 +1,10 @@
+class PipelineError(RuntimeError):
+    """
+    Raised when a stage of the pipelined execution mode fails.
+    """
+
+
+class SourceTimeoutError(TimeoutError):
+    """
+    Raised when a source exceeds its TIMEOUT and FAIL_FAST is enabled.
+    """
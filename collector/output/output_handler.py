@@ -1,10 +1,17 @@
 from decimal import Decimal
 from xml.dom import minidom
+from xml.sax.saxutils import escape
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
+import textwrap
 from datetime import date
 import xml.etree.ElementTree as ET
 
+from collector.utils.parquet import ParquetBatchWriter
+from collector.utils.records import is_arrow, to_arrow, to_records
+
 class OutputHandler:
     """
     Handles outputting the transformed data to different formats (CSV, JSON, Parquet).
@@ -21,20 +28,31 @@ class OutputHandler:
         details = output_config.get('details', {})
         self.output_path = details.get('path', None)
         self.options = details.get('options', {})
+        self._stream = None
+        self._rows_written = 0
+        self._columns = None
+        self._parquet_writer = None
+
+    @staticmethod
+    def _frame(data):
+        """
+        Converts records or Arrow data to a DataFrame.
+        """
+        return data.to_pandas() if is_arrow(data) else pd.DataFrame(data)
 
     def write_output(self, data):
         """
         Writes the data to the specified format (CSV, JSON, Parquet).
         
-        :param data: The data to be written.
-        :type data: list of dict
+        :param data: The data to be written, as records or as an Arrow table.
+        :type data: list of dict or pyarrow.Table
         """
         if self.output_type == 'csv':
             self._write_csv(data)
         elif self.output_type == 'json':
-            self._write_json(data)
+            self._write_json(to_records(data))
         elif self.output_type == 'xml':
-            self._write_xml(data)
+            self._write_xml(to_records(data))
         elif self.output_type == 'parquet':
             self._write_parquet(data)
         else:
@@ -45,9 +63,9 @@ class OutputHandler:
         Outputs data to a CSV file.
 
         :param data: The data to output.
-        :type data: list of dict
+        :type data: list of dict or pyarrow.Table
         """
-        df = pd.DataFrame(data)  # Convert data to DataFrame
+        df = self._frame(data)  # Convert data to DataFrame
         df.to_csv(self.output_path, index=False)
 
     def _write_xml(self, data):
@@ -105,8 +123,130 @@ class OutputHandler:
         Outputs data to a Parquet file with optional compression.
 
         :param data: The data to output.
-        :type data: list of dict
+        :type data: list of dict or pyarrow.Table
         """
-        df = pd.DataFrame(data)  # Convert data to DataFrame
         compression = self.options.get('compression', None)  # Get compression option, if specified
+        if is_arrow(data):
+            pq.write_table(to_arrow(data), self.output_path, compression=compression or 'none')
+            return
+        df = pd.DataFrame(data)  # Convert data to DataFrame
         df.to_parquet(self.output_path, compression=compression)
+
+    def open(self):
+        """
+        Prepares the output for incremental writing with :meth:`write_batch`.
+
+        :raises ValueError: If the output type is not supported.
+        """
+        if self.output_type not in ('csv', 'json', 'xml', 'parquet'):
+            raise ValueError(f"Unsupported output type: {self.output_type}")
+        self._rows_written = 0
+        self._columns = None
+        self._parquet_writer = None
+        if self.output_type == 'json':
+            self._stream = open(self.output_path, 'w')
+            self._stream.write('[')
+        elif self.output_type == 'xml':
+            self._stream = open(self.output_path, 'w')
+            self._stream.write('<?xml version="1.0" ?>\n<data>\n')
+
+    def write_batch(self, data):
+        """
+        Appends a batch of rows to an output opened with :meth:`open`. Arrow batches are
+        written as they are to CSV and Parquet outputs.
+
+        :param data: The batch of rows to append.
+        :type data: list of dict or pyarrow.RecordBatch or pyarrow.Table
+        """
+        if not data:
+            return
+        if self.output_type == 'csv':
+            self._append_csv(data)
+        elif self.output_type == 'json':
+            self._append_json(to_records(data))
+        elif self.output_type == 'xml':
+            self._append_xml(to_records(data))
+        elif self.output_type == 'parquet':
+            self._append_parquet(data)
+        self._rows_written += len(data)
+
+    def close(self):
+        """
+        Finalizes an output opened with :meth:`open`.
+
+        :return: The number of rows written since the output was opened.
+        :rtype: int
+        """
+        if self.output_type == 'json' and self._stream:
+            self._stream.write('\n]' if self._rows_written else ']')
+        elif self.output_type == 'xml' and self._stream:
+            self._stream.write('</data>\n')
+        elif self.output_type == 'csv' and not self._rows_written:
+            open(self.output_path, 'w').close()
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        if self._parquet_writer:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        return self._rows_written
+
+    def _append_csv(self, data):
+        """
+        Appends rows to the CSV file, writing the header with the first batch.
+
+        :param data: The rows to append.
+        :type data: list of dict or pyarrow.Table
+        """
+        df = self._frame(data)
+        if self._columns is None:
+            self._columns = list(df.columns)
+            df.to_csv(self.output_path, index=False)
+        else:
+            # Later batches must follow the column layout of the header
+            df.reindex(columns=self._columns).to_csv(self.output_path, mode='a', header=False, index=False)
+
+    def _append_json(self, data):
+        """
+        Appends rows to the JSON array, keeping the layout of :meth:`_write_json`.
+
+        :param data: The rows to append.
+        :type data: list of dict
+        """
+        for index, row in enumerate(data):
+            separator = '\n' if index == 0 and not self._rows_written else ',\n'
+            item = json.dumps(row, indent=4, default=self._json_serial)
+            self._stream.write(separator + textwrap.indent(item, '    '))
+
+    def _append_xml(self, data):
+        """
+        Appends rows as <item> elements, keeping the layout of :meth:`_write_xml`.
+
+        :param data: The rows to append.
+        :type data: list of dict
+        """
+        lines = []
+        for row in data:
+            lines.append('    <item>\n')
+            for key, value in row.items():
+                text = escape(str(value))
+                if text:
+                    lines.append(f'        <{key}>{text}</{key}>\n')
+                else:
+                    lines.append(f'        <{key}/>\n')
+            lines.append('    </item>\n')
+        self._stream.write(''.join(lines))
+
+    def _append_parquet(self, data):
+        """
+        Appends rows as a new row group of the Parquet file. Batches are held back while
+        some column only held nulls, see :class:`ParquetBatchWriter`.
+
+        :param data: The rows to append.
+        :type data: list of dict or pyarrow.Table
+        """
+        if self._parquet_writer is None:
+            compression = self.options.get('compression', None)
+            self._parquet_writer = ParquetBatchWriter(self.output_path, compression=compression or 'none')
+        table = data if is_arrow(data) else pa.Table.from_pandas(pd.DataFrame(data), preserve_index=False)
+        self._parquet_writer.write(table)
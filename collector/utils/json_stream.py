@@ -0,0 +1,220 @@
+import codecs
+import json
+import re
+
+# Size of the chunks read from a response body, in bytes
+CHUNK_SIZE = 64 * 1024
+
+# Whitespace before the first element of an array
+_WHITESPACE = re.compile(r'[ \t\r\n]*').match
+
+# Whitespace and the comma separating two array elements
+_SEPARATOR = re.compile(r'[ \t\r\n]*,[ \t\r\n]*').match
+
+
+def record_keys(path):
+    """
+    Splits a RECORD_PATH such as ``data.items[*]`` into its keys. The trailing ``[*]``,
+    marking the array whose elements are the records, is optional: an array found at
+    the path is always read element by element.
+
+    :param path: Keys separated by dots, or None / ``[*]`` for the root of the document.
+    :type path: str
+    :return: The keys leading to the records.
+    :rtype: list of str
+    :raises ValueError: If ``[*]`` appears elsewhere than at the end of the path.
+    """
+    if not path:
+        return []
+    if path.endswith('[*]'):
+        path = path[:-3]
+    if '[*]' in path:
+        raise ValueError(f"Invalid RECORD_PATH: {path}. '[*]' is only supported at the end of the path.")
+    return path.split('.') if path else []
+
+
+class _Reader:
+    """
+    Incremental reader over the text of a JSON document arriving in chunks. Values are
+    decoded one at a time with the C decoder of :mod:`json`, so only the part of the
+    document not consumed yet is kept in memory.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.done = False
+
+    def more(self):
+        """
+        Appends the next chunk to the buffer, dropping the consumed text.
+
+        :return: False once the document has been read entirely.
+        :rtype: bool
+        """
+        if self.done:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            text = self.text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self.text_decoder.decode(b'', final=True)
+        self.done = True
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character, or '' at the end of the document.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                return ''
+
+    def take(self, expected):
+        """
+        Consumes the next character, which must be ``expected``.
+
+        :raises ValueError: If another character follows.
+        """
+        found = self.peek()
+        if found != expected:
+            raise ValueError(f"Invalid JSON: expected '{expected}' but found '{found or 'end of document'}'")
+        self.pos += 1
+
+    def value(self):
+        """
+        Decodes the next complete value, reading more chunks until it is complete.
+
+        :raises ValueError: If the document is not valid JSON.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending with the buffer may be cut (e.g. a number): it is only
+                # complete when followed by another character or the end of the document
+                if end < len(self.buffer) or self.done:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.done:
+                    raise ValueError(f"Invalid JSON: {e}")
+            # Read at least as much as is buffered, so a large value is decoded a few times only
+            target = 2 * (len(self.buffer) - self.pos)
+            while self.more() and len(self.buffer) - self.pos < target:
+                pass
+
+    def elements(self):
+        """
+        Yields the elements of the array whose ``[`` was just consumed.
+
+        :raises ValueError: If the array is not valid JSON.
+        """
+        scan = self.decoder.scan_once  # The C scanner behind raw_decode, without its wrapper
+        separator = _WHITESPACE  # No comma before the first element
+        while True:
+            # Fast path: the separator and the next element are entirely buffered
+            buffer = self.buffer
+            match = separator(buffer, self.pos)
+            if match and match.end() < len(buffer):
+                try:
+                    value, end = scan(buffer, match.end())
+                except (StopIteration, json.JSONDecodeError):
+                    end = len(buffer)
+                if end < len(buffer):
+                    self.pos = end
+                    separator = _SEPARATOR
+                    yield value
+                    continue
+            found = self.peek()
+            if found == ']':
+                self.pos += 1
+                return
+            if not found:
+                raise ValueError("Invalid JSON: unterminated array")
+            if separator is _SEPARATOR:
+                self.take(',')
+                if self.peek() in (']', ''):
+                    raise ValueError("Invalid JSON: expected a value after ','")
+            separator = _SEPARATOR
+            yield self.value()
+
+
+def iter_json_records(chunks, path=None):
+    """
+    Yields the records of a JSON document as its chunks arrive: the elements of the
+    array found at ``path``, or the object found there as a single record.
+
+    Values met on the way to the records (e.g. metadata preceding them) are decoded
+    whole, and the rest of the document after the records is not read.
+
+    :param chunks: The document, as bytes or text chunks.
+    :type chunks: iterable
+    :param path: The RECORD_PATH, see :func:`record_keys`.
+    :type path: str
+    :return: An iterator over the records.
+    :rtype: iterator of dict
+    :raises ValueError: If the document is not valid JSON.
+    """
+    reader = _Reader(chunks)
+    for key in record_keys(path):
+        if reader.peek() != '{':
+            reader.value()  # Not an object: there is nothing at the path
+            return
+        reader.take('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            name = reader.value()
+            if not isinstance(name, str):
+                raise ValueError(f"Invalid JSON: expected a key but found {name!r}")
+            reader.take(':')
+            if name == key:
+                break
+            reader.value()  # Skip the values of other keys
+            if reader.peek() == '}':
+                return
+            reader.take(',')
+
+    found = reader.peek()
+    if found != '[':
+        record = reader.value()
+        if record is not None:
+            yield record
+        return
+    reader.take('[')
+    yield from reader.elements()
+
+
+def iter_ndjson(chunks):
+    """
+    Yields the values of a newline-delimited JSON (NDJSON) document as its chunks
+    arrive, one per non-empty line.
+
+    :param chunks: The document, as bytes or text chunks.
+    :type chunks: iterable
+    :return: An iterator over the decoded lines.
+    :raises ValueError: If a line is not valid JSON.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+    for chunk in chunks:
+        pending += text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    pending += text_decoder.decode(b'', final=True)
+    if pending.strip():
+        yield json.loads(pending)
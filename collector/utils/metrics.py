@@ -0,0 +1,276 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+STAGES = ('setup', 'fetch', 'transform', 'write')
+
+# Number of rows sampled to estimate the in-memory size of a batch
+SIZE_SAMPLE = 100
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the process so far.
+
+    :return: The peak RSS in bytes, or None if the platform does not report it.
+    :rtype: int
+    """
+    try:
+        # Unlike ru_maxrss, VmHWM is reset by exec, so it is not inherited from a parent process
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def estimate_bytes(rows):
+    """
+    Estimates the size of rows from the text length of a sample of them.
+
+    :param rows: The rows to measure, or an Arrow record batch or table, whose exact
+        buffer size is used.
+    :type rows: list of dict or pyarrow.RecordBatch or pyarrow.Table
+    :return: The estimated size in bytes.
+    :rtype: int
+    """
+    if hasattr(rows, 'num_rows'):  # Arrow data, measured without importing pyarrow here
+        return rows.nbytes
+    if not rows:
+        return 0
+    sample = rows[:SIZE_SAMPLE]
+    sample_size = sum(len(str(value)) for row in sample for value in row.values())
+    return sample_size * len(rows) // len(sample)
+
+
+class StageMetrics:
+    """
+    Totals of one stage of one source over a run.
+    """
+
+    __slots__ = ('source', 'stage', 'seconds', 'rows', 'bytes', 'peak_rss')
+
+    def __init__(self, source, stage):
+        self.source = source
+        self.stage = stage
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.peak_rss = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'stage': self.stage,
+            'seconds': round(self.seconds, 6),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'rows_per_second': round(self.rows_per_second, 2),
+            'peak_rss': self.peak_rss
+        }
+
+
+class RunMetrics:
+    """
+    Records wall time, rows, bytes and peak RSS per source and stage (setup, fetch,
+    transform, write) during a collector run. Setup covers creating the connector;
+    connectors open their connections lazily, so connecting counts under fetch.
+
+    Stages that run several times, such as the batches of a streamed source, are
+    accumulated; their time is the time spent in the stage, not the elapsed time.
+    Stages spanning every source, like writing the output, use the source None.
+    Peak RSS is the process high-water mark when the stage last ran.
+
+    With ADAPTIVE_CONCURRENCY, the concurrency limit chosen for each host is reported too.
+    """
+
+    def __init__(self):
+        """
+        Starts the run clock.
+        """
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.seconds = None
+        self.status = None
+        self.stages = {}
+        self.concurrency = {}  # Adaptive concurrency statistics by host
+        self._lock = threading.Lock()
+
+    def record(self, stage, source=None, seconds=0.0, rows=0, size=0):
+        """
+        Adds a measurement to the totals of a stage.
+
+        :param stage: One of :data:`STAGES`.
+        :type stage: str
+        :param source: The SOURCE name, or None for stages spanning every source.
+        :type source: str
+        :param seconds: Time spent in the stage.
+        :type seconds: float
+        :param rows: Number of rows processed.
+        :type rows: int
+        :param size: Number of bytes processed.
+        :type size: int
+        """
+        rss = peak_rss()
+        with self._lock:
+            metrics = self.stages.get((source, stage))
+            if metrics is None:
+                metrics = self.stages[(source, stage)] = StageMetrics(source, stage)
+            metrics.seconds += seconds
+            metrics.rows += rows
+            metrics.bytes += size
+            metrics.peak_rss = rss
+
+    @contextmanager
+    def measure(self, stage, source=None):
+        """
+        Times a block and records it under a stage. The block can set 'rows' and
+        'bytes' in the yielded dictionary.
+
+        :param stage: One of :data:`STAGES`.
+        :type stage: str
+        :param source: The SOURCE name, or None for stages spanning every source.
+        :type source: str
+        """
+        counts = {'rows': 0, 'bytes': 0}
+        started = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.record(stage, source, time.perf_counter() - started, counts['rows'], counts['bytes'])
+
+    def get(self, stage, source=None):
+        """
+        Returns the totals of a stage.
+
+        :rtype: StageMetrics
+        """
+        return self.stages.get((source, stage))
+
+    def record_concurrency(self, host, stats):
+        """
+        Records the adaptive concurrency limit of a host at the end of a run.
+
+        :param host: The host, e.g. ``https://api.example.com``.
+        :type host: str
+        :param stats: The statistics of its limiter, see
+            :meth:`~collector.connectors.concurrency.AdaptiveLimiter.stats`.
+        :type stats: dict
+        """
+        with self._lock:
+            self.concurrency[host] = dict(stats)
+
+    def finish(self, status):
+        """
+        Stops the run clock.
+
+        :param status: 'success' or 'failed'.
+        :type status: str
+        """
+        self.seconds = time.perf_counter() - self._started
+        self.status = status
+
+    def report(self):
+        """
+        Returns the run report.
+
+        :rtype: dict
+        """
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self._started
+        with self._lock:
+            stages = [metrics.to_dict() for metrics in self.stages.values()]
+            concurrency = [dict(stats, host=host) for host, stats in self.concurrency.items()]
+        return {
+            'started_at': self.started_at,
+            'seconds': round(seconds, 6),
+            'status': self.status,
+            'peak_rss': peak_rss(),
+            'stages': stages,
+            'concurrency': concurrency
+        }
+
+    def write_json(self, path):
+        """
+        Writes the run report as JSON.
+
+        :param path: Path of the report file.
+        :type path: str
+        """
+        self._write_atomic(path, json.dumps(self.report(), indent=4))
+
+    def write_prometheus(self, path):
+        """
+        Writes the run report in the Prometheus text format, for the textfile
+        collector of the node exporter.
+
+        :param path: Path of the textfile, which should end in ``.prom``.
+        :type path: str
+        """
+        report = self.report()
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric('collector_run_seconds', 'Duration of the last collector run.', [({}, report['seconds'])])
+        metric('collector_run_success', 'Whether the last collector run succeeded.',
+               [({}, int(report['status'] == 'success'))])
+        metric('collector_run_timestamp_seconds', 'Start time of the last collector run.', [({}, report['started_at'])])
+        if report['peak_rss'] is not None:
+            metric('collector_peak_rss_bytes', 'Peak resident set size of the last collector run.',
+                   [({}, report['peak_rss'])])
+        for key, help_text in (('seconds', 'Time spent in a stage.'),
+                               ('rows', 'Rows processed by a stage.'),
+                               ('bytes', 'Bytes processed by a stage.'),
+                               ('rows_per_second', 'Throughput of a stage.')):
+            metric(f'collector_stage_{key}', help_text, [
+                ({'source': stage['source'] or '', 'stage': stage['stage']}, stage[key])
+                for stage in report['stages']
+            ])
+        concurrency_metrics = (('limit', 'Concurrent requests allowed to a host by adaptive concurrency.'),
+                               ('peak', 'Highest concurrency allowed to a host.'),
+                               ('requests', 'Requests sent to a host under adaptive concurrency.'),
+                               ('throttled', 'Requests throttled by a host.'),
+                               ('errors', 'Requests failed by a host.'))
+        for key, help_text in concurrency_metrics if report['concurrency'] else ():
+            metric(f'collector_host_concurrency_{key}', help_text, [
+                ({'host': host['host']}, host[key]) for host in report['concurrency']
+            ])
+        self._write_atomic(path, '\n'.join(lines) + '\n')
+
+    @staticmethod
+    def _write_atomic(path, content):
+        """
+        Writes a file through a temporary file, so readers never see a partial report.
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+
+
+def _escape(value):
+    """Escapes a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,97 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from collector.utils.records import to_arrow, widen_schema
+
+# Rows held back before the schema of a Parquet file is fixed, while some of its
+# columns only held nulls
+MAX_PENDING_ROWS = 100000
+
+
+class ParquetBatchWriter:
+    """
+    Writes Arrow batches to a single Parquet file.
+
+    The schema of a Parquet file is fixed when it is created, while a sparse column may
+    only hold nulls in the first batches (typed as null, or as double when read by
+    pandas). Batches are held back until every column had a value, or MAX_PENDING_ROWS
+    rows are held, then written with the types unified across them; later batches are
+    cast to that schema.
+
+    :param path: The path of the Parquet file, created with the first batch written.
+    :type path: str
+    :param compression: The compression codec of the file.
+    :type compression: str
+    """
+
+    def __init__(self, path, compression='snappy'):
+        """
+        Initializes the writer; nothing is written before the first batch.
+        """
+        self.path = path
+        self.compression = compression
+        self.schema = None
+        self._pending = []
+        self._writer = None
+
+    def write(self, table):
+        """
+        Appends a batch to the file.
+
+        :param table: The batch.
+        :type table: pyarrow.Table or pyarrow.RecordBatch
+        :raises pyarrow.ArrowException: If the batch does not fit the schema of the file.
+        """
+        table = to_arrow(table)
+        if self._writer is not None:
+            self._writer.write_table(to_arrow(table, schema=self.schema))
+            return
+        self.schema = widen_schema(self.schema, table)
+        self._pending.append(table)
+        typed = not any(pa.types.is_null(field.type) for field in self.schema)
+        if typed or sum(pending.num_rows for pending in self._pending) >= MAX_PENDING_ROWS:
+            self._create()
+
+    def _create(self):
+        """
+        Creates the file with the schema unified across the batches held back, and writes
+        them. Columns that never had a value keep the type of their nulls in the first
+        batch (e.g. double for NaN read by pandas).
+        """
+        declared = {}
+        for table in self._pending:
+            for field in table.schema:
+                if not pa.types.is_null(field.type):
+                    declared.setdefault(field.name, field.type)
+        self.schema = pa.schema([
+            pa.field(field.name, declared.get(field.name, field.type)) if pa.types.is_null(field.type) else field
+            for field in self.schema
+        ])
+        self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        for table in self._pending:
+            self._writer.write_table(to_arrow(table, schema=self.schema))
+        self._pending = []
+
+    def close(self):
+        """
+        Writes the batches held back and closes the file.
+
+        :return: False if no batch was written, in which case no file is created.
+        :rtype: bool
+        """
+        if self._pending:
+            self._create()
+        if self._writer is None:
+            return False
+        self._writer.close()
+        self._writer = None
+        return True
+
+    def abort(self):
+        """
+        Closes the file without writing the batches held back.
+        """
+        self._pending = []
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
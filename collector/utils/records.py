@@ -0,0 +1,96 @@
+import pandas as pd
+import pyarrow as pa
+
+
+def is_arrow(data):
+    """
+    Tells whether data is an Arrow record batch or table.
+
+    :rtype: bool
+    """
+    return isinstance(data, (pa.RecordBatch, pa.Table))
+
+
+def batch_length(batch):
+    """
+    Returns the number of rows of a batch, either a list of records or an Arrow
+    record batch or table.
+
+    :param batch: The batch.
+    :type batch: list of dict or pyarrow.RecordBatch or pyarrow.Table
+    :rtype: int
+    """
+    if is_arrow(batch):
+        return batch.num_rows
+    return len(batch)
+
+
+def to_records(data):
+    """
+    Normalizes connector output to a list of records.
+
+    :param data: Data returned by a connector (list of dict, dict, DataFrame, or Arrow
+        record batch or table).
+    :return: The data as a list of records.
+    :rtype: list
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.to_dict(orient='records')
+    if is_arrow(data):
+        return data.to_pylist()
+    if isinstance(data, dict):
+        return [data]
+    return data
+
+
+def to_arrow(data, schema=None):
+    """
+    Converts records, a DataFrame or Arrow data to an Arrow table.
+
+    :param data: The data to convert.
+    :type data: list of dict or pandas.DataFrame or pyarrow.RecordBatch or pyarrow.Table
+    :param schema: Schema of the table, inferred when omitted. Arrow data is aligned on
+        its columns, missing columns being null, and cast to its types; batches of one
+        output are cast to the schema unified across them (see :func:`widen_schema`).
+    :type schema: pyarrow.Schema
+    :return: The data as an Arrow table.
+    :rtype: pyarrow.Table
+    :raises pyarrow.ArrowException: If the values of a column have incompatible types.
+    """
+    if is_arrow(data):
+        table = data if isinstance(data, pa.Table) else pa.Table.from_batches([data])
+        if schema is not None and not table.schema.equals(schema):
+            arrays = [
+                table.column(field.name).cast(field.type) if field.name in table.column_names
+                else pa.nulls(table.num_rows, field.type)
+                for field in schema
+            ]
+            table = pa.Table.from_arrays(arrays, schema=schema)
+        return table
+    if isinstance(data, pd.DataFrame):
+        return pa.Table.from_pandas(data, schema=schema, preserve_index=False)
+    return pa.Table.from_pylist(to_records(data), schema=schema)
+
+
+def widen_schema(schema, table):
+    """
+    Unifies the schema of previous batches with the types of the columns of a table,
+    e.g. to write batches to a single Parquet file. Columns only holding nulls in the
+    table say nothing about their type and keep the type found in ``schema`` (the null
+    type until a value is seen); integers are widened to floats.
+
+    :param schema: The schema of the previous batches, or None for the first one.
+    :type schema: pyarrow.Schema
+    :param table: The next batch.
+    :type table: pyarrow.Table
+    :return: The unified schema, without metadata.
+    :rtype: pyarrow.Schema
+    :raises pyarrow.ArrowTypeError: If a column holds values of incompatible types.
+    """
+    observed = pa.schema([
+        pa.field(field.name, pa.null()) if column.null_count == len(column) else field.remove_metadata()
+        for field, column in zip(table.schema, table.columns)
+    ])
+    if schema is None:
+        return observed
+    return pa.unify_schemas([schema, observed], promote_options='permissive')
@@ -1,18 +1,70 @@
 import argparse
+import os
+import signal
+import sys
+from collector.core.batch import DEFAULT_BATCH_WORKERS, BatchRunner, expand_config_paths
 from collector.core.collector import Collector  # Assuming Collector is correctly implemented
+from collector.core.daemon import DEFAULT_POLL_INTERVAL, CollectorDaemon
 
 def main():
     # Initialize argument parser
     parser = argparse.ArgumentParser(description="Run the Collector with a specified .col configuration file")
     
     # Add the argument for the path to the .col file
-    parser.add_argument("config_path", help="Path to the .col configuration file")
+    parser.add_argument("config_path", nargs='+',
+                        help="Path to the .col configuration file. Several files, directories or glob patterns "
+                             "run as a batch; with --daemon, the directory of .col files")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running and collect every .col file of the directory on its SCHEDULE")
+    parser.add_argument("--poll-interval", type=int, default=DEFAULT_POLL_INTERVAL,
+                        help="Seconds between two scans of the configuration directory in daemon mode")
+    parser.add_argument("--batch-workers", type=int, default=DEFAULT_BATCH_WORKERS,
+                        help="Maximum number of configurations running at once in a batch")
+
+    # Optional overrides of the top-level settings of the .col file
+    parser.add_argument("--stream", action="store_true", default=None,
+                        help="Stream data batch by batch instead of loading every row in memory")
+    parser.add_argument("--pipeline", action="store_true", default=None,
+                        help="Fetch, transform and write batches concurrently")
+    parser.add_argument("--batch-size", type=int, help="Number of rows per batch in streaming mode")
+    parser.add_argument("--transform-workers", type=int,
+                        help="Number of worker processes used to transform data")
+    parser.add_argument("--cache-dir", help="Directory caching the data of sources declaring CACHE_TTL")
+    parser.add_argument("--metrics-report", help="Path of the JSON run report")
+    parser.add_argument("--metrics-textfile", help="Path of the Prometheus textfile with the run metrics")
     
     # Parse the command-line arguments
     args = parser.parse_args()
+    settings = {
+        'stream': args.stream,
+        'pipeline': args.pipeline,
+        'batch_size': args.batch_size,
+        'transform_workers': args.transform_workers,
+        'cache_dir': args.cache_dir,
+        'metrics_report': args.metrics_report,
+        'metrics_textfile': args.metrics_textfile
+    }
+
+    if args.daemon:
+        if len(args.config_path) != 1:
+            parser.error("--daemon takes a single directory")
+        daemon = CollectorDaemon(args.config_path[0], settings=settings, poll_interval=args.poll_interval)
+        signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+        try:
+            daemon.run()
+        except KeyboardInterrupt:
+            daemon.stop()
+        return
+
+    if len(args.config_path) > 1 or not os.path.isfile(args.config_path[0]):
+        runner = BatchRunner(expand_config_paths(args.config_path), settings=settings, max_workers=args.batch_workers)
+        results = runner.run()
+        if any(error is not None for error in results.values()):
+            sys.exit(1)
+        return
 
     # Initialize and run the collector with the provided config path
-    collector = Collector(args.config_path)
+    collector = Collector(args.config_path[0], settings=settings)
     collector.run()
 
 if __name__ == "__main__":
@@ -18,16 +18,19 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.7',
+    python_requires='>=3.9',
     install_requires=[
         "requests>=2.25.1",
         "pandas>=1.2.0",
         "pyyaml>=5.4",
-        "pyarrow>=4.0.0",
-        "sqlalchemy>=1.4.0",
+        "pyarrow>=14.0.0",
+        "sqlalchemy>=1.4.40",
         "colorlog>=5.0.0",
     ],
     extras_require={
+        "async": [
+            "aiohttp>=3.7",
+        ],
         "dev": [
             "pytest>=6.0",
             "flake8>=3.8",
@@ -1,8 +1,15 @@
+import asyncio
+import json
+import pytest
 import requests
 from unittest import mock
+from collector.connectors import client_cache
 from collector.connectors.api_connector import APIConnector
+from collector.connectors.http_client import RetryPolicy, TokenBucket
+from collector.core.config_parser import CollectorConfigParser
+from collector.core.validator import ColValidator
 
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_api_connector_get(mock_get):
     config = {
         'endpoint': 'https://api.example.com/data',
@@ -22,9 +29,10 @@ def test_api_connector_get(mock_get):
 
     # Assert the data matches the mocked API response
     assert data == [{'id': 1, 'name': 'Test'}, {'id': 2, 'name': 'Example'}]
-    mock_get.assert_called_once_with('https://api.example.com/data', headers={'Authorization': 'Bearer token'})
+    mock_get.assert_called_once_with('https://api.example.com/data', headers={'Authorization': 'Bearer token'}, params={},
+                                     timeout=(10, 60))
 
-@mock.patch('requests.post')
+@mock.patch('requests.Session.post')
 def test_api_connector_post(mock_post):
     config = {
         'endpoint': 'https://api.example.com/data',
@@ -45,4 +53,331 @@ def test_api_connector_post(mock_post):
 
     # Assert the data matches the mocked API response
     assert data == [{'id': 1, 'name': 'Test'}]
-    mock_post.assert_called_once_with('https://api.example.com/data', headers={'Authorization': 'Bearer token'}, json={'key': 'value'})
+    mock_post.assert_called_once_with('https://api.example.com/data', headers={'Authorization': 'Bearer token'}, json={'key': 'value'},
+                                      timeout=(10, 60))
+
+
+ITEMS = [{'id': i} for i in range(250)]
+
+
+def _page_response(body, links=None):
+    response = mock.Mock()
+    response.json.return_value = body
+    response.links = links or {}
+    return response
+
+
+@mock.patch('requests.Session.get')
+def test_page_pagination_with_total(mock_get):
+    def respond(url, headers, params, timeout):
+        page = params['page']
+        rows = ITEMS[(page - 1) * 100:page * 100]
+        return _page_response({'data': {'items': rows}, 'meta': {'total': len(ITEMS)}})
+    mock_get.side_effect = respond
+
+    config = {'endpoint': 'https://api.example.com/items', 'method': 'GET', 'query_params': {'q': 'x'},
+              'record_path': 'data.items',
+              'pagination': {'type': 'page', 'size_param': 'per_page', 'page_size': 100, 'total_path': 'meta.total'}}
+    connector = APIConnector(config)
+
+    assert connector.fetch_data() == ITEMS
+    assert sorted(call.kwargs['params']['page'] for call in mock_get.call_args_list) == [1, 2, 3]
+    assert all(call.kwargs['params']['q'] == 'x' for call in mock_get.call_args_list)
+    assert [len(batch) for batch in connector.fetch_batches(batch_size=120)] == [120, 120, 10]
+
+
+@mock.patch('requests.Session.get')
+def test_offset_pagination_stops_at_short_page(mock_get):
+    mock_get.side_effect = lambda url, headers, params, timeout: _page_response(
+        ITEMS[params['offset']:params['offset'] + params['limit']])
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/items', 'method': 'GET',
+                              'pagination': {'type': 'offset', 'page_size': 100}})
+
+    assert connector.fetch_data() == ITEMS
+    assert [call.kwargs['params']['offset'] for call in mock_get.call_args_list] == [0, 100, 200]
+
+
+@mock.patch('requests.Session.get')
+def test_cursor_and_link_pagination(mock_get):
+    def by_cursor(url, headers, params, timeout):
+        start = int(params.get('after', 0))
+        following = start + 100 if start + 100 < len(ITEMS) else None
+        return _page_response({'results': ITEMS[start:start + 100], 'next': following})
+    mock_get.side_effect = by_cursor
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/items', 'method': 'GET', 'record_path': 'results',
+                              'pagination': {'type': 'cursor', 'cursor_param': 'after', 'cursor_path': 'next'}})
+    assert connector.fetch_data() == ITEMS
+
+    def by_link(url, headers, params, timeout):
+        start = int(url.rsplit('=', 1)[1]) if '=' in url else 0
+        links = {'next': {'url': f'https://api.example.com/items?start={start + 100}'}} if start + 100 < len(ITEMS) else {}
+        return _page_response(ITEMS[start:start + 100], links)
+    mock_get.side_effect = by_link
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/items', 'method': 'GET',
+                              'pagination': {'type': 'link', 'max_pages': 2}})
+    assert connector.fetch_data() == ITEMS[:200]
+
+
+def test_pagination_block_is_parsed(tmpdir):
+    config_file = tmpdir.join('api.col')
+    config_file.write('''VERSION 1.0
+SOURCE vendor TYPE api {
+    ENDPOINT "https://api.example.com/items"
+    METHOD "GET"
+    RECORD_PATH "data.items"
+    PAGINATION {
+        TYPE "offset"
+        PAGE_SIZE 100   # Rows per page
+        TOTAL_PATH "meta.total"
+    }
+    TIMEOUT 60
+}
+TRANSFORM out FROM vendor {
+    FIELD id TYPE int
+}
+OUTPUT result TYPE json {
+    PATH "out.json"
+}
+''')
+    config = CollectorConfigParser(str(config_file)).parse()
+
+    details = config['sources'][0]['details']
+    assert details['pagination'] == {'type': 'offset', 'page_size': 100, 'total_path': 'meta.total'}
+    assert details['record_path'] == 'data.items'
+    assert details['timeout'] == 60
+    assert 'type' not in details and config['settings'] == {}
+    assert ColValidator(config).validate()
+
+
+@mock.patch('time.sleep')
+@mock.patch('requests.Session.get')
+def test_retries_honor_retry_after(mock_get, mock_sleep):
+    throttled = _page_response(None)
+    throttled.status_code = 429
+    throttled.headers = {'Retry-After': '7'}
+    unavailable = _page_response(None)
+    unavailable.status_code = 503
+    unavailable.headers = {}
+    ok = _page_response([{'id': 1}])
+    ok.status_code = 200
+    mock_get.side_effect = [throttled, unavailable, ok]
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/data', 'method': 'GET',
+                              'retry': {'max_retries': 3, 'retry_delay': 2}})
+    assert connector.fetch_data() == [{'id': 1}]
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_args_list[0] == mock.call(7.0)
+    assert 1 <= mock_sleep.call_args_list[1].args[0] <= 4  # 2s doubled once, half of it jittered
+
+    mock_get.side_effect = [unavailable]
+    unavailable.raise_for_status.side_effect = requests.exceptions.HTTPError('503 Server Error')
+    with pytest.raises(RuntimeError):
+        APIConnector({'endpoint': 'https://api.example.com/data', 'method': 'GET'}).fetch_data()
+    assert RetryPolicy().max_retries == 0
+
+
+@mock.patch('time.sleep')
+@mock.patch('requests.Session.get')
+def test_timed_out_requests_are_retried(mock_get, mock_sleep):
+    ok = _page_response([{'id': 1}])
+    ok.status_code = 200
+    mock_get.side_effect = [requests.exceptions.ReadTimeout('Read timed out'), ok]
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/data', 'method': 'GET', 'timeout': 30,
+                              'retry': {'max_retries': 1}})
+    assert connector.fetch_data() == [{'id': 1}]
+    assert mock_get.call_count == 2
+    assert all(call.kwargs['timeout'] == (10, 30.0) for call in mock_get.call_args_list)
+    assert mock_sleep.call_count == 1
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=10, capacity=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.09 <= waits[2] <= 0.1 and 0.19 <= waits[3] <= 0.2
+
+
+def test_sources_share_sessions_and_limits_per_host():
+    config = {'endpoint': 'https://api.example.com/a', 'method': 'GET', 'rate_limit': '5'}
+    with client_cache.run_scope():
+        first = APIConnector(config)
+        second = APIConnector(dict(config, endpoint='https://api.example.com/b'))
+        other = APIConnector(dict(config, endpoint='https://other.example.com/a'))
+        assert first._session(first.endpoint) is second._session(second.endpoint)
+        assert first._session(first.endpoint) is not other._session(other.endpoint)
+        assert first._rate_limiter(first.endpoint) is second._rate_limiter(second.endpoint)
+
+
+@mock.patch('requests.Session.get')
+def test_streamed_json_and_ndjson_responses(mock_get):
+    body = json.dumps({'meta': {'count': 250}, 'data': {'items': ITEMS}}).encode()
+    response = mock.MagicMock(status_code=200)
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = lambda chunk_size: iter([body[:1000], body[1000:]])
+    mock_get.return_value = response
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/export', 'method': 'GET',
+                              'record_path': 'data.items[*]', 'stream_response': 'true'})
+    assert [len(batch) for batch in connector.fetch_batches(batch_size=100)] == [100, 100, 50]
+    assert connector.fetch_data() == ITEMS
+    assert mock_get.call_args.kwargs['stream'] is True
+
+    lines = b''.join(json.dumps(item).encode() + b'\n' for item in ITEMS)
+    response.iter_content.side_effect = lambda chunk_size: iter([lines[:777], lines[777:]])
+    connector = APIConnector({'endpoint': 'https://api.example.com/export', 'method': 'GET',
+                              'response_format': 'ndjson'})
+    assert connector.fetch_data() == ITEMS
+
+    response.iter_content.side_effect = lambda chunk_size: iter([b'{"data": {"items": [{"id": 1},'])
+    with pytest.raises(RuntimeError):
+        APIConnector({'endpoint': 'https://api.example.com/export', 'method': 'GET',
+                      'record_path': 'data.items', 'stream_response': 'true'}).fetch_data()
+
+
+def _cached_response(status, body=None, headers=None):
+    response = mock.MagicMock(status_code=status, headers=headers or {}, links={})
+    response.__enter__.return_value = response
+    response.json.return_value = body
+    data = json.dumps(body).encode()
+    response.iter_content.side_effect = lambda chunk_size: iter([data])
+    return response
+
+
+@mock.patch('requests.Session.get')
+def test_unchanged_responses_are_read_from_the_http_cache(mock_get, tmpdir):
+    from collector.core.cache import FetchCache
+    body = {'total': 250, 'items': ITEMS}
+    for options in ({}, {'stream_response': 'true'}):
+        cache = FetchCache(str(tmpdir.mkdtemp()))
+        connector = APIConnector(dict({'endpoint': 'https://api.example.com/items', 'method': 'GET',
+                                       'record_path': 'items'}, **options))
+        connector.http_cache = cache
+        mock_get.return_value = _cached_response(200, body, {'ETag': '"v1"'})
+        assert connector.fetch_data() == ITEMS
+        assert 'If-None-Match' not in mock_get.call_args.kwargs['headers']
+
+        mock_get.return_value = _cached_response(304)
+        assert connector.fetch_data() == ITEMS
+        assert mock_get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+        mock_get.return_value.json.assert_not_called()
+        cache.close()
+
+
+@mock.patch('requests.Session.get')
+def test_fan_out_requests_over_values(mock_get, tmpdir):
+    mock_get.side_effect = lambda url, headers, params, timeout: _page_response({'url': url, 'ids': params.get('ids')})
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/customers/{id}', 'method': 'GET',
+                              'fan_out': {'param': 'id', 'values': '3,1,3,2', 'concurrency': 2}})
+    assert [row['url'] for row in connector.fetch_data()] == [
+        'https://api.example.com/customers/3', 'https://api.example.com/customers/1', 'https://api.example.com/customers/2']
+
+    values_file = tmpdir.join('ids.txt')
+    values_file.write('1\n2\n\n3\n')
+    connector = APIConnector({'endpoint': 'https://api.example.com/customers', 'method': 'GET',
+                              'fan_out': {'param': 'ids', 'values_file': str(values_file), 'batch_size': 2}})
+    assert [row['ids'] for row in connector.fetch_data()] == ['1,2', '3']
+
+    connector = APIConnector({'endpoint': 'https://api.example.com/customers/{ids}', 'method': 'GET',
+                              'fan_out': {'param': 'ids', 'values': 'a b,c', 'batch_size': 2, 'separator': ';'}})
+    assert [row['url'] for row in connector.fetch_data()] == ['https://api.example.com/customers/a%20b;c']
+
+
+FAN_OUT_CONFIG = """VERSION 1.0
+PUSHDOWN true
+SOURCE orders TYPE csv {{
+    FILE_PATH "{csv}"
+}}
+SOURCE customers TYPE api {{
+    ENDPOINT "https://api.example.com/customers/{{id}}"
+    METHOD "GET"
+    FAN_OUT {{
+        PARAM "id"
+        VALUES_SOURCE "orders"
+        VALUES_COLUMN "customer_id"
+    }}
+}}
+TRANSFORM orders_out FROM orders {{
+    FIELD order_id TYPE int
+}}
+TRANSFORM customers_out FROM customers {{
+    FIELD id TYPE int
+}}
+OUTPUT result TYPE json {{
+    PATH "{output}"
+}}
+"""
+
+
+@mock.patch('requests.Session.get')
+def test_collector_fans_out_over_the_column_of_another_source(mock_get, tmpdir):
+    mock_get.side_effect = lambda url, headers, params, timeout: _page_response({'id': int(url.rsplit('/', 1)[1])})
+    csv_file = tmpdir.join('orders.csv')
+    csv_file.write('order_id,customer_id\n1,7\n2,5\n3,7\n')
+    output = tmpdir.join('out.json')
+    config_file = tmpdir.join('job.col')
+    config_file.write(FAN_OUT_CONFIG.format(csv=csv_file, output=output))
+
+    from collector.connectors.csv_connector import CSVConnector
+    from collector.core.collector import Collector
+    with mock.patch.object(CSVConnector, 'fetch_data', autospec=True, side_effect=CSVConnector.fetch_data) as fetch_orders:
+        collector = Collector(str(config_file))
+        collector.run()
+    # The key column is kept although no TRANSFORM reads it
+    assert next(source for source in collector.sources if source.source_name == 'orders').pushdown['columns'] == [
+        'order_id', 'customer_id']
+    assert fetch_orders.call_count == 1
+    assert [call.args[0] for call in mock_get.call_args_list] == [
+        'https://api.example.com/customers/7', 'https://api.example.com/customers/5']
+    assert sorted(row.get('id', 0) for row in json.loads(output.read())) == [0, 0, 0, 5, 7]
+
+
+def test_fan_out_block_is_validated(tmpdir):
+    config = {'version': '1.0', 'settings': {}, 'transformations': [],
+              'output': {'type': 'json', 'details': {'path': 'out.json'}},
+              'sources': [{'name': 'a', 'type': 'api', 'details': {
+                              'endpoint': 'https://x', 'method': 'GET',
+                              'fan_out': {'param': 'id', 'values_source': 'b'}}},
+                          {'name': 'b', 'type': 'api', 'details': {
+                              'endpoint': 'https://x', 'method': 'GET',
+                              'fan_out': {'param': 'id', 'values_source': 'a', 'values': '1', 'batch_size': 0}}}]}
+    validator = ColValidator(config)
+    validator.validate()
+    assert "FAN_OUT sources depend on each other: a -> b -> a." in validator.errors
+    assert "FAN_OUT of source b requires exactly one of VALUES, VALUES_FILE or VALUES_SOURCE." in validator.errors
+    assert "FAN_OUT BATCH_SIZE of source b must be a positive integer." in validator.errors
+
+
+class _AsyncResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, body):
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self, content_type=None):
+        return self.body
+
+
+def test_async_fetch_returns_records_like_fetch_data():
+    session = mock.Mock()
+    session.get.side_effect = lambda url, headers, params: _AsyncResponse({'id': 1})
+    connector = APIConnector({'endpoint': 'https://api.example.com/data', 'method': 'GET'})
+    assert asyncio.run(connector.fetch_data_async(session)) == [{'id': 1}]
+
+    session.get.side_effect = lambda url, headers, params: _AsyncResponse({'data': {'items': [{'id': 2}]}})
+    connector = APIConnector({'endpoint': 'https://api.example.com/data', 'method': 'GET', 'record_path': 'data.items'})
+    assert asyncio.run(connector.fetch_data_async(session)) == [{'id': 2}]
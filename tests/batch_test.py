@@ -0,0 +1,71 @@
+import threading
+
+from collector.connectors.base_connector import BaseConnector
+from collector.connectors.registry import register_connector
+from collector.core.batch import BatchRunner, SharedFetches, expand_config_paths
+
+CONFIG = """VERSION 1.0
+SOURCE {name} TYPE counting {{
+    TABLE "{table}"
+}}
+TRANSFORM out FROM {name} {{
+    FIELD id TYPE int
+}}
+OUTPUT result TYPE json {{
+    PATH "{output}"
+}}
+"""
+
+
+class CountingConnector(BaseConnector):
+    fetches = []
+
+    def __init__(self, config):
+        self.table = config['table']
+
+    def fetch_data(self):
+        CountingConnector.fetches.append(self.table)
+        return [{'id': str(i), 'table': self.table} for i in range(3)]
+
+
+def test_batch_runner_fetches_shared_sources_once(tmpdir):
+    register_connector('counting', CountingConnector)
+    CountingConnector.fetches = []
+    for index, (name, table) in enumerate([('ref', 'countries'), ('lookup', 'countries'), ('sales', 'sales')]):
+        tmpdir.join(f'job{index}.col').write(
+            CONFIG.format(name=name, table=table, output=tmpdir.join(f'out{index}.json'))
+        )
+
+    runner = BatchRunner(expand_config_paths([str(tmpdir)]), max_workers=3)
+    results = runner.run()
+
+    assert list(results.values()) == [None, None, None]
+    assert sorted(CountingConnector.fetches) == ['countries', 'sales']
+    assert runner.shared_fetches.futures == {}  # Released after the last consumer
+    for index in range(3):
+        assert tmpdir.join(f'out{index}.json').check()
+
+
+def test_shared_fetches_propagate_errors_to_every_consumer():
+    shared = SharedFetches({'key': 2})
+    started = threading.Event()
+    errors = []
+
+    def failing_fetch():
+        started.set()
+        raise IOError("unreachable")
+
+    def consume(fetch):
+        try:
+            shared.fetch('key', fetch)
+        except IOError as e:
+            errors.append(e)
+
+    owner = threading.Thread(target=consume, args=(failing_fetch,))
+    owner.start()
+    started.wait()
+    consume(lambda: [{'id': 1}])
+    owner.join()
+
+    assert len(errors) == 2
+    assert shared.fetch_count == 1
@@ -0,0 +1,35 @@
+import json
+
+from benchmarks import run
+from benchmarks.datasets import generate_rows, write_csv
+from benchmarks.stubs import s3_server
+from collector.connectors.s3_connector import S3Connector
+
+
+def test_s3_connector_reads_from_s3_stub(tmpdir):
+    rows = generate_rows(10, 4)
+    write_csv(str(tmpdir.join('data.csv')), rows)
+
+    with s3_server(str(tmpdir)) as server:
+        connector = S3Connector({
+            'aws_access_key': 'bench', 'aws_secret_key': 'bench', 'bucket': 'bench', 'key': 'data.csv',
+            'endpoint_url': server.url
+        })
+        data = connector.fetch_data()
+
+    assert [row['c2'] for row in data] == [row['c2'] for row in rows]
+
+
+def test_benchmark_run_saves_and_compares_baselines(tmpdir):
+    baselines = str(tmpdir.join('baselines.json'))
+    args = ['--rows', '50', '--width', '4', '--case', 'transform_row', '--baselines', baselines]
+
+    assert run.main(args + ['--save-baseline']) == 0
+    with open(baselines) as file:
+        saved = json.load(file)
+    assert saved['50x4']['transform_row']['items'] == 50
+
+    baseline = saved['50x4']['transform_row']
+    slower = dict(baseline, items_per_second=baseline['items_per_second'] / 2)
+    assert run.compare(slower, baseline, tolerance=0.2)
+    assert not run.compare(baseline, baseline, tolerance=0.2)
@@ -0,0 +1,52 @@
+import os
+
+from collector.core.cache import FetchCache, source_fingerprint
+
+
+def test_fetch_cache_round_trip_and_ttl(tmpdir):
+    cache = FetchCache(str(tmpdir))
+    rows = [{'id': 1, 'name': 'a', 'amount': None}, {'id': 2, 'name': None, 'amount': 1.5}]
+    cache.put('sales', rows)
+
+    assert cache.get('sales', ttl=60) == rows
+    assert [row for batch in cache.iter_batches('sales', 60, batch_size=1) for row in batch] == rows
+    assert cache.get('unknown', ttl=60) is None
+
+    cache.index.execute("UPDATE entries SET created = created - 120")
+    assert cache.get('sales', ttl=60) is None
+    assert not os.path.exists(os.path.join(str(tmpdir), 'sales.parquet'))
+    cache.close()
+
+
+def test_fetch_cache_evicts_least_recently_used(tmpdir):
+    cache = FetchCache(str(tmpdir))
+    rows = [{'id': i, 'value': str(i) * 20} for i in range(1000)]
+    cache.put('first', rows)
+    cache.put('second', rows)
+    cache.get('first', ttl=60)
+    cache.index.execute("UPDATE entries SET accessed = accessed + 10 WHERE key = 'first'")
+
+    # Room for two entries only
+    cache.max_bytes = 2 * os.path.getsize(os.path.join(str(tmpdir), 'first.parquet')) + 1
+    cache.put('third', rows)
+
+    assert cache.get('second', ttl=60) is None
+    assert cache.get('first', ttl=60) == rows
+    assert cache.get('third', ttl=60) == rows
+    cache.close()
+
+
+def test_source_fingerprint_ignores_scheduling_options():
+    source = {'name': 'sales', 'type': 'csv', 'details': {'file_path': 'data.csv'}}
+    scheduled = {'name': 'other', 'type': 'csv', 'details': {'file_path': 'data.csv', 'priority': 5, 'cache_ttl': 60}}
+
+    assert source_fingerprint(source) == source_fingerprint(scheduled)
+    assert source_fingerprint(source) != source_fingerprint({'type': 'csv', 'details': {'file_path': 'other.csv'}})
+
+
+def test_fetch_cache_keeps_entry_metadata(tmpdir):
+    cache = FetchCache(str(tmpdir))
+    cache.put('key', [{'id': 1}], meta={'etag': '"v1"', 'body': {'total': 1}})
+    assert cache.get_meta('key') == {'etag': '"v1"', 'body': {'total': 1}}
+    assert cache.get_meta('missing') is None
+    cache.close()
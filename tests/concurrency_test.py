@@ -0,0 +1,53 @@
+import threading
+
+from collector.connectors.concurrency import AdaptiveLimiter, outcome_of
+from collector.utils.metrics import RunMetrics
+
+
+def test_limit_grows_until_the_host_throttles():
+    limiter = AdaptiveLimiter('https://api.example.com', initial=2, max_limit=16)
+    for _ in range(20):
+        for _ in range(int(limiter.limit)):
+            limiter.acquire()
+        for _ in range(int(limiter.limit)):
+            limiter.release(0.1)
+    assert limiter.limit == 16
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.release(0.1, 'throttled')
+    assert limiter.limit == 8
+    limiter.release(0.1, 'throttled')  # Same round trip: counted once
+    assert limiter.limit == 8
+    stats = limiter.stats()
+    assert (stats['limit'], stats['peak'], stats['throttled'], stats['latency_ms']) == (8, 16, 2, 100.0)
+
+
+def test_slots_wait_for_the_limit_and_record_outcomes():
+    limiter = AdaptiveLimiter('s3://bucket', initial=1)
+    entered = threading.Event()
+
+    def second_request():
+        with limiter.slot(measure_latency=False):
+            entered.set()
+
+    with limiter.slot() as call:
+        thread = threading.Thread(target=second_request)
+        thread.start()
+        assert not entered.wait(0.1)
+        call['status'] = 503
+    thread.join()
+    assert entered.is_set()
+    assert (limiter.requests, limiter.throttled) == (2, 1)
+    assert [outcome_of(status) for status in (200, 404, 429, 500)] == ['ok', 'ok', 'throttled', 'error']
+
+
+def test_concurrency_is_reported(tmpdir):
+    metrics = RunMetrics()
+    metrics.record_concurrency('https://api.example.com', {'limit': 12, 'peak': 20, 'requests': 500, 'throttled': 3,
+                                                           'errors': 0, 'latency_ms': 80.0})
+    assert metrics.report()['concurrency'][0]['host'] == 'https://api.example.com'
+    textfile_path = str(tmpdir.join('collector.prom'))
+    metrics.write_prometheus(textfile_path)
+    with open(textfile_path) as file:
+        assert 'collector_host_concurrency_limit{host="https://api.example.com"} 12' in file.read()
@@ -6,3 +6,48 @@ def test_config_parser():
     assert config['version'] == '1.0'
     assert len(config['sources']) > 0
     assert config['output'] is not None
+
+def test_config_parser_field_rules():
+    parser = CollectorConfigParser('examples/conditional_transforms.col')
+    config = parser.parse()
+    rules = config['transformations'][0]['rules']
+    assert rules[0] == {'field': 'id', 'type': 'int'}
+    assert rules[3] == {'field': 'signup_date', 'type': 'datetime', 'format': '%Y-%m-%d', 'default': '2000-01-01'}
+    assert rules[-1]['field'] == 'customer_segment'
+
+def test_config_parser_settings(tmpdir):
+    config_file = tmpdir.join('settings.col')
+    config_file.write(
+        'VERSION 1.0\n'
+        'COLLECT_MODE async  # comment\n'
+        'MAX_CONCURRENCY 100\n'
+        'SOURCE_CONCURRENCY {\n'
+        '    api 50\n'
+        '    s3 8\n'
+        '}\n'
+    )
+    config = CollectorConfigParser(str(config_file)).parse()
+    assert config['settings'] == {
+        'collect_mode': 'async',
+        'max_concurrency': 100,
+        'source_concurrency': {'api': 50, 's3': 8}
+    }
+
+
+def test_source_cache_ttl_is_not_a_global_setting(tmpdir):
+    config_file = tmpdir.join('cache.col')
+    config_file.write(
+        'VERSION 1.0\n'
+        'CACHE_DIR "/tmp/cache"\n'
+        'SOURCE sales TYPE csv {\n'
+        '    FILE_PATH "sales.csv"\n'
+        '    CACHE_TTL 60\n'
+        '}\n'
+        'SOURCE regions TYPE csv {\n'
+        '    FILE_PATH "regions.csv"\n'
+        '}\n'
+    )
+    config = CollectorConfigParser(str(config_file)).parse()
+    assert config['settings'] == {'cache_dir': '/tmp/cache'}
+    assert config['sources'][0]['details']['cache_ttl'] == 60
+    assert 'cache_ttl' not in config['sources'][1]['details']
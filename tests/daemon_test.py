@@ -0,0 +1,80 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from collector.connectors import client_cache
+from collector.connectors.client_cache import ClientCache
+from collector.connectors.sql_connector import SQLConnector
+from collector.core.cron import CronSchedule
+from collector.core.daemon import CollectorDaemon
+
+CONFIG = """VERSION 1.0
+SCHEDULE "{schedule}"
+SOURCE data TYPE csv {{
+    FILE_PATH "{csv}"
+}}
+TRANSFORM out FROM data {{
+    FIELD id TYPE int
+}}
+OUTPUT result TYPE json {{
+    PATH "{output}"
+}}
+"""
+
+
+def test_cron_schedule_next_after():
+    now = datetime(2024, 1, 31, 23, 59, 30)
+    assert CronSchedule('*/5 * * * *').next_after(now) == datetime(2024, 2, 1, 0, 0)
+    assert CronSchedule('0 9 * * 1-5').next_after(datetime(2024, 2, 2, 10, 0)) == datetime(2024, 2, 5, 9, 0)
+    assert CronSchedule('30 8 29 2 *').next_after(now) == datetime(2024, 2, 29, 8, 30)
+    assert CronSchedule('@daily').next_after(now) == datetime(2024, 2, 1, 0, 0)
+    with pytest.raises(ValueError):
+        CronSchedule('61 * * * *')
+
+
+def test_client_cache_shares_engines_while_active():
+    config = {'db_type': 'sqlite', 'database': ':memory:', 'query': 'SELECT 1'}
+    cache = ClientCache()
+    client_cache.activate(cache)
+    try:
+        first, second = SQLConnector(config), SQLConnector(config)
+        first.connect()
+        second.connect()
+        assert first.engine is second.engine
+    finally:
+        client_cache.deactivate()
+        cache.close()
+
+    third = SQLConnector(config)
+    third.connect()
+    assert third.engine is not first.engine
+
+
+def test_daemon_reloads_changed_configs_and_runs_due_ones(tmpdir):
+    csv_file = tmpdir.join('data.csv')
+    csv_file.write('id\n1\n2\n')
+    config_file = tmpdir.join('job.col')
+    config_file.write(CONFIG.format(schedule='* * * * *', csv=csv_file, output=tmpdir.join('out.json')))
+
+    daemon = CollectorDaemon(str(tmpdir))
+    daemon.reload()
+    scheduled = daemon.configs[str(config_file)]
+    assert scheduled.schedule.expression == '* * * * *'
+
+    daemon.reload()
+    assert daemon.configs[str(config_file)] is scheduled  # Unchanged file is not parsed again
+
+    config_file.write(CONFIG.format(schedule='@hourly', csv=csv_file, output=tmpdir.join('out.json')))
+    os.utime(str(config_file), (0, 0))
+    daemon.reload()
+    assert daemon.configs[str(config_file)].schedule.expression == '@hourly'
+
+    due = daemon.due_configs(datetime.now() + timedelta(hours=2))
+    assert [item.path for item in due] == [str(config_file)]
+    scheduled = daemon.configs[str(config_file)]
+    scheduled.next_run = datetime.now()
+    assert daemon.due_configs(datetime.now() + timedelta(hours=2)) == []  # Previous run still in progress
+
+    daemon.run_config(due[0])
+    assert tmpdir.join('out.json').check()
+    assert daemon.running == set()
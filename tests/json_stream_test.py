@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from collector.utils.json_stream import iter_json_records, iter_ndjson, record_keys
+
+DOCUMENT = {
+    'meta': {'total': 300, 'note': 'brackets ]} in "text"'},
+    'data': {'items': [{'id': i, 'name': 'é' * (i % 5), 'score': i * 1.5, 'tags': [i, None]} for i in range(300)]},
+    'after': [1, 2, 3],
+}
+
+
+def _chunks(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 7, 4096])
+def test_records_are_streamed_from_any_chunking(size):
+    body = json.dumps(DOCUMENT, indent=2).encode()
+
+    assert list(iter_json_records(_chunks(body, size), 'data.items[*]')) == DOCUMENT['data']['items']
+    assert list(iter_json_records(_chunks(body, size), 'data.items')) == DOCUMENT['data']['items']
+    assert list(iter_json_records(_chunks(body, size), 'meta')) == [DOCUMENT['meta']]
+    assert list(iter_json_records(_chunks(body, size), 'data.missing[*]')) == []
+    # Numbers cut by a chunk boundary are read whole
+    assert list(iter_json_records(_chunks(b'[1, 234, 56789]', size))) == [1, 234, 56789]
+
+
+def test_ndjson_lines():
+    body = '{"id": 1}\n\n{"id": 2, "name": "é"}\r\n{"id": 3}'.encode()
+    assert list(iter_ndjson(_chunks(body, 3))) == [{'id': 1}, {'id': 2, 'name': 'é'}, {'id': 3}]
+
+
+def test_invalid_documents_and_paths():
+    with pytest.raises(ValueError):
+        list(iter_json_records([b'{"data": [{"id": 1}, {"id"'], 'data'))
+    with pytest.raises(ValueError):
+        list(iter_ndjson([b'{"id": 1}\n{"id": \n']))
+    assert record_keys('[*]') == []
+    assert list(iter_json_records([b'[]'])) == []
+
+
+@pytest.mark.parametrize('size', [1, 4096])
+@pytest.mark.parametrize('body', [b'[1 2]', b'[1,,2]', b'[,1]', b'[1,]', b'{"a": 1 "data": [1]}',
+                                  b'{"a": 1,, "data": [1]}', b'{, "data": [1]}', b'{1: 2, "data": [1]}'])
+def test_separators_are_required(body, size):
+    with pytest.raises(ValueError):
+        list(iter_json_records(_chunks(body, size), 'data' if body.startswith(b'{') else None))
+    with pytest.raises(ValueError):
+        record_keys('pages[*].items')
@@ -0,0 +1,43 @@
+import json
+
+from collector.utils.metrics import RunMetrics, estimate_bytes
+
+
+def test_run_metrics_accumulate_per_source_and_stage():
+    metrics = RunMetrics()
+    metrics.record('fetch', 'sales', seconds=1.0, rows=100, size=1000)
+    metrics.record('fetch', 'sales', seconds=1.0, rows=300, size=3000)
+    with metrics.measure('write') as counts:
+        counts['rows'] = 400
+
+    fetch = metrics.get('fetch', 'sales')
+    assert (fetch.seconds, fetch.rows, fetch.bytes) == (2.0, 400, 4000)
+    assert fetch.rows_per_second == 200
+    assert metrics.get('write').rows == 400
+    assert metrics.get('transform', 'sales') is None
+
+
+def test_run_metrics_reports(tmpdir):
+    metrics = RunMetrics()
+    metrics.record('fetch', 'sales', seconds=0.5, rows=10, size=80)
+    metrics.finish('success')
+
+    report_path = str(tmpdir.join('report.json'))
+    metrics.write_json(report_path)
+    with open(report_path) as file:
+        report = json.load(file)
+    assert report['status'] == 'success'
+    assert report['stages'] == [metrics.get('fetch', 'sales').to_dict()]
+
+    textfile_path = str(tmpdir.join('collector.prom'))
+    metrics.write_prometheus(textfile_path)
+    with open(textfile_path) as file:
+        textfile = file.read()
+    assert 'collector_run_success 1' in textfile
+    assert 'collector_stage_rows{source="sales",stage="fetch"} 10' in textfile
+
+
+def test_estimate_bytes_scales_sample():
+    rows = [{'id': 1234, 'name': 'abcd'}] * 1000
+    assert estimate_bytes(rows) == 8000
+    assert estimate_bytes([]) == 0
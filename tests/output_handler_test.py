@@ -0,0 +1,50 @@
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+from collector.output.output_handler import OutputHandler
+
+
+def test_output_handler_streams_json_batches(tmpdir):
+    path = str(tmpdir.join('out.json'))
+    handler = OutputHandler({'type': 'json', 'details': {'path': path}})
+
+    handler.open()
+    handler.write_batch([{'id': 1, 'name': 'Test'}])
+    handler.write_batch([{'id': 2, 'name': 'Example'}])
+    rows = handler.close()
+
+    assert rows == 2
+    with open(path) as f:
+        assert json.load(f) == [{'id': 1, 'name': 'Test'}, {'id': 2, 'name': 'Example'}]
+
+
+def test_output_handler_streams_csv_batches(tmpdir):
+    path = str(tmpdir.join('out.csv'))
+    handler = OutputHandler({'type': 'csv', 'details': {'path': path}})
+
+    handler.open()
+    handler.write_batch([{'id': 1, 'name': 'Test'}])
+    handler.write_batch([{'name': 'Example', 'id': 2}])
+    handler.close()
+
+    df = pd.read_csv(path)
+    assert list(df.columns) == ['id', 'name']
+    assert df.to_dict(orient='records') == [{'id': 1, 'name': 'Test'}, {'id': 2, 'name': 'Example'}]
+
+
+def test_output_handler_streams_parquet_batches_with_sparse_columns(tmpdir):
+    path = str(tmpdir.join('out.parquet'))
+    handler = OutputHandler({'type': 'parquet', 'details': {'path': path}})
+
+    handler.open()
+    handler.write_batch([{'id': 1, 'note': None}, {'id': 2, 'note': None}])
+    handler.write_batch([{'id': 3, 'note': None}])
+    handler.write_batch([{'id': 4, 'note': 'late'}])
+    handler.write_batch([{'id': 5, 'note': None}])
+    handler.close()
+
+    assert pq.read_table(path).to_pylist() == [
+        {'id': 1, 'note': None}, {'id': 2, 'note': None}, {'id': 3, 'note': None},
+        {'id': 4, 'note': 'late'}, {'id': 5, 'note': None}
+    ]
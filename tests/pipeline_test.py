@@ -0,0 +1,48 @@
+from unittest import mock
+
+import pytest
+from collector.connectors.base_connector import BaseConnector
+from collector.core.collector import Collector
+from collector.core.pipeline import Pipeline
+from collector.errors.exceptions import PipelineError
+
+
+class ListConnector(BaseConnector):
+    def __init__(self, name, rows):
+        self.source_name = name
+        self.rows = rows
+
+    def fetch_data(self):
+        return self.rows
+
+
+def make_collector(*connectors):
+    collector = Collector('path/to/config.col')
+    collector.config = {'transformations': [
+        {'target': 'unified_data', 'source': 'a', 'rules': [{'field': 'value', 'type': 'int'}]}
+    ]}
+    collector.sources = list(connectors)
+    return collector
+
+
+def test_pipeline_writes_every_batch():
+    collector = make_collector(
+        ListConnector('a', [{'value': str(i)} for i in range(10)]),
+        ListConnector('b', [{'value': 'raw'} for _ in range(5)]),
+    )
+    output_handler = mock.Mock()
+
+    Pipeline(collector, batch_size=3, queue_size=1).run(output_handler)
+
+    written = [row for call in output_handler.write_batch.call_args_list for row in call.args[0]]
+    assert len(written) == 15
+    assert sorted(row['value'] for row in written if row['value'] != 'raw') == list(range(10))
+
+
+def test_pipeline_stops_when_writer_fails():
+    collector = make_collector(ListConnector('a', [{'value': str(i)} for i in range(100)]))
+    output_handler = mock.Mock()
+    output_handler.write_batch.side_effect = IOError("disk full")
+
+    with pytest.raises(PipelineError):
+        Pipeline(collector, batch_size=1, queue_size=1).run(output_handler)
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+
+from collector.connectors.csv_connector import CSVConnector
+from collector.connectors.sql_connector import SQLConnector
+from collector.core.collector import Collector
+from collector.core.config_parser import CollectorConfigParser
+from collector.core.pushdown import plan_pushdown
+from collector.core.transform_plan import TransformPlan
+from collector.core.transformer import DataTransformer
+
+CONFIG = """VERSION 1.0
+PUSHDOWN true
+SOURCE sales TYPE sql {{
+    DB_TYPE "sqlite"
+    HOST "localhost"
+    PORT 0
+    USERNAME "user"
+    PASSWORD "pass"
+    DATABASE "{database}"
+    QUERY "SELECT * FROM sales"
+}}
+SOURCE regions TYPE csv {{
+    FILE_PATH "{csv}"
+    PUSHDOWN false
+}}
+TRANSFORM out FROM sales {{
+    FIELD id TYPE int
+    FIELD amount TYPE float RENAME total
+    FILTER amount >= 50
+    FILTER region <> "APAC"
+}}
+TRANSFORM regions_out FROM regions {{
+    FIELD code TYPE string
+}}
+OUTPUT result TYPE json {{
+    PATH "{output}"
+}}
+"""
+
+
+def test_filters_and_pushdown_plan(tmpdir):
+    csv_file = tmpdir.join('regions.csv')
+    csv_file.write('code,name\nEU,Europe\n')
+    config_file = tmpdir.join('job.col')
+    config_file.write(CONFIG.format(database='unused.db', csv=csv_file, output=tmpdir.join('out.json')))
+    config = CollectorConfigParser(str(config_file)).parse()
+
+    assert config['transformations'][0]['filters'] == [
+        {'field': 'amount', 'op': '>=', 'value': 50},
+        {'field': 'region', 'op': '!=', 'value': 'APAC'},
+    ]
+    assert plan_pushdown(config) == {
+        'sales': {'columns': ['id', 'amount', 'region'], 'filters': config['transformations'][0]['filters']},
+    }
+
+    rows = [{'id': '1', 'amount': '75.5', 'region': 'EU'}, {'id': '2', 'amount': '10', 'region': 'EU'},
+            {'id': '3', 'amount': '90', 'region': 'APAC'}, {'id': '4', 'amount': None, 'region': 'EU'}]
+    expected = [{'id': 1, 'total': 75.5, 'region': 'EU'}]
+    assert TransformPlan(config['transformations']).transform(rows, 'sales') == expected
+    assert DataTransformer(config['transformations']).transform(rows, 'sales') == expected
+
+
+def test_collector_pushes_columns_and_filters_to_sources(tmpdir):
+    database = str(tmpdir.join('sales.db'))
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE sales (id INTEGER, amount REAL, region TEXT, notes TEXT)")
+        connection.executemany("INSERT INTO sales VALUES (?, ?, ?, ?)",
+                               [(1, 75.5, 'EU', 'x'), (2, 10, 'EU', 'y'), (3, 90, 'APAC', 'z')])
+    csv_file = tmpdir.join('regions.csv')
+    csv_file.write('code,name\nEU,Europe\n')
+    output = tmpdir.join('out.json')
+    config_file = tmpdir.join('job.col')
+    config_file.write(CONFIG.format(database=database, csv=csv_file, output=output))
+
+    collector = Collector(str(config_file))
+    collector.run()
+
+    sql = next(connector for connector in collector.sources if isinstance(connector, SQLConnector))
+    statement, params = sql._statement(sql.config['query'])
+    assert str(statement) == ("SELECT id, amount, region FROM (SELECT * FROM sales) AS _subquery "
+                              "WHERE amount >= :_filter_0 AND region <> :_filter_1")
+    assert params == {'_filter_0': 50, '_filter_1': 'APAC'}
+    csv = next(connector for connector in collector.sources if isinstance(connector, CSVConnector))
+    assert csv.pushdown is None
+
+    rows = json.loads(output.read())
+    assert sorted(rows, key=len) == [{'code': 'EU', 'name': 'Europe'}, {'id': 1, 'region': 'EU', 'total': 75.5}]
+
+
+def test_fields_missing_from_the_query_are_not_selected(tmpdir):
+    database = str(tmpdir.join('sales.db'))
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE sales (id INTEGER, amount REAL, region TEXT)")
+        connection.executemany("INSERT INTO sales VALUES (?, ?, ?)", [(1, 75.5, 'EU'), (3, 90, 'APAC')])
+    csv_file = tmpdir.join('regions.csv')
+    csv_file.write('code,name\nEU,Europe\n')
+    output = tmpdir.join('out.json')
+    config_file = tmpdir.join('job.col')
+    config_file.write(CONFIG.format(database=database, csv=csv_file, output=output).replace(
+        '    FIELD id TYPE int\n', '    FIELD id TYPE int\n    FIELD discount TYPE float DEFAULT 0\n'))
+
+    collector = Collector(str(config_file))
+    collector.run()
+
+    assert not collector.failed_sources
+    sql = next(connector for connector in collector.sources if isinstance(connector, SQLConnector))
+    assert sql.pushdown['columns'] == ['id', 'amount', 'region']
+    rows = json.loads(output.read())
+    assert {'id': 1, 'discount': 0.0, 'region': 'EU', 'total': 75.5} in rows
@@ -0,0 +1,71 @@
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from collector.core.transformer import DataTransformer
+from collector.output.output_handler import OutputHandler
+from collector.utils.records import batch_length, to_arrow, to_records
+
+TRANSFORMATIONS = [{
+    'name': 'out',
+    'source': 'sales',
+    'rules': [{'field': 'id', 'type': 'int'}, {'field': 'amount', 'type': 'float', 'rename': 'total'}],
+    'filters': [{'field': 'amount', 'op': '>', 'value': 10}],
+}]
+
+
+def test_record_adapters():
+    batch = pa.RecordBatch.from_pydict({'id': [1, 2], 'name': ['a', None]})
+    assert batch_length(batch) == 2
+    assert to_records(batch) == [{'id': 1, 'name': 'a'}, {'id': 2, 'name': None}]
+    assert to_arrow([{'id': 1, 'name': 'a'}, {'id': 2, 'name': None}]).equals(pa.Table.from_batches([batch]))
+
+    schema = pa.schema([('id', pa.float64()), ('name', pa.string()), ('extra', pa.int64())])
+    aligned = to_arrow(batch, schema=schema)
+    assert aligned.schema.equals(schema)
+    assert aligned.column('extra').to_pylist() == [None, None]
+
+
+def test_transform_batch_keeps_arrow():
+    batch = pa.RecordBatch.from_pydict({'id': ['1', '2', '3'], 'amount': ['5', '20.5', '30']})
+    table = DataTransformer(TRANSFORMATIONS).transform_batch(batch, 'sales')
+    assert isinstance(table, pa.Table)
+    assert table.to_pylist() == [{'id': 2, 'total': 20.5}, {'id': 3, 'total': 30.0}]
+
+
+def test_arrow_batches_are_written_to_every_output(tmpdir):
+    batches = [pa.table({'id': [1, 2], 'total': [1.5, 2.5]}), [{'id': 3, 'total': 3.5}]]
+    for output_type in ('csv', 'json', 'parquet'):
+        path = str(tmpdir.join(f'out.{output_type}'))
+        handler = OutputHandler({'type': output_type, 'details': {'path': path}})
+        handler.open()
+        for batch in batches:
+            handler.write_batch(batch)
+        assert handler.close() == 3
+
+        if output_type == 'csv':
+            assert open(path).read().splitlines() == ['id,total', '1,1.5', '2,2.5', '3,3.5']
+        elif output_type == 'json':
+            assert json.load(open(path)) == [{'id': 1, 'total': 1.5}, {'id': 2, 'total': 2.5},
+                                             {'id': 3, 'total': 3.5}]
+        else:
+            assert pq.read_table(path).column('id').to_pylist() == [1, 2, 3]
+
+
+def test_parquet_schema_is_unified_across_arrow_batches(tmpdir):
+    # A column only holding NaN in the first chunk of a CSV file is read as double
+    batches = [pa.table({'id': [1, 2], 'note': pa.array([None, None], pa.float64())}),
+               pa.table({'id': [3], 'note': ['n']}),
+               pa.table({'id': [4], 'note': pa.array([None], pa.float64())})]
+    path = str(tmpdir.join('out.parquet'))
+    handler = OutputHandler({'type': 'parquet', 'details': {'path': path}})
+    handler.open()
+    for batch in batches:
+        handler.write_batch(batch)
+    assert handler.close() == 4
+
+    table = pq.read_table(path)
+    assert table.schema.field('note').type == pa.string()
+    assert table.to_pylist() == [{'id': 1, 'note': None}, {'id': 2, 'note': None}, {'id': 3, 'note': 'n'},
+                                 {'id': 4, 'note': None}]
@@ -0,0 +1,45 @@
+import sys
+
+import pytest
+from collector.connectors.base_connector import BaseConnector
+from collector.connectors.parquet_connector import ParquetConnector
+from collector.connectors.registry import available_types, get_connector_class, is_registered, register_connector
+from collector.output.output_handler import OutputHandler
+
+
+class DummyConnector(BaseConnector):
+    def __init__(self, config):
+        self.config = config
+
+    def fetch_data(self):
+        return [{'value': self.config['value']}]
+
+
+def test_builtin_connector_is_imported_on_first_use():
+    sys.modules.pop('collector.connectors.gcs_connector', None)
+    assert is_registered('gcs')
+    assert 'collector.connectors.gcs_connector' not in sys.modules
+
+    assert get_connector_class('gcs').__name__ == 'GCSConnector'
+    assert 'collector.connectors.gcs_connector' in sys.modules
+
+
+def test_register_connector():
+    register_connector('dummy', DummyConnector)
+    register_connector('dummy_path', 'tests.registry_test:DummyConnector')
+
+    assert get_connector_class('dummy') is DummyConnector
+    assert get_connector_class('dummy_path') is DummyConnector
+    assert {'dummy', 'sql', 'parquet'} <= set(available_types())
+    with pytest.raises(ValueError):
+        get_connector_class('unknown')
+
+
+def test_parquet_connector(tmpdir):
+    path = str(tmpdir.join('data.parquet'))
+    rows = [{'id': i, 'name': f'n{i}'} for i in range(5)]
+    OutputHandler({'type': 'parquet', 'details': {'path': path}}).write_output(rows)
+
+    assert ParquetConnector({'file_path': path}).fetch_data() == rows
+    batches = list(ParquetConnector({'file_path': path, 'columns': 'id'}).fetch_batches(2))
+    assert batches == [[{'id': 0}, {'id': 1}], [{'id': 2}, {'id': 3}], [{'id': 4}]]
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+from collector.connectors.base_connector import BaseConnector
+from collector.core.collector import Collector
+from collector.core.scheduler import SourceScheduler
+from collector.errors.exceptions import SourceTimeoutError
+
+
+class SleepyConnector:
+    def __init__(self, name, delay):
+        self.source_name = name
+        self.delay = delay
+
+
+def fetch(connector):
+    time.sleep(connector.delay)
+    return [{'source': connector.source_name}]
+
+
+def test_scheduler_orders_by_priority_then_expected_duration():
+    a, b, c = SleepyConnector('a', 0), SleepyConnector('b', 0), SleepyConnector('c', 0)
+    scheduler = SourceScheduler(fetch)
+    ordered = scheduler.order([(a, None, None), (b, None, None), (c, 5, None)], {'b': 30.0})
+    assert [connector.source_name for connector, _, _ in ordered] == ['c', 'b', 'a']
+
+
+def test_scheduler_skips_timed_out_sources():
+    sources = [(SleepyConnector('slow', 2), None, 0.2), (SleepyConnector('fast', 0), None, None)]
+    scheduler = SourceScheduler(fetch, mode='sequence')
+
+    started = time.monotonic()
+    results = list(scheduler.run(sources))
+
+    assert time.monotonic() - started < 1
+    assert [connector.source_name for connector, _ in results] == ['fast']
+
+
+def test_scheduler_fail_fast_on_timeout():
+    sources = [(SleepyConnector('slow', 2), None, 0.2), (SleepyConnector('fast', 0), None, None)]
+    scheduler = SourceScheduler(fetch, mode='parallel', max_workers=2, fail_fast=True)
+
+    with pytest.raises(SourceTimeoutError):
+        list(scheduler.run(sources))
+
+
+class BlockingConnector(BaseConnector):
+    def __init__(self, name, delay):
+        self.source_name = name
+        self.delay = delay
+
+    def fetch_data(self):
+        time.sleep(self.delay)
+        return [{'source': self.source_name}]
+
+
+def test_async_collection_does_not_wait_for_timed_out_sources():
+    collector = Collector('unused.col', settings={'collect_mode': 'async'})
+    collector.config = {'sources': [
+        {'name': 'slow', 'type': 'csv', 'details': {'timeout': 0.2}},
+        {'name': 'fast', 'type': 'csv', 'details': {}}
+    ]}
+    collector.sources = [BlockingConnector('slow', 3), BlockingConnector('fast', 0)]
+
+    started = time.monotonic()
+    data = collector.collect_data()
+
+    assert time.monotonic() - started < 1
+    assert data == [{'source': 'fast', '_source': 'fast'}]
+    assert collector.failed_sources == {'slow'}
@@ -0,0 +1,81 @@
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from collector.connectors.csv_connector import CSVConnector
+from collector.connectors.s3_connector import S3Connector
+from collector.core.collector import Collector
+from collector.core.state import StateStore
+
+
+def test_state_store_round_trip(tmpdir):
+    path = str(tmpdir.join('state.db'))
+    store = StateStore(path)
+    store.set_many({'sales': datetime(2024, 1, 2, 3, 4, 5), 'files': {'etag': 'abc'}, 'amount': Decimal('1.5')})
+    store.close()
+
+    store = StateStore(path)
+    assert store.get('sales') == datetime(2024, 1, 2, 3, 4, 5)
+    assert store.get('files') == {'etag': 'abc'}
+    assert store.get('amount') == Decimal('1.5')
+    assert store.get('unknown') is None
+    store.close()
+
+
+def test_incremental_csv_skips_unchanged_file(tmpdir):
+    csv_file = tmpdir.join('data.csv')
+    csv_file.write('id,name\n1,Test\n')
+    connector = CSVConnector({'file_path': str(csv_file), 'incremental': True})
+
+    assert connector.fetch_data() == [{'id': 1, 'name': 'Test'}]
+    assert connector.fetch_data() == []
+
+
+def test_incremental_s3_watermark_matches_the_downloaded_body():
+    connector = S3Connector({'aws_access_key': 'key', 'aws_secret_key': 'secret', 'bucket': 'bucket',
+                             'key': 'data.csv', 'incremental': True})
+    connector.s3 = mock.Mock()
+    # The object is replaced between the HEAD and the GET requests
+    connector.s3.head_object.return_value = {'ETag': '"v1"', 'LastModified': datetime(2024, 1, 1)}
+    connector.s3.get_object.return_value = {'ETag': '"v2"', 'LastModified': datetime(2024, 1, 2),
+                                            'Body': io.BytesIO(b'id\n2\n')}
+
+    assert connector.fetch_data() == [{'id': '2'}]
+    assert connector.watermark == {'etag': '"v2"', 'last_modified': '2024-01-02T00:00:00'}
+
+    connector.s3.head_object.return_value = {'ETag': '"v2"', 'LastModified': datetime(2024, 1, 2)}
+    assert connector.fetch_data() == []
+
+
+INCREMENTAL_CONFIG = """VERSION 1.0
+STATE_PATH "{state}"
+SOURCE sales TYPE csv {{
+    FILE_PATH "{csv}"
+    INCREMENTAL {incremental}
+}}
+OUTPUT out TYPE json {{
+    PATH "{output}"
+}}
+"""
+
+
+def test_incremental_false_reads_unchanged_files_again(tmpdir):
+    csv_file = tmpdir.join('data.csv')
+    csv_file.write('id,name\n1,Test\n')
+    output = tmpdir.join('out.json')
+    config_file = tmpdir.join('sales.col')
+    config_file.write(INCREMENTAL_CONFIG.format(state=tmpdir.join('state.db'), csv=csv_file, output=output,
+                                                incremental='false'))
+
+    for _ in range(2):
+        Collector(str(config_file)).run()
+        assert json.loads(output.read()) == [{'id': 1, 'name': 'Test'}]
+
+    config_file.write(INCREMENTAL_CONFIG.format(state=tmpdir.join('state.db'), csv=csv_file, output=output,
+                                                incremental='yes'))
+    with pytest.raises(ValueError):
+        Collector(str(config_file)).run()
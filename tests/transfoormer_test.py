@@ -16,3 +16,19 @@ def test_transformer():
     transformed_data = transformer.transform(data)
     assert transformed_data[0]['amount'] == 100.50
     assert transformed_data[0]['date'] == '2023-09-17'
+
+def test_transformer_counts_failed_conversions():
+    transformations = [
+        {
+            'target': 'unified_data',
+            'source': 'raw_data',
+            'rules': [
+                {'field': 'quantity', 'type': 'int', 'default': 0},
+            ]
+        }
+    ]
+    transformer = DataTransformer(transformations)
+    data = [{'quantity': '3'}, {'quantity': 'three'}, {'quantity': None}]
+    transformed_data = transformer.transform(data, source='raw_data')
+    assert transformed_data == [{'quantity': 3}, {'quantity': 'three'}, {'quantity': 0}]
+    assert transformer.failures[('raw_data', 'quantity', 'int')] == 1
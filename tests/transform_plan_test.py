@@ -0,0 +1,82 @@
+from datetime import date
+
+from collector.connectors.csv_connector import CSVConnector
+from collector.core.transform_plan import SOURCE_KEY, TransformPlan
+from collector.core.transformer import DataTransformer
+
+transformations = [
+    {
+        'target': 'unified_sales',
+        'source': 'sales_db',
+        'rules': [
+            {'field': 'amount', 'type': 'float', 'default': '0.0'},
+            {'field': 'sale_date', 'type': 'date', 'format': '%Y-%m-%d', 'rename': 'date'},
+        ]
+    },
+    {
+        'target': 'unified_weather',
+        'source': 'weather_api',
+        'rules': [
+            {'field': 'temperature', 'type': 'float', 'extract': 'main.temp'},
+        ]
+    }
+]
+
+
+def test_transform_plan_applies_only_matching_source():
+    plan = TransformPlan(transformations)
+    rows = [
+        {'amount': '100.50', 'sale_date': '2023-09-17', SOURCE_KEY: 'sales_db'},
+        {'amount': '7', 'main': {'temp': '12.5'}, SOURCE_KEY: 'weather_api'},
+    ]
+
+    transformed = plan.transform(rows)
+
+    assert transformed[0] == {'amount': 100.50, 'date': date(2023, 9, 17)}
+    assert transformed[1] == {'amount': '7', 'main': {'temp': '12.5'}, 'temperature': 12.5}
+
+
+def test_transform_plan_counts_failures_and_applies_defaults():
+    plan = TransformPlan(transformations)
+
+    transformed = plan.transform([{'amount': 'n/a'}, {'amount': None}], source='sales_db')
+
+    assert transformed == [{'amount': 'n/a'}, {'amount': 0.0}]
+    assert plan.failures[('sales_db', 'amount', 'float')] == 1
+
+
+def test_empty_csv_cells_are_missing_values(tmpdir):
+    csv_file = tmpdir.join('scores.csv')
+    csv_file.write('name,score,note\na,3,x\nb,,\n')
+    rows = CSVConnector({'file_path': str(csv_file)}).fetch_data()
+    rules = [{'target': 'out', 'source': 'scores', 'rules': [
+        {'field': 'score', 'type': 'int', 'default': '-1'},
+        {'field': 'note', 'type': 'string', 'rename': 'comment'},
+    ]}]
+
+    plan = TransformPlan(rules)
+    transformed = plan.transform(rows, source='scores')
+
+    assert transformed == [{'name': 'a', 'score': 3, 'comment': 'x'}, {'name': 'b', 'score': -1, 'comment': None}]
+    assert not plan.failures
+    assert DataTransformer(rules).transform(rows, 'scores') == transformed
+
+
+def test_null_fields_are_renamed():
+    rows = [{'id': 1, 'd': '2024-01-02'}, {'id': 2, 'd': None}]
+    rules = [{'target': 'out', 'source': 'events', 'rules': [{'field': 'd', 'type': 'date', 'rename': 'dd'}]}]
+
+    transformed = TransformPlan(rules).transform(rows, source='events')
+
+    assert transformed == [{'id': 1, 'dd': date(2024, 1, 2)}, {'id': 2, 'dd': None}]
+    assert DataTransformer(rules).transform(rows, 'events') == transformed
+
+
+def test_integers_with_missing_values_are_converted_to_string_alike():
+    rows = [{'id': 1, 'code': 10}, {'id': 2, 'code': None}, {'id': 3, 'code': 7}]
+    rules = [{'target': 'out', 'source': 'items', 'rules': [{'field': 'code', 'type': 'string'}]}]
+
+    transformed = TransformPlan(rules).transform(rows, source='items')
+
+    assert [row['code'] for row in transformed] == ['10', None, '7']
+    assert DataTransformer(rules).transform(rows, 'items') == transformed
@@ -0,0 +1,32 @@
+from collector.core.transform_plan import SOURCE_KEY
+from collector.core.transform_pool import TransformPool, decode_rows, encode_rows
+
+transformations = [
+    {
+        'target': 'unified_data',
+        'source': 'raw_data',
+        'rules': [
+            {'field': 'amount', 'type': 'float'},
+        ]
+    }
+]
+
+
+def test_encode_rows_round_trip():
+    rows = [{'id': 1, 'name': 'Test'}, {'id': 2, 'name': 'Example'}]
+    columns, values = encode_rows(rows)
+    assert columns == ('id', 'name')
+    assert decode_rows((columns, values)) == rows
+
+    mixed = [{'id': 1}, {'name': 'Example'}]
+    assert decode_rows(encode_rows(mixed)) == mixed
+
+
+def test_transform_pool_preserves_order():
+    rows = [{'id': i, 'amount': str(i), SOURCE_KEY: 'raw_data'} for i in range(50)]
+    pool = TransformPool(transformations, workers=2, chunk_size=7)
+    try:
+        transformed = pool.transform(rows)
+    finally:
+        pool.shutdown()
+    assert transformed == [{'id': i, 'amount': float(i)} for i in range(50)]